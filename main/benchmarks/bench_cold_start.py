@@ -0,0 +1,61 @@
+# bench_cold_start.py - 冷启动加载工具清单的耗时对比
+#
+# 用法: python benchmarks/bench_cold_start.py [数量 ...]
+# 对比三种方式：
+#   scan_tools   - 逐个 open + json.load（原实现）
+#   无索引注册表 - ToolRegistry 首次建立并写出索引
+#   有索引注册表 - 新进程启动时读取索引，只 stat 校验
+# 说明：操作系统文件缓存无法在此清空，慢速磁盘/U盘上的差距会更大。
+import tempfile
+import time
+
+from fixtures import make_tools_dir
+
+from tool_registry import ToolRegistry
+from utils import scan_tools
+
+
+def timed(func, repeat=5):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def bench(count):
+    with tempfile.TemporaryDirectory() as root:
+        tools_dir = make_tools_dir(root, count)
+        index_path = tools_dir.parent / "tools_index.bin"
+
+        def cold_without_index():
+            index_path.unlink(missing_ok=True)
+            ToolRegistry(tools_dir, index_path=index_path).refresh()
+
+        def cold_with_index():
+            registry = ToolRegistry(tools_dir, index_path=index_path)
+            registry.refresh()
+            assert len(registry) == count
+
+        scan_ms = timed(lambda: scan_tools(tools_dir))
+        build_ms = timed(cold_without_index)
+        ToolRegistry(tools_dir, index_path=index_path).refresh()
+        index_ms = timed(cold_with_index)
+        size_kb = index_path.stat().st_size / 1024
+    return scan_ms, build_ms, index_ms, size_kb
+
+
+def main(counts):
+    print("=" * 72)
+    print(f"{'清单数':>8} {'scan_tools':>14} {'无索引注册表':>14} {'有索引注册表':>14} {'索引大小':>12}")
+    print("-" * 72)
+    for count in counts:
+        scan_ms, build_ms, index_ms, size_kb = bench(count)
+        print(f"{count:>8} {scan_ms:>12.1f}ms {build_ms:>12.1f}ms {index_ms:>12.1f}ms {size_kb:>10.1f}KB")
+    print("=" * 72)
+
+
+if __name__ == "__main__":
+    import sys
+    main([int(arg) for arg in sys.argv[1:]] or [10, 1000, 10000])
@@ -0,0 +1,69 @@
+# bench_launch_latency.py - 工具启动到首次输出的延迟：冷启动与预热进程对比
+#
+# 用法: python benchmarks/bench_launch_latency.py [次数]
+# 预热进程省去的是解释器启动与站点初始化，工具脚本自身的导入仍在启动后执行。
+import argparse
+import json
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+import fixtures  # noqa: F401  (把 main/ 加入 sys.path)
+
+from launch_planner import LaunchPlanner, REFILL_DELAY
+from tool_launcher import ToolLauncher
+
+
+def make_tool(root):
+    tool_dir = Path(root) / "测试"
+    tool_dir.mkdir(parents=True)
+    (tool_dir / "bench.py").write_text("print('ready')\n", encoding="utf-8")
+    tool = {"id": "bench", "name": "bench", "executable": "bench.py"}
+    manifest = tool_dir / "bench.json"
+    manifest.write_text(json.dumps(tool), encoding="utf-8")
+    return tool, manifest
+
+
+def measure(launcher, tool, manifest, count, warm):
+    latencies = []
+    for _ in range(count):
+        run = launcher.launch(tool, manifest)
+        while run.first_output_latency is None:
+            time.sleep(0.001)
+        assert run.warm == warm
+        latencies.append(run.first_output_latency * 1000)
+        run.process.wait()
+        if warm:
+            # 等预热进程补充完毕再测下一次
+            time.sleep(REFILL_DELAY + 0.3)
+    return latencies
+
+
+def main(count):
+    with tempfile.TemporaryDirectory() as root:
+        tool, manifest = make_tool(root)
+        planner = LaunchPlanner(warm=True, max_warm=1)
+        launcher = ToolLauncher(planner=planner)
+        planner.plan(tool, manifest)
+
+        cold = measure(launcher, tool, manifest, count, warm=False)
+        planner.set_warm_tools([tool["id"]])
+        time.sleep(0.5)
+        warm = measure(launcher, tool, manifest, count, warm=True)
+        planner.close()
+
+    print("=" * 48)
+    print(f"次数: {count}")
+    print("-" * 48)
+    for label, samples in (("冷启动", cold), ("预热进程", warm)):
+        print(f"{label:<10}中位数 {statistics.median(samples):>7.1f}ms  最小 {min(samples):>7.1f}ms")
+    print(f"加速比: x{statistics.median(cold) / statistics.median(warm):.2f}")
+    print("=" * 48)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="工具启动延迟基准测试")
+    parser.add_argument("count", type=int, nargs="?", default=10)
+    args = parser.parse_args()
+    main(args.count)
@@ -0,0 +1,77 @@
+# bench_live_monitor.py - 实时监控历史：NumPy 环形缓冲与 deque 逐行统计的对比
+#
+# 用法: python benchmarks/bench_live_monitor.py [核心数] [--rows N] [--repeat N]
+# 缓冲区写满（默认 3600 行，即 1 秒间隔保留 1 小时）后测量写入一行与窗口统计的耗时。
+import argparse
+import random
+import statistics
+import time
+from collections import deque
+
+import fixtures  # noqa: F401  (把 main/ 加入 sys.path)
+
+from live_monitor import BASE_COLUMNS, MetricRing
+
+WINDOWS = (60, 600, None)
+
+
+def measure(fn, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def deque_stats(history, seconds):
+    """对照组：deque 保存 dict，逐列用 Python 计算最小、平均、最大与 P95"""
+    rows = list(history)
+    if seconds is not None:
+        rows = [row for row in rows if row['time'] >= rows[-1]['time'] - seconds]
+    result = {}
+    for column in rows[0]['values']:
+        values = sorted(row['values'][column] for row in rows)
+        result[column] = (values[0], sum(values) / len(values), values[-1], values[int(0.95 * (len(values) - 1))])
+    return result
+
+
+def main(cores, rows, repeat):
+    rng = random.Random(1)
+    columns = list(BASE_COLUMNS) + [f'core{i}' for i in range(cores)]
+    ring = MetricRing(columns, rows)
+    history = deque(maxlen=rows)
+    now = time.time() - rows
+    for i in range(rows):
+        values = [rng.random() * 100 for _ in columns]
+        ring.append(now + i, values)
+        history.append({'time': now + i, 'values': dict(zip(columns, values))})
+
+    # 继续按 1 秒间隔写入，窗口内的行数与真实情况一致
+    values = [rng.random() * 100 for _ in columns]
+    clock = [now + rows]
+
+    def append():
+        clock[0] += 1
+        ring.append(clock[0], values)
+    append_ms = measure(append, repeat * 100)
+    print("=" * 64)
+    print(f"列数: {len(columns)}（{cores} 核）    行数: {rows}    内存: {ring.nbytes / 1024:.0f}KB")
+    print(f"写入一行（中位数）: {append_ms * 1000:.1f}µs")
+    print("-" * 64)
+    print(f"{'窗口':<12}{'MetricRing 统计':>18}{'deque 逐列统计':>18}")
+    for seconds in WINDOWS:
+        ring_ms = measure(lambda: ring.stats(seconds, (50, 95)), repeat)
+        deque_ms = measure(lambda: deque_stats(history, seconds), max(1, repeat // 4))
+        label = f"{seconds}s" if seconds else "全部"
+        print(f"{label:<12}{ring_ms:>16.2f}ms{deque_ms:>16.2f}ms")
+    print("=" * 64)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="实时监控历史基准测试")
+    parser.add_argument("cores", type=int, nargs="?", default=16)
+    parser.add_argument("--rows", type=int, default=3600)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+    main(args.cores, args.rows, args.repeat)
@@ -0,0 +1,105 @@
+# bench_process_table.py - 进程表：单次遍历加静态字段缓存，与逐进程读取全部字段的对比
+#
+# 用法: python benchmarks/bench_process_table.py [--spawn N] [--repeat N]
+# --spawn 额外启动 N 个空闲子进程（非 Windows 用 sleep，Windows 用 python），模拟 1000+ 进程的系统。
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+import fixtures  # noqa: F401  (把 main/ 加入 sys.path)
+
+import psutil
+
+from process_table import ProcessTable
+
+
+def naive_tick():
+    """对照组：每次刷新为每个进程创建 psutil.Process，逐个读取全部字段，返回完整列表"""
+    rows = []
+    for pid in psutil.pids():
+        try:
+            proc = psutil.Process(pid)
+            rows.append([pid, proc.ppid(), proc.name(), proc.username(), proc.status(),
+                         proc.cpu_percent(interval=None), proc.memory_info().rss, proc.num_threads(),
+                         proc.create_time(), proc.exe(), ' '.join(proc.cmdline())])
+        except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess, OSError):
+            continue
+    rows.sort(key=lambda row: row[5], reverse=True)
+    return rows
+
+
+def measure(fn, repeat):
+    samples = []
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples), result
+
+
+def spawn(count):
+    if os.name == 'nt':
+        command = [sys.executable, '-c', 'import time; time.sleep(600)']
+    else:
+        command = ['sleep', '600']
+    return [subprocess.Popen(command, stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL,
+                             stderr=subprocess.DEVNULL) for _ in range(count)]
+
+
+def main(spawn_count, repeat):
+    children = spawn(spawn_count)
+    try:
+        time.sleep(0.5)
+        table = ProcessTable(min_interval=0)
+        start = time.perf_counter()
+        table.sample()
+        first_ms = (time.perf_counter() - start) * 1000
+        tick_ms, _ = measure(lambda: table.sample(force=True), repeat)
+        naive_ms, naive_rows = measure(naive_tick, max(1, repeat // 2))
+
+        table.min_interval = 3600  # 以下只测查询本身
+        page_ms, page = measure(lambda: table.query('cpu', limit=100), repeat)
+        filter_ms, _ = measure(lambda: table.query('name', False, 'sleep python', limit=100), repeat)
+        tree_ms, _ = measure(lambda: table.query('cpu', tree=True, limit=100), repeat)
+        # 下一次刷新：页面带上一页的 token，只取变化的行
+        base = table.query('cpu', limit=100)
+        time.sleep(1)
+        table.sample(force=True)
+        diff = table.query('cpu', limit=100, token=base['token'])
+
+        print("=" * 64)
+        print(f"进程数: {page['total']}（额外启动 {spawn_count} 个）    重复: {repeat} 次（中位数）")
+        print("-" * 64)
+        print(f"{'首次采样（含读取静态字段）':<26}{first_ms:>10.1f}ms")
+        print(f"{'之后每次采样':<26}{tick_ms:>10.1f}ms")
+        print(f"{'逐进程读取全部字段（对照）':<26}{naive_ms:>10.1f}ms")
+        print("-" * 64)
+        print(f"{'查询：按 CPU 排序一页':<26}{page_ms:>10.2f}ms")
+        print(f"{'查询：筛选并按名称排序':<26}{filter_ms:>10.2f}ms")
+        print(f"{'查询：进程树':<26}{tree_ms:>10.2f}ms")
+        print("-" * 64)
+        full_kb = len(json.dumps(naive_rows, ensure_ascii=False).encode('utf-8')) / 1024
+        page_kb = len(json.dumps(page, ensure_ascii=False).encode('utf-8')) / 1024
+        diff_kb = len(json.dumps(diff, ensure_ascii=False).encode('utf-8')) / 1024
+        print(f"{'每次刷新传输：完整列表':<26}{full_kb:>10.1f}KB")
+        print(f"{'每次刷新传输：首次一页':<26}{page_kb:>10.1f}KB")
+        print(f"{'每次刷新传输：之后的差异':<26}{diff_kb:>10.1f}KB（{len(diff['rows'])} 行变化）")
+        print("=" * 64)
+    finally:
+        for child in children:
+            child.kill()
+        for child in children:
+            child.wait()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="进程表基准测试")
+    parser.add_argument("--spawn", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+    main(args.spawn, args.repeat)
@@ -0,0 +1,89 @@
+# bench_search.py - 工具搜索：倒排索引与逐个 in 扫描的查询延迟对比
+#
+# 用法: python benchmarks/bench_search.py [工具数] [--repeat N] [--limit N]
+# 目标：10k 工具时每次查询（含排序）低于 5ms。拼音查询总会运行，未安装 pypinyin 时只能按文字匹配。
+import argparse
+import statistics
+import sys
+import time
+
+import fixtures  # noqa: F401  (把 main/ 加入 sys.path)
+
+from fixtures import make_tools
+from tool_search import ToolSearchIndex, pinyin_available
+
+TARGET_MS = 5.0
+
+QUERIES = [
+    ("单字", "网"),
+    ("二字", "系统"),
+    ("多字", "清理大师"),
+    ("多段", "系统 清理"),
+    ("拉丁前缀", "tool_01"),
+    ("拉丁全部命中", "tool"),
+    ("无结果", "不存在的工具"),
+]
+PINYIN_QUERIES = [
+    ("全拼", "xitong"),
+    ("全拼（中间）", "qingli"),
+    ("首字母", "xtql"),
+]
+
+
+def scan(tools, query):
+    """对照组：逐个工具做子串匹配（改版前页面的做法）"""
+    query = query.lower()
+    return [tool["id"] for tool in tools
+            if query in tool["name"].lower() or query in (tool.get("description") or "").lower()]
+
+
+def measure(fn, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples), max(samples), result
+
+
+def main(count, repeat, limit):
+    tools = make_tools(count)
+    index = ToolSearchIndex()
+    index.reset(tools)
+    # pypinyin 在第一次建立索引时导入，计入建立索引的耗时
+    imported = 'pypinyin' in sys.modules
+    start = time.perf_counter()
+    index.build()
+    build_ms = (time.perf_counter() - start) * 1000
+
+    queries = QUERIES + PINYIN_QUERIES
+    print("=" * 76)
+    print(f"工具数: {count}    建立索引: {build_ms:.1f}ms"
+          f"{'（含导入 pypinyin）' if pinyin_available() and not imported else ''}"
+          f"    拼音: {'可用' if pinyin_available() else '未安装 pypinyin，拼音查询无拼音命中'}")
+    print(f"每个查询重复 {repeat} 次，limit={limit or '全部'}")
+    print("-" * 76)
+    print(f"{'查询':<20}{'命中':>8}{'索引中位数':>12}{'索引最大':>10}{'扫描中位数':>12}")
+    worst = 0.0
+    for label, query in queries:
+        median_ms, max_ms, (ids, total) = measure(lambda: index.search(query, limit), repeat)
+        worst = max(worst, median_ms)
+        if " " in query or label in ("全拼", "全拼（中间）", "首字母"):
+            scan_text = "-"
+        else:
+            scan_ms = measure(lambda: scan(tools, query), max(1, repeat // 4))[0]
+            scan_text = f"{scan_ms:.2f}ms"
+        print(f"{label + ' ' + query:<20}{total:>8}{median_ms:>10.2f}ms{max_ms:>8.2f}ms{scan_text:>12}")
+    print("-" * 76)
+    verdict = "✅ 达到" if worst < TARGET_MS else "❌ 未达到"
+    print(f"最慢查询中位数 {worst:.2f}ms，{verdict}目标（< {TARGET_MS:.0f}ms）")
+    print("=" * 76)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="工具搜索基准测试")
+    parser.add_argument("count", type=int, nargs="?", default=10000)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--limit", type=int, default=0, help="返回结果数上限，0 表示全部（页面的用法）")
+    args = parser.parse_args()
+    main(args.count, args.repeat, args.limit)
@@ -0,0 +1,99 @@
+# bench_startup.py - 启动耗时：模块导入（-X importtime）与窗口显示时间
+#
+# 用法: python benchmarks/bench_startup.py [次数] [--top N] [--window]
+# 每次测量都在新的解释器中进行。--window 会真正启动程序，窗口显示后自动退出
+# （需要可用的 pywebview 图形后端）。
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+MAIN_DIR = Path(__file__).resolve().parent.parent
+
+# 这些模块应在首次使用时才导入，不应出现在启动路径上
+LAZY_MODULES = ("psutil", "webbrowser", "wmi", "system_info", "cpu_sampler", "hardware_info", "tool_stats")
+
+
+def import_profile():
+    """在新进程中 import main，返回 {模块: (自身微秒, 累计微秒)}"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import main"],
+        cwd=MAIN_DIR, capture_output=True, text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1])
+    profile = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        profile[name.strip()] = (int(self_us), int(cumulative_us))
+    return profile
+
+
+def api_ready_time():
+    """在新进程中测量 import main + 创建 Api 的耗时（毫秒）"""
+    code = ("import time; t = time.perf_counter(); import main; main.Api(); "
+            "print((time.perf_counter() - t) * 1000)")
+    result = subprocess.run([sys.executable, "-c", code], cwd=MAIN_DIR, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1])
+    return float(result.stdout.strip().splitlines()[-1])
+
+
+def window_shown_time(timeout=30.0, env=None):
+    """启动程序直到窗口显示（main.py 在 RTOOLS_STARTUP_PROBE 下输出 STARTUP_SHOWN）"""
+    env = dict(os.environ, **(env or {}), RTOOLS_STARTUP_PROBE="1", PYTHONUNBUFFERED="1")
+    start = time.perf_counter()
+    process = subprocess.Popen([sys.executable, "main.py"], cwd=MAIN_DIR, env=env,
+                               stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True)
+    try:
+        for line in process.stdout:
+            if line.strip() == "STARTUP_SHOWN":
+                return (time.perf_counter() - start) * 1000
+            if time.perf_counter() - start > timeout:
+                break
+        return None
+    finally:
+        process.kill()
+        process.wait()
+
+
+def main(count, top, window):
+    profiles = [import_profile() for _ in range(count)]
+    totals = [profile["main"][1] / 1000 for profile in profiles]
+    api_times = [api_ready_time() for _ in range(count)]
+
+    print("=" * 56)
+    print(f"次数: {count}")
+    print("-" * 56)
+    print(f"{'import main':<24}中位数 {statistics.median(totals):>8.1f}ms")
+    print(f"{'import main + Api()':<24}中位数 {statistics.median(api_times):>8.1f}ms")
+    if window:
+        shown = [window_shown_time() for _ in range(count)]
+        if None in shown:
+            print(f"{'窗口显示':<24}无法测量（图形后端不可用？）")
+        else:
+            print(f"{'窗口显示':<24}中位数 {statistics.median(shown):>8.1f}ms")
+
+    print("-" * 56)
+    print(f"累计耗时最多的 {top} 个模块（最后一次测量）:")
+    last = profiles[-1]
+    for name, (self_us, cumulative_us) in sorted(last.items(), key=lambda kv: -kv[1][1])[:top]:
+        print(f"  {name:<36}{cumulative_us / 1000:>8.1f}ms")
+    eager = [name for name in LAZY_MODULES if name in last]
+    print("-" * 56)
+    print(f"启动时被提前导入的延迟模块: {', '.join(eager) or '无'}")
+    print("=" * 56)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="启动耗时基准测试")
+    parser.add_argument("count", type=int, nargs="?", default=5)
+    parser.add_argument("--top", type=int, default=10)
+    parser.add_argument("--window", action="store_true", help="同时测量到窗口显示的时间")
+    args = parser.parse_args()
+    main(args.count, args.top, args.window)
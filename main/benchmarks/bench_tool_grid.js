@@ -0,0 +1,130 @@
+// bench_tool_grid.js - 工具网格渲染与收藏切换延迟（由 bench_tool_grid.py 注入页面运行）
+//
+// 对比两种渲染方式：
+//   legacy  清空容器后为每个工具解析一次 HTML 模板（改版前的做法）
+//   virtual ToolGrid：只渲染视口附近的卡片，复用节点，只修改变化的字段
+// 每次操作后读取 offsetHeight 强制完成样式与布局，计入耗时。
+
+function legacyCard(tool) {
+    const card = document.createElement('div');
+    card.className = 'tool-card';
+    card.innerHTML = `
+        <div class="tool-header">
+            <div class="tool-icon icon-${tool.category}">
+                <i class="${tool.icon || 'fas fa-tools'}"></i>
+            </div>
+            <div>
+                <div class="tool-title">${tool.name}</div>
+                <div class="tool-status">
+                    <i class="fas fa-circle status-${tool.status}"></i>
+                    <span>${tool.status === 'on' ? '可用' : '维护中'}</span>
+                </div>
+            </div>
+        </div>
+        <div class="tool-desc">${tool.description || '暂无描述'}</div>
+        <div class="tool-footer">
+            <div class="tool-status">
+                <i class="fas fa-heart" style="color: ${tool.favorite ? '#ef4444' : '#9ca3af'}; cursor: pointer;"
+                   onclick="toggleFavorite('${tool.id}')" title="${tool.favorite ? '取消收藏' : '收藏'}"></i>
+                <span style="margin-left: 5px;">${tool.category}</span>
+            </div>
+            <button class="btn btn-primary" onclick="launchTool('${tool.id}')">
+                <i class="fas fa-play"></i> 启动
+            </button>
+        </div>
+    `;
+    return card;
+}
+
+function legacyRender(container, tools) {
+    container.innerHTML = '';
+    tools.forEach(tool => container.appendChild(legacyCard(tool)));
+}
+
+function settle(...containers) {
+    containers.forEach(container => container.offsetHeight);
+}
+
+function timed(fn) {
+    const start = performance.now();
+    fn();
+    return performance.now() - start;
+}
+
+function median(values) {
+    const sorted = values.slice().sort((a, b) => a - b);
+    return sorted[Math.floor(sorted.length / 2)];
+}
+
+function resetGrids() {
+    ['all-tools', 'favorite-tools'].forEach(id => {
+        const old = document.getElementById(id);
+        const fresh = old.cloneNode(false);
+        old.replaceWith(fresh);
+    });
+    document.querySelector('.content-area').scrollTop = 0;
+    return [document.getElementById('all-tools'), document.getElementById('favorite-tools')];
+}
+
+function runBenchmark(tools, repeat) {
+    const results = { tools: tools.length, repeat: repeat };
+    const samples = {};
+    const record = (name, ms) => (samples[name] = samples[name] || []).push(ms);
+    const favorites = () => tools.filter(tool => tool.favorite);
+
+    for (let i = 0; i < repeat; i++) {
+        // legacy：首次渲染，切换收藏后重建两个网格
+        let [all, fav] = resetGrids();
+        record('legacy.render', timed(() => {
+            legacyRender(all, tools);
+            settle(all);
+        }));
+        const target = tools[(i * 7919) % tools.length];
+        record('legacy.toggle', timed(() => {
+            target.favorite = !target.favorite;
+            legacyRender(fav, favorites());
+            legacyRender(all, tools);
+            settle(all, fav);
+        }));
+        target.favorite = !target.favorite;
+
+        // virtual：首次渲染（含测量行高后的第二次渲染），切换收藏，滚动到中部
+        [all, fav] = resetGrids();
+        let allGrid, favGrid;
+        record('virtual.render', timed(() => {
+            allGrid = new ToolGrid(all);
+            favGrid = new ToolGrid(fav, { emptyText: '暂无收藏的工具' });
+            allGrid.setTools(tools);
+            if (allGrid.frame) allGrid.render();
+            settle(all);
+        }));
+        favGrid.setTools(favorites());
+        record('virtual.toggle', timed(() => {
+            target.favorite = !target.favorite;
+            favGrid.setTools(favorites());
+            allGrid.setTools(tools);
+            settle(all, fav);
+        }));
+        target.favorite = !target.favorite;
+        const area = document.querySelector('.content-area');
+        record('virtual.scroll', timed(() => {
+            area.scrollTop = area.scrollHeight / 2;
+            allGrid.render();
+            settle(all);
+        }));
+        results.mounted_cards = all.querySelectorAll('.tool-card').length;
+    }
+    Object.keys(samples).forEach(name => (results[name] = Math.round(median(samples[name]) * 10) / 10));
+    return results;
+}
+
+window.addEventListener('load', () => {
+    const results = runBenchmark(BENCH_TOOLS, BENCH_REPEAT);
+    console.log(JSON.stringify(results));
+    document.getElementById('bench-results').textContent = JSON.stringify(results, null, 2);
+    if (window.pywebview && window.pywebview.api && window.pywebview.api.report) {
+        window.pywebview.api.report(results);
+    } else {
+        window.addEventListener('pywebviewready', () => window.pywebview.api.report(results), { once: true });
+    }
+});
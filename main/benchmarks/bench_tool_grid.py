@@ -0,0 +1,108 @@
+# bench_tool_grid.py - 工具网格渲染与收藏切换延迟：整表重建与虚拟化网格对比
+#
+# 用法: python benchmarks/bench_tool_grid.py [工具数] [--repeat N] [--html FILE]
+# 默认在 pywebview 窗口中运行（需要图形后端），结果打印到控制台；
+# --html 只生成独立的测试页面，可用任意浏览器打开，结果显示在页面上。
+import argparse
+import json
+import sys
+
+import fixtures  # noqa: F401  (把 main/ 加入 sys.path)
+
+from bench_startup import MAIN_DIR
+from fixtures import make_tools
+
+BENCH_DIR = MAIN_DIR / "benchmarks"
+
+PAGE = """<!DOCTYPE html>
+<html lang="zh-CN">
+<head>
+<meta charset="UTF-8">
+<style>{app_css}</style>
+<style>.content-area {{ height: 800px; flex: none; }}</style>
+</head>
+<body>
+<div class="content-area">
+    <div class="tools-grid" id="favorite-tools"></div>
+    <div class="tools-grid" id="all-tools"></div>
+</div>
+<pre id="bench-results">运行中...</pre>
+<script>const BENCH_TOOLS = {tools}; const BENCH_REPEAT = {repeat};</script>
+<script>{tool_grid_js}</script>
+<script>{bench_js}</script>
+</body>
+</html>
+"""
+
+ROWS = (
+    ("legacy.render", "整表重建：首次渲染"),
+    ("legacy.toggle", "整表重建：切换收藏"),
+    ("virtual.render", "虚拟化：首次渲染"),
+    ("virtual.toggle", "虚拟化：切换收藏"),
+    ("virtual.scroll", "虚拟化：滚动到中部"),
+)
+
+
+def build_page(count, repeat):
+    tools = json.dumps(make_tools(count), ensure_ascii=False).replace("</", "<\\/")
+    return PAGE.format(
+        app_css=(MAIN_DIR / "ui" / "app.css").read_text(encoding="utf-8"),
+        tool_grid_js=(MAIN_DIR / "ui" / "tool_grid.js").read_text(encoding="utf-8"),
+        bench_js=(BENCH_DIR / "bench_tool_grid.js").read_text(encoding="utf-8"),
+        tools=tools,
+        repeat=repeat,
+    )
+
+
+class BenchApi:
+    def __init__(self):
+        self.results = None
+        self._window = None
+
+    def report(self, results):
+        self.results = results
+        if self._window is not None:
+            self._window.destroy()
+
+
+def print_results(results):
+    print("=" * 56)
+    print(f"工具数: {results['tools']}    重复: {results['repeat']} 次（中位数）")
+    print("-" * 56)
+    for key, label in ROWS:
+        print(f"{label:<20}{results[key]:>10.1f}ms")
+    print("-" * 56)
+    print(f"虚拟化网格中实际存在的卡片: {results['mounted_cards']}")
+    print("=" * 56)
+
+
+def main(count, repeat, html_path):
+    page = build_page(count, repeat)
+    if html_path:
+        with open(html_path, "w", encoding="utf-8") as f:
+            f.write(page)
+        print(f"✅ 已生成测试页面: {html_path}")
+        return
+
+    import webview
+    api = BenchApi()
+    api._window = webview.create_window("tool grid benchmark", html=page, width=1200, height=900, js_api=api)
+    try:
+        webview.start()
+    except Exception as e:
+        print(f"❌ 无法打开 pywebview 窗口: {e}")
+        print("💡 可使用 --html FILE 生成测试页面，用浏览器打开")
+        sys.exit(1)
+    if api.results is None:
+        print("❌ 窗口关闭前没有收到结果")
+        sys.exit(1)
+    print_results(api.results)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="工具网格渲染基准测试")
+    parser.add_argument("count", type=int, nargs="?", default=10000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--html", metavar="FILE", help="只生成测试页面")
+    args = parser.parse_args()
+    main(args.count, args.repeat, args.html)
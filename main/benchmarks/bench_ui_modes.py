@@ -0,0 +1,134 @@
+# bench_ui_modes.py - 界面加载方式对比：inline（内嵌 HTML 字符串）与 served（可缓存的 ui/ 资源）
+#
+# 用法: python benchmarks/bench_ui_modes.py [次数] [--window]
+# 1. Python 侧：在新进程中准备页面的耗时，以及进程常驻的界面字符串大小；
+# 2. 页面加载：通过真实的 HTTP 服务器模拟 webview 首次加载（空缓存）与再次启动
+#    （index.html 条件请求，带哈希的资源直接命中缓存），统计请求数、传输字节与耗时；
+# 3. --window：分别以两种模式启动程序直到窗口显示（需要可用的 pywebview 图形后端）。
+import argparse
+import re
+import statistics
+import subprocess
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+from wsgiref.simple_server import WSGIRequestHandler, make_server
+
+import fixtures  # noqa: F401  (把 main/ 加入 sys.path)
+
+from bench_startup import MAIN_DIR, window_shown_time
+from ui_server import UiAssets
+
+REFERENCE = re.compile(rb'(?:href|src)="(/[^"]+)"|url\("(/[^"]+)"\)')
+
+PREPARE_CODE = {
+    "inline": ("import time; t = time.perf_counter(); from ui_server import UiAssets; "
+               "page = UiAssets().render_inline(); "
+               "print((time.perf_counter() - t) * 1000, len(page.encode('utf-8')))"),
+    "served": ("import time; t = time.perf_counter(); from ui_server import UiAssets; "
+               "assets = UiAssets(); "
+               "kept = sum(len(a.body) for a in set(assets._routes.values()) if a.body is not None); "
+               "print((time.perf_counter() - t) * 1000, kept)"),
+}
+
+
+class _QuietHandler(WSGIRequestHandler):
+    def log_message(self, *args):
+        pass
+
+
+def prepare_time(mode):
+    """在新进程中准备页面，返回 (毫秒, 常驻字节数)"""
+    result = subprocess.run([sys.executable, "-c", PREPARE_CODE[mode]], cwd=MAIN_DIR,
+                            capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1])
+    elapsed, size = result.stdout.split()
+    return float(elapsed), int(size)
+
+
+def load_page(base_url, cache):
+    """按浏览器的方式加载页面：cache 为 {路径: (ETag, 是否 immutable, 字节数)}，返回 (请求数, 传输字节)"""
+    requests = transferred = 0
+    pending = ["/"]
+    seen = set()
+    while pending:
+        path = pending.pop()
+        if path in seen:
+            continue
+        seen.add(path)
+        cached = cache.get(path)
+        if cached is not None and cached[1]:
+            # immutable：不发请求
+            body = cached[3]
+        else:
+            headers = {"If-None-Match": cached[0]} if cached is not None else {}
+            requests += 1
+            try:
+                with urllib.request.urlopen(urllib.request.Request(base_url + path, headers=headers)) as response:
+                    body = response.read()
+                    transferred += len(body)
+                    cache[path] = (response.headers.get("ETag"), "immutable" in (response.headers.get("Cache-Control") or ""),
+                                   len(body), body)
+            except urllib.error.HTTPError as e:
+                if e.code != 304:
+                    raise
+                body = cached[3]
+        for match in REFERENCE.finditer(body):
+            pending.append((match.group(1) or match.group(2)).decode("ascii"))
+    return requests, transferred
+
+
+def page_load(count):
+    server = make_server("127.0.0.1", 0, UiAssets(), handler_class=_QuietHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_port}"
+    try:
+        cold, warm = [], []
+        for _ in range(count):
+            cache = {}
+            start = time.perf_counter()
+            cold_requests, cold_bytes = load_page(base_url, cache)
+            cold.append((time.perf_counter() - start) * 1000)
+            start = time.perf_counter()
+            warm_requests, warm_bytes = load_page(base_url, cache)
+            warm.append((time.perf_counter() - start) * 1000)
+        return (statistics.median(cold), cold_requests, cold_bytes), (statistics.median(warm), warm_requests, warm_bytes)
+    finally:
+        server.shutdown()
+
+
+def main(count, window):
+    print("=" * 64)
+    print(f"次数: {count}")
+    print("-" * 64)
+    for mode in ("inline", "served"):
+        samples = [prepare_time(mode) for _ in range(count)]
+        elapsed = statistics.median(s[0] for s in samples)
+        print(f"{mode:<8}准备页面 中位数 {elapsed:>8.1f}ms   常驻界面字符串 {samples[-1][1] / 1024:>7.1f}KB")
+
+    print("-" * 64)
+    (cold_ms, cold_requests, cold_bytes), (warm_ms, warm_requests, warm_bytes) = page_load(count)
+    print(f"served  首次加载（空缓存）  {cold_ms:>7.1f}ms  {cold_requests:>2} 个请求  {cold_bytes / 1024:>7.1f}KB")
+    print(f"served  再次启动（有缓存）  {warm_ms:>7.1f}ms  {warm_requests:>2} 个请求  {warm_bytes / 1024:>7.1f}KB")
+    print("inline  每次启动都通过 html= 传入整个页面（字体以 base64 内嵌），webview 无法缓存")
+
+    if window:
+        print("-" * 64)
+        for mode in ("inline", "served"):
+            shown = [window_shown_time(env={"RTOOLS_UI_MODE": mode}) for _ in range(count)]
+            if None in shown:
+                print(f"{mode:<8}窗口显示 无法测量（图形后端不可用？）")
+            else:
+                print(f"{mode:<8}窗口显示 中位数 {statistics.median(shown):>8.1f}ms")
+    print("=" * 64)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="界面加载方式对比")
+    parser.add_argument("count", type=int, nargs="?", default=5)
+    parser.add_argument("--window", action="store_true", help="同时测量两种模式下到窗口显示的时间")
+    args = parser.parse_args()
+    main(args.count, args.window)
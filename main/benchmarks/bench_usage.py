@@ -0,0 +1,62 @@
+# bench_usage.py - 工具使用记录：记录一次启动与取常用工具的延迟
+#
+# 用法: python benchmarks/bench_usage.py [工具数] [--launches N]
+# 记录一次启动为 O(log n)（含追加一行日志），取前 k 个为 O(k log n)，与工具数基本无关。
+import argparse
+import random
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+import fixtures  # noqa: F401  (把 main/ 加入 sys.path)
+
+from usage_store import UsageTracker
+
+
+def main(count, launches):
+    rng = random.Random(1)
+    with tempfile.TemporaryDirectory() as tmp:
+        journal = Path(tmp) / "usage.journal"
+        tracker = UsageTracker(journal, max_tools=count)
+        now = time.time()
+        # 预先填充：过去 30 天内的启动，少数工具使用频繁
+        for _ in range(count * 2):
+            tool_id = f"tool_{int(rng.paretovariate(1.2)) % count:05d}"
+            tracker.record(tool_id, now - rng.random() * 30 * 86400)
+        tracker.compact()
+
+        record_samples = []
+        for _ in range(launches):
+            tool_id = f"tool_{rng.randrange(count):05d}"
+            start = time.perf_counter()
+            tracker.record(tool_id)
+            record_samples.append((time.perf_counter() - start) * 1000)
+        top_samples = []
+        for _ in range(launches):
+            start = time.perf_counter()
+            tracker.top(8)
+            top_samples.append((time.perf_counter() - start) * 1000)
+        start = time.perf_counter()
+        UsageTracker(journal, max_tools=count)
+        load_ms = (time.perf_counter() - start) * 1000
+        start = time.perf_counter()
+        tracker.boosts()
+        boosts_ms = (time.perf_counter() - start) * 1000
+
+    print("=" * 56)
+    print(f"有记录的工具: {count}    测量次数: {launches}")
+    print("-" * 56)
+    print(f"{'记录一次启动（中位数）':<24}{statistics.median(record_samples):>10.3f}ms")
+    print(f"{'取前 8 个常用工具（中位数）':<24}{statistics.median(top_samples):>10.3f}ms")
+    print(f"{'重放日志（启动时）':<24}{load_ms:>10.1f}ms")
+    print(f"{'计算搜索加权（变化后首次）':<24}{boosts_ms:>10.1f}ms")
+    print("=" * 56)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="工具使用记录基准测试")
+    parser.add_argument("count", type=int, nargs="?", default=10000)
+    parser.add_argument("--launches", type=int, default=1000)
+    args = parser.parse_args()
+    main(args.count, args.launches)
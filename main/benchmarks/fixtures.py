@@ -0,0 +1,48 @@
+# fixtures.py - 基准测试用的合成工具清单
+import json
+import random
+import sys
+from pathlib import Path
+
+# 让基准脚本可以直接导入 main 目录下的模块
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+CATEGORIES = ["system", "security", "network", "utilities"]
+ICONS = ["fas fa-broom", "fas fa-lock", "fas fa-tachometer-alt", "fas fa-file-image", "fas fa-tasks"]
+WORDS = ["系统", "清理", "大师", "网络", "速度", "测试", "文件", "加密", "图片", "格式",
+         "转换", "进程", "管理", "磁盘", "备份", "注册表", "优化", "监控", "下载", "工具"]
+
+
+def make_tools(count, seed=0):
+    """生成 count 个工具的清单数据（与 make_tools_dir 写入的内容相同）"""
+    rng = random.Random(seed)
+    tools = []
+    for i in range(count):
+        category = CATEGORIES[i % len(CATEGORIES)]
+        tool_id = f"tool_{i:05d}"
+        name = "".join(rng.sample(WORDS, 3))
+        tools.append({
+            "id": tool_id,
+            "name": name,
+            "description": f"{name}：" + "、".join(rng.sample(WORDS, 6)),
+            "executable": f"{tool_id}.exe",
+            "version": "1.0.0",
+            "author": "R-tools Team",
+            "icon": rng.choice(ICONS),
+            "status": "on",
+            "favorite": rng.random() < 0.05,
+            "category": category,
+            "requires_admin": rng.random() < 0.2,
+        })
+    return tools
+
+
+def make_tools_dir(root, count, seed=0):
+    """在 root 下生成 count 个工具清单，返回工具目录路径"""
+    tools_dir = Path(root) / "tools"
+    for category in CATEGORIES:
+        (tools_dir / category).mkdir(parents=True, exist_ok=True)
+    for manifest in make_tools(count, seed):
+        with open(tools_dir / manifest["category"] / f"{manifest['id']}.json", "w", encoding="utf-8") as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=2)
+    return tools_dir
@@ -14,10 +14,9 @@ class Config:
         self.base_dir = Path(__file__).parent
         self.tools_dir = self.base_dir / "tools"
         self.icons_dir = self.base_dir / "icons"
-        
-        # 确保目录存在
-        self.tools_dir.mkdir(exist_ok=True)
-        self.icons_dir.mkdir(exist_ok=True)
+        self.assets_dir = self.base_dir / "assets"
+        # 导入本模块不访问磁盘：需要写入的目录由写入方在首次写入前创建
+        # （tools 见 utils.ensure_tools_dir，webview_data 在启动窗口前创建；icons 随程序发布，运行时只读）
         
         # 主题颜色 - 克莱因蓝
         self.theme_colors = {
@@ -78,20 +77,95 @@ class Config:
             {"name": "QQ邮箱", "url": "https://mail.qq.com", "icon": "fas fa-envelope", "category": "办公"}
         ]
         
-        # 用户设置
-        self.settings = {
+        # 用户设置（首次访问时才读取 config.json）
+        self._settings = None
+        
+        # 工具清单索引（加快冷启动）
+        self.tools_index_file = self.base_dir / "tools_index.bin"
+        
+        # 工具收藏记录（追加式日志）
+        self.favorites_file = self.base_dir / "favorites.journal"
+        
+        # 工具使用记录（追加式日志，用于常用工具与搜索排序）
+        self.usage_file = self.base_dir / "usage.journal"
+        
+        # webview 缓存与本地存储（served 模式下跨启动复用界面资源）
+        self.webview_data_dir = self.base_dir / "webview_data"
+        
+        # 运行时生成的文件（如重新生成的图标子集）；打包后程序目录只读，放在用户缓存目录
+        self.cache_dir = self.user_cache_dir()
+        
+        # 加载用户配置
+        self.config_file = self.base_dir / "config.json"
+    
+    def user_cache_dir(self):
+        """用户可写的缓存目录：Windows 为 %LOCALAPPDATA%，其他系统遵循 XDG_CACHE_HOME"""
+        if os.name == 'nt':
+            root = os.environ.get('LOCALAPPDATA')
+        else:
+            root = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+        if not root:
+            return self.base_dir / "cache"
+        return Path(root) / "R-tools-box"
+    
+    @property
+    def settings(self):
+        if self._settings is None:
+            self._settings = self.default_settings()
+            self.load_config()
+        return self._settings
+    
+    def default_settings(self):
+        """默认设置"""
+        return {
             "theme": "light",
             "default_search": "百度",
             "show_favorites": True,
             "show_tools": True,
             "check_updates": True,
             "window_position": None,
-            "window_size": [1200, 800]
+            "window_size": [1200, 800],
+            # CPU采样间隔（秒）与滚动窗口长度（采样次数）
+            "cpu_sample_interval": 1.0,
+            "cpu_history_length": 60,
+            # 系统信息慢变层（磁盘、网络）与实时层的缓存时间（秒）
+            "system_info_slow_ttl": 30.0,
+            "system_info_live_ttl": 1.0,
+            # 主机名解析的最长等待时间与结果缓存时间（秒）
+            "dns_timeout": 1.0,
+            "dns_cache_ttl": 300.0,
+            # 解析失败或超时后，在此时间（秒）内直接使用网卡地址，不再等待 DNS
+            "dns_negative_ttl": 30.0,
+            # 工具目录监视：事件防抖时间与轮询模式的间隔（秒）
+            "tools_watch_debounce": 0.3,
+            "tools_poll_interval": 2.0,
+            # 并行解析工具清单的线程数
+            "manifest_load_workers": 8,
+            # 同时运行的工具数量上限
+            "max_running_tools": 4,
+            # 每个运行中工具保留的输出大小（KB）
+            "tool_output_buffer_kb": 256,
+            # 为收藏的 Python 脚本工具保持空闲的预热进程，及预热进程数量上限
+            "warm_favorites": False,
+            "max_warm_helpers": 2,
+            # 工具资源占用的采样间隔（秒）与滚动窗口长度（采样次数）
+            "tool_stats_interval": 2.0,
+            "tool_stats_history": 30,
+            # 实时监控：采样间隔与推送间隔（秒）、保留的历史时长（秒）及其内存上限（KB）
+            "live_monitor_interval": 1.0,
+            "live_monitor_push_interval": 1.0,
+            "live_monitor_history": 3600,
+            "live_monitor_max_kb": 4096,
+            # 进程表两次采样的最短间隔（秒），间隔内的查询沿用上次采样
+            "process_table_interval": 1.0,
+            # 使用频率的半衰期（天）与保留使用记录的工具数量上限
+            "usage_half_life_days": 7.0,
+            "usage_max_tools": 500,
+            # 界面加载方式："served" 由本地 HTTP 服务器提供可缓存的 ui/ 资源，"inline" 内嵌为一个 HTML 字符串
+            "ui_mode": "served",
+            # served 模式的固定端口（端口变化会使 webview 缓存失效），被占用时改用随机端口
+            "ui_http_port": 42001
         }
-        
-        # 加载用户配置
-        self.config_file = self.base_dir / "config.json"
-        self.load_config()
     
     def load_config(self):
         """加载用户配置"""
@@ -0,0 +1,95 @@
+# cpu_sampler.py - 后台CPU采样器
+import threading
+import time
+from collections import deque
+
+import psutil
+
+from config import config
+
+
+class CpuSampler:
+    """后台CPU采样器，维护总体和每核心使用率的滚动窗口"""
+
+    def __init__(self, interval=1.0, history_length=60):
+        self.interval = max(0.1, float(interval))
+        self.history = deque(maxlen=max(1, int(history_length)))
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    def start(self):
+        """启动采样线程（重复调用无副作用）"""
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stop_event.clear()
+            # 首次调用只建立基准，返回值无意义
+            psutil.cpu_percent(interval=None)
+            psutil.cpu_percent(interval=None, percpu=True)
+            self._thread = threading.Thread(target=self._run, name="cpu-sampler", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        """停止采样线程"""
+        self._stop_event.set()
+        thread = self._thread
+        if thread is not None:
+            thread.join(timeout=self.interval + 1)
+        self._thread = None
+
+    def _run(self):
+        while not self._stop_event.wait(self.interval):
+            try:
+                self._sample()
+            except Exception as e:
+                print(f"⚠️  CPU采样失败: {e}")
+
+    def _sample(self):
+        sample = {
+            'time': time.time(),
+            'total': psutil.cpu_percent(interval=None),
+            'per_cpu': psutil.cpu_percent(interval=None, percpu=True),
+        }
+        with self._lock:
+            self.history.append(sample)
+        return sample
+
+    def latest(self):
+        """返回最近一次采样，不阻塞；采样线程尚未产出数据时返回 None
+
+        不在调用方线程中补采：cpu_percent 的基准点是全局的，补采会缩短后台线程的采样区间。
+        """
+        with self._lock:
+            if self.history:
+                return self.history[-1]
+        return None
+
+    def window(self):
+        """返回滚动窗口内的全部采样（按时间从旧到新）"""
+        with self._lock:
+            return list(self.history)
+
+    def average(self):
+        """返回滚动窗口内的平均总体使用率（尚无采样时为 None）"""
+        samples = self.window()
+        if not samples:
+            return None
+        return sum(s['total'] for s in samples) / len(samples)
+
+
+_sampler = None
+_sampler_lock = threading.Lock()
+
+
+def get_cpu_sampler():
+    """获取全局CPU采样器，首次调用时按 config.settings 创建并启动"""
+    global _sampler
+    with _sampler_lock:
+        if _sampler is None:
+            _sampler = CpuSampler(
+                interval=config.settings.get('cpu_sample_interval', 1.0),
+                history_length=config.settings.get('cpu_history_length', 60),
+            )
+            _sampler.start()
+        return _sampler
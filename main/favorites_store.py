@@ -0,0 +1,97 @@
+# favorites_store.py - 工具收藏状态的持久化（追加式日志）
+import json
+import os
+import threading
+from pathlib import Path
+
+
+class FavoritesStore:
+    """收藏状态存储
+
+    每次切换只向日志追加一行 {"id": ..., "favorite": ...}，不改写工具清单；
+    日志增长到一定程度后在后台线程中压缩为每个工具一行。
+    """
+
+    def __init__(self, journal_path, compact_threshold=256):
+        self.journal_path = Path(journal_path)
+        self.compact_threshold = max(1, int(compact_threshold))
+        self._state = {}       # 工具 id -> 是否收藏
+        self._journal_lines = 0
+        self._lock = threading.Lock()
+        self._compacting = False
+        self.load()
+
+    def load(self):
+        """重放日志，恢复收藏状态"""
+        state = {}
+        lines = 0
+        try:
+            with open(self.journal_path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    lines += 1
+                    try:
+                        record = json.loads(line)
+                        state[record['id']] = bool(record['favorite'])
+                    except (ValueError, KeyError, TypeError):
+                        # 写入中途断电留下的半行，忽略即可
+                        continue
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            print(f"⚠️  加载收藏记录失败: {e}")
+        with self._lock:
+            self._state = state
+            self._journal_lines = lines
+
+    def get(self, tool_id, default=False):
+        with self._lock:
+            return self._state.get(tool_id, default)
+
+    def apply(self, tool):
+        """把已保存的收藏状态覆盖到工具数据上（没有记录时保留清单中的默认值）"""
+        with self._lock:
+            if tool.get('id') in self._state:
+                tool['favorite'] = self._state[tool['id']]
+        return tool
+
+    def set(self, tool_id, favorite):
+        """记录一次切换：O(1) 追加一行日志"""
+        favorite = bool(favorite)
+        record = json.dumps({'id': tool_id, 'favorite': favorite}, ensure_ascii=False)
+        with self._lock:
+            try:
+                with open(self.journal_path, 'a', encoding='utf-8') as f:
+                    f.write(record + '\n')
+            except Exception as e:
+                print(f"❌ 保存收藏状态失败: {e}")
+                return False
+            self._state[tool_id] = favorite
+            self._journal_lines += 1
+            needs_compaction = (not self._compacting and
+                                self._journal_lines > len(self._state) + self.compact_threshold)
+            if needs_compaction:
+                self._compacting = True
+        if needs_compaction:
+            threading.Thread(target=self.compact, name="favorites-compact", daemon=True).start()
+        return True
+
+    def compact(self):
+        """把日志重写为每个工具一行（原子替换）"""
+        try:
+            with self._lock:
+                lines = [json.dumps({'id': tool_id, 'favorite': favorite}, ensure_ascii=False)
+                         for tool_id, favorite in self._state.items()]
+                tmp_path = self.journal_path.with_name(self.journal_path.name + '.tmp')
+                # 在锁内完成写入与替换，期间的切换会等待，不会丢失
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    f.write(''.join(line + '\n' for line in lines))
+                os.replace(tmp_path, self.journal_path)
+                self._journal_lines = len(lines)
+        except Exception as e:
+            print(f"⚠️  压缩收藏记录失败: {e}")
+        finally:
+            with self._lock:
+                self._compacting = False
@@ -0,0 +1,263 @@
+# hardware_info.py - 硬件信息查询（WMI/CIM 连接池与可插拔后端）
+import platform
+import queue
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+
+# 支持查询的硬件字段
+HARDWARE_FIELDS = ('cpu_model', 'gpu', 'bios', 'board')
+
+
+class HardwareBackend:
+    """硬件信息后端基类，子类为每个字段实现 query_<field> 方法"""
+
+    name = 'base'
+
+    def is_available(self):
+        return True
+
+    def query(self, field):
+        handler = getattr(self, f'query_{field}', None)
+        if handler is None:
+            raise KeyError(f"不支持的硬件字段: {field}")
+        return handler()
+
+    def close(self):
+        pass
+
+
+class WmiConnectionPool:
+    """WMI 连接池，连接在首次使用时创建，之后在线程间复用"""
+
+    def __init__(self, max_size=2, namespace=None):
+        self.max_size = max(1, int(max_size))
+        self.namespace = namespace
+        self._idle = queue.LifoQueue()
+        self._created = 0
+        self._lock = threading.Lock()
+        self._com_state = threading.local()
+
+    def _ensure_com(self):
+        # COM 需要按线程初始化，使用多线程套间以便连接跨线程共享
+        if getattr(self._com_state, 'ready', False):
+            return
+        try:
+            import pythoncom
+            pythoncom.CoInitializeEx(pythoncom.COINIT_MULTITHREADED)
+        except ImportError:
+            pass
+        except Exception:
+            # 线程已用其它套间模式初始化过
+            pass
+        self._com_state.ready = True
+
+    def _connect(self):
+        import wmi
+        if self.namespace:
+            return wmi.WMI(namespace=self.namespace)
+        return wmi.WMI()
+
+    @contextmanager
+    def connection(self, timeout=10):
+        """借出一个连接，用完自动归还"""
+        self._ensure_com()
+        conn = None
+        try:
+            conn = self._idle.get_nowait()
+        except queue.Empty:
+            with self._lock:
+                can_create = self._created < self.max_size
+                if can_create:
+                    self._created += 1
+            if can_create:
+                try:
+                    conn = self._connect()
+                except Exception:
+                    with self._lock:
+                        self._created -= 1
+                    raise
+            else:
+                conn = self._idle.get(timeout=timeout)
+        try:
+            yield conn
+        finally:
+            self._idle.put(conn)
+
+    def close(self):
+        while True:
+            try:
+                self._idle.get_nowait()
+            except queue.Empty:
+                break
+        with self._lock:
+            self._created = 0
+
+
+class WmiBackend(HardwareBackend):
+    """Windows 下基于 WMI 的后端"""
+
+    name = 'wmi'
+
+    def __init__(self, pool=None):
+        self.pool = pool or WmiConnectionPool()
+
+    def is_available(self):
+        if platform.system() != "Windows":
+            return False
+        try:
+            import wmi  # noqa: F401
+            return True
+        except ImportError:
+            return False
+
+    def query_cpu_model(self):
+        with self.pool.connection() as c:
+            return c.Win32_Processor()[0].Name.strip()
+
+    def query_gpu(self):
+        with self.pool.connection() as c:
+            names = [gpu.Name for gpu in c.Win32_VideoController() if gpu.Name]
+        return ', '.join(names) or None
+
+    def query_bios(self):
+        with self.pool.connection() as c:
+            bios = c.Win32_BIOS()[0]
+            return ' '.join(part for part in (bios.Manufacturer, bios.SMBIOSBIOSVersion) if part) or None
+
+    def query_board(self):
+        with self.pool.connection() as c:
+            board = c.Win32_BaseBoard()[0]
+            return ' '.join(part for part in (board.Manufacturer, board.Product) if part) or None
+
+    def close(self):
+        self.pool.close()
+
+
+class SysfsBackend(HardwareBackend):
+    """Linux 下读取 /proc/cpuinfo 与 DMI sysfs 的后端，接口与 WMI 后端一致"""
+
+    name = 'sysfs'
+
+    def __init__(self, proc_dir='/proc', sys_dir='/sys'):
+        self.proc_dir = Path(proc_dir)
+        self.sys_dir = Path(sys_dir)
+
+    def is_available(self):
+        return (self.proc_dir / 'cpuinfo').exists()
+
+    def _read(self, path):
+        try:
+            return path.read_text(encoding='utf-8', errors='replace').strip() or None
+        except OSError:
+            return None
+
+    def _dmi(self, *names):
+        dmi_dir = self.sys_dir / 'class' / 'dmi' / 'id'
+        parts = [self._read(dmi_dir / name) for name in names]
+        return ' '.join(part for part in parts if part) or None
+
+    def query_cpu_model(self):
+        text = self._read(self.proc_dir / 'cpuinfo') or ''
+        for line in text.splitlines():
+            key, _, value = line.partition(':')
+            # x86 为 model name，ARM 等平台为 Hardware / Processor
+            if key.strip() in ('model name', 'Hardware', 'Processor', 'cpu model'):
+                return value.strip() or None
+        return None
+
+    def query_gpu(self):
+        drm_dir = self.sys_dir / 'class' / 'drm'
+        gpus = []
+        if drm_dir.exists():
+            for card in sorted(drm_dir.glob('card[0-9]*')):
+                if '-' in card.name:
+                    continue  # card0-HDMI-A-1 等为显示接口
+                uevent = self._read(card / 'device' / 'uevent') or ''
+                fields = dict(line.split('=', 1) for line in uevent.splitlines() if '=' in line)
+                label = ' '.join(v for v in (fields.get('DRIVER'), fields.get('PCI_ID')) if v)
+                if label:
+                    gpus.append(label)
+        return ', '.join(gpus) or None
+
+    def query_bios(self):
+        return self._dmi('bios_vendor', 'bios_version')
+
+    def query_board(self):
+        return self._dmi('board_vendor', 'board_name')
+
+
+# 已注册的后端，按顺序探测第一个可用的
+_backend_factories = {
+    WmiBackend.name: WmiBackend,
+    SysfsBackend.name: SysfsBackend,
+}
+
+
+def register_backend(name, factory):
+    """注册自定义后端（如 CIM/PowerShell 实现）"""
+    _backend_factories[name] = factory
+
+
+class HardwareInfoProvider:
+    """硬件信息提供者，每个字段只查询一次并缓存"""
+
+    def __init__(self, backend):
+        self.backend = backend
+        self._cache = {}
+        self._lock = threading.Lock()
+
+    def get(self, field):
+        """获取字段值，查询失败返回 None"""
+        with self._lock:
+            if field in self._cache:
+                return self._cache[field]
+        try:
+            value = self.backend.query(field)
+        except KeyError:
+            raise
+        except Exception as e:
+            print(f"⚠️  查询硬件信息失败 {field}: {e}")
+            value = None
+        with self._lock:
+            self._cache[field] = value
+        return value
+
+    def get_all(self):
+        return {field: self.get(field) for field in HARDWARE_FIELDS}
+
+    def invalidate(self):
+        with self._lock:
+            self._cache.clear()
+
+
+class _NullBackend(HardwareBackend):
+    name = 'null'
+
+    def query(self, field):
+        if field not in HARDWARE_FIELDS:
+            raise KeyError(f"不支持的硬件字段: {field}")
+        return None
+
+
+_provider = None
+_provider_lock = threading.Lock()
+
+
+def get_hardware_provider(backend=None):
+    """获取全局硬件信息提供者，首次调用时探测可用后端"""
+    global _provider
+    with _provider_lock:
+        if backend is not None:
+            if _provider is not None:
+                _provider.backend.close()
+            _provider = HardwareInfoProvider(_backend_factories[backend]())
+        elif _provider is None:
+            chosen = _NullBackend()
+            for factory in _backend_factories.values():
+                candidate = factory()
+                if candidate.is_available():
+                    chosen = candidate
+                    break
+            _provider = HardwareInfoProvider(chosen)
+        return _provider
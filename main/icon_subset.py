@@ -0,0 +1,260 @@
+# icon_subset.py - Font Awesome 本地子集：只打包界面与工具清单实际用到的图标
+#
+# 生成: python icon_subset.py（打包前运行，结果写入随程序发布的 assets/fontawesome）
+# 生成需要 fonttools、brotli 与 fontawesomefree（pip install fonttools brotli fontawesomefree==6.4.0），
+# 运行时读取生成好的子集，不依赖这些包。工具清单用到子集之外的图标且装有这些包时，
+# 在用户缓存目录（config.cache_dir）中重新生成，程序目录保持只读。
+import base64
+import json
+import re
+import sys
+import threading
+from pathlib import Path
+
+from config import config
+
+# 随程序发布的子集，与运行时重新生成的子集
+SHIPPED_DIR = config.assets_dir / "fontawesome"
+CACHE_DIR = config.cache_dir / "fontawesome"
+ICONS_CSS = "icons.css"
+ICONS_STAMP = "icons.json"
+
+# 扫描图标类名的界面源文件
+UI_SOURCES = [
+    config.base_dir / "ui" / "index.html",
+    config.base_dir / "ui" / "app.js",
+    config.base_dir / "ui" / "tool_grid.js",
+    config.base_dir / "config.py",
+    config.base_dir / "utils.py",
+]
+
+# 样式前缀 -> 字体
+STYLE_ALIASES = {
+    'fa': 'solid', 'fas': 'solid', 'fa-solid': 'solid',
+    'far': 'regular', 'fa-regular': 'regular',
+    'fab': 'brands', 'fa-brands': 'brands',
+}
+FONTS = {
+    'solid': ('Font Awesome 6 Free', 900, 'fa-solid-900'),
+    'regular': ('Font Awesome 6 Free', 400, 'fa-regular-400'),
+    'brands': ('Font Awesome 6 Brands', 400, 'fa-brands-400'),
+}
+ICON_PATTERN = re.compile(r'\b(fa-solid|fa-regular|fa-brands|fas|far|fab|fa)\s+fa-([a-z0-9]+(?:-[a-z0-9]+)*)\b')
+
+_current = None
+_stamp = None
+_rebuild_lock = threading.Lock()
+# 后台重新生成的状态：等待生成的图标、生成线程，以及本进程内是否已失败（失败后不再重试）
+_state_lock = threading.Lock()
+_pending = set()
+_worker = None
+_failed = False
+
+
+def icon_classes_in(text):
+    """从文本中找出图标类名，返回 {'solid tools', 'brands github', ...}"""
+    return {f"{STYLE_ALIASES[style]} {name}" for style, name in ICON_PATTERN.findall(text or '')}
+
+
+def ui_icon_classes():
+    """界面源文件中直接写出的图标"""
+    classes = set()
+    for path in UI_SOURCES:
+        try:
+            classes |= icon_classes_in(path.read_text(encoding='utf-8'))
+        except OSError:
+            continue
+    return classes
+
+
+def _read_stamp(directory):
+    """目录中子集已处理过的图标，没有子集时返回 None"""
+    try:
+        with open(directory / ICONS_STAMP, 'r', encoding='utf-8') as f:
+            stamp = json.load(f)
+        return set(stamp['icons']) | set(stamp.get('unavailable', []))
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+def current_dir():
+    """当前使用的子集目录：缓存中的子集包含发布的全部图标时用缓存，否则用发布的子集
+
+    程序升级后发布的子集可能多出新图标，此时旧缓存不再使用。
+    """
+    global _current
+    if _current is None:
+        cached = _read_stamp(CACHE_DIR)
+        shipped = _read_stamp(SHIPPED_DIR) or set()
+        use_cache = cached is not None and shipped <= cached and (CACHE_DIR / ICONS_CSS).is_file()
+        _current = CACHE_DIR if use_cache else SHIPPED_DIR
+    return _current
+
+
+def built_icons():
+    """生成子集时已处理过的图标（包括 Font Awesome Free 中不存在的）"""
+    global _stamp
+    if _stamp is None:
+        _stamp = _read_stamp(current_dir()) or set()
+    return _stamp
+
+
+def inline_css():
+    """子集 CSS，字体以 data URI 内嵌，可直接放进页面的 <style> 中"""
+    directory = current_dir()
+    try:
+        css = (directory / ICONS_CSS).read_text(encoding='utf-8')
+    except OSError:
+        print("⚠️  未找到本地图标字体，请运行 python icon_subset.py 生成")
+        return ''
+
+    def embed(match):
+        data = base64.b64encode((directory / match.group(1)).read_bytes()).decode('ascii')
+        return f'url("data:font/woff2;base64,{data}")'
+    return re.sub(r'url\("([^"]+\.woff2)"\)', embed, css)
+
+
+def ensure_icons(tools, on_rebuilt=None):
+    """工具清单引用了子集中没有的图标时，在后台重新生成子集（写入用户缓存目录）
+
+    on_rebuilt(css) 在生成完成后调用，参数为新的内嵌 CSS。
+    生成进行中再次调用只会追加图标，不另起线程；本进程内生成失败过（如缺少依赖）则不再尝试。
+    """
+    global _worker
+    wanted = set()
+    for tool in tools:
+        wanted |= icon_classes_in(tool.get('icon'))
+    missing = wanted - built_icons()
+    with _state_lock:
+        if _failed:
+            return False
+        missing -= _pending
+        if not missing:
+            return False
+        _pending.update(missing)
+        if _worker is None:
+            _worker = threading.Thread(target=_rebuild_pending, args=(on_rebuilt,),
+                                       name="icon-subset", daemon=True)
+            _worker.start()
+    return True
+
+
+def _rebuild_pending(on_rebuilt):
+    """后台线程：把等待中的图标并入子集，直到没有新的图标"""
+    global _worker, _failed
+    while True:
+        with _state_lock:
+            classes = set(_pending)
+            if not classes:
+                _worker = None
+                return
+        try:
+            build(built_icons() | classes, CACHE_DIR)
+        except Exception as e:
+            if isinstance(e, ImportError):
+                print(f"⚠️  工具使用了新的图标，但无法重新生成图标子集（缺少 {e.name}）")
+            else:
+                print(f"⚠️  重新生成图标子集失败: {e}")
+            with _state_lock:
+                _failed = True
+                _pending.clear()
+                _worker = None
+            return
+        with _state_lock:
+            _pending.difference_update(classes)
+        if on_rebuilt is not None:
+            on_rebuilt(inline_css())
+
+
+def _icon_metadata(source_dir):
+    """类名（含别名） -> (unicode, 免费样式列表)"""
+    with open(source_dir / "metadata" / "icons.json", 'r', encoding='utf-8') as f:
+        icons = json.load(f)
+    metadata = {}
+    for name, icon in icons.items():
+        entry = (icon['unicode'], icon.get('free', []))
+        metadata[name] = entry
+        for alias in icon.get('aliases', {}).get('names', []):
+            metadata.setdefault(alias, entry)
+    return metadata
+
+
+def build(classes=None, target=SHIPPED_DIR):
+    """在 target 目录生成子集字体与 CSS，classes 为空时扫描界面与工具目录"""
+    from fontTools import subset
+    import fontawesomefree
+
+    source_dir = Path(fontawesomefree.__file__).parent / "static" / "fontawesomefree"
+    if classes is None:
+        from utils import scan_tools
+        classes = ui_icon_classes()
+        for tool in scan_tools(config.tools_dir):
+            classes |= icon_classes_in(tool.get('icon'))
+
+    with _rebuild_lock:
+        metadata = _icon_metadata(source_dir)
+        codepoints = {style: set() for style in FONTS}
+        rules = {}
+        kept = set()
+        for icon in sorted(classes):
+            style, name = icon.split(' ', 1)
+            unicode, free_styles = metadata.get(name, (None, []))
+            if unicode is None or style not in free_styles:
+                print(f"⚠️  Font Awesome Free 中没有图标: {icon}")
+                continue
+            codepoints[style].add(int(unicode, 16))
+            rules[name] = unicode
+            kept.add(icon)
+
+        target.mkdir(parents=True, exist_ok=True)
+        font_faces = []
+        for style, (family, weight, filename) in FONTS.items():
+            if not codepoints[style]:
+                continue
+            options = subset.Options()
+            options.flavor = 'woff2'
+            options.layout_features = []
+            options.hinting = False
+            font = subset.load_font(str(source_dir / "webfonts" / f"{filename}.ttf"), options)
+            subsetter = subset.Subsetter(options)
+            subsetter.populate(unicodes=codepoints[style])
+            subsetter.subset(font)
+            subset.save_font(font, str(target / f"{filename}.woff2"), options)
+            font_faces.append(
+                f"@font-face {{ font-family: '{family}'; font-style: normal; font-weight: {weight}; "
+                f"font-display: block; src: url(\"{filename}.woff2\") format(\"woff2\"); }}"
+            )
+
+        css = [
+            "/* 由 icon_subset.py 生成，请勿手动修改。Font Awesome Free 6.4.0 子集",
+            " * License - https://fontawesome.com/license/free (Icons: CC BY 4.0, Fonts: SIL OFL 1.1, Code: MIT License) */",
+            *font_faces,
+            ".fa, .fas, .far, .fab, .fa-solid, .fa-regular, .fa-brands { display: inline-block; font-style: normal; "
+            "font-variant: normal; line-height: 1; text-rendering: auto; -webkit-font-smoothing: antialiased; }",
+            ".fa, .fas, .fa-solid { font-family: 'Font Awesome 6 Free'; font-weight: 900; }",
+            ".far, .fa-regular { font-family: 'Font Awesome 6 Free'; font-weight: 400; }",
+            ".fab, .fa-brands { font-family: 'Font Awesome 6 Brands'; font-weight: 400; }",
+        ]
+        css += [f'.fa-{name}::before {{ content: "\\{unicode}"; }}' for name, unicode in sorted(rules.items())]
+        tmp_path = target / (ICONS_CSS + '.tmp')
+        tmp_path.write_text('\n'.join(css) + '\n', encoding='utf-8')
+        tmp_path.replace(target / ICONS_CSS)
+        with open(target / ICONS_STAMP, 'w', encoding='utf-8') as f:
+            json.dump({'icons': sorted(kept), 'unavailable': sorted(set(classes) - kept)},
+                      f, ensure_ascii=False, indent=2)
+
+        # 下次读取时重新选择使用的目录
+        global _current, _stamp
+        _current = None
+        _stamp = None
+    return kept
+
+
+if __name__ == '__main__':
+    try:
+        icons = build()
+    except ImportError as e:
+        print(f"❌ 缺少依赖: {e.name}")
+        print("💡 请安装: pip install fonttools brotli fontawesomefree==6.4.0")
+        sys.exit(1)
+    print(f"✅ 已生成 {len(icons)} 个图标的子集: {SHIPPED_DIR}")
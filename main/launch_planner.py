@@ -0,0 +1,218 @@
+# launch_planner.py - 启动计划缓存、收藏工具预热与启动延迟统计
+import subprocess
+import sys
+import threading
+from collections import deque
+
+from tool_launcher import LaunchError, make_plan, popen_options
+
+# 预热进程：解释器先启动并停在读取 stdin 处，收到 [脚本, 参数...] 后在本进程中运行脚本
+HELPER_SOURCE = (
+    "import json, os, runpy, sys\n"
+    "line = sys.stdin.readline()\n"
+    "if not line:\n"
+    "    sys.exit(0)\n"
+    "sys.argv = json.loads(line)\n"
+    "sys.stdin = open(os.devnull)\n"
+    "sys.path[0] = os.path.dirname(os.path.abspath(sys.argv[0]))\n"
+    "runpy.run_path(sys.argv[0], run_name='__main__')\n"
+)
+
+# 预热进程被取走后，延迟一段时间再补充，避免与刚启动的工具争抢 CPU（秒）
+REFILL_DELAY = 1.0
+
+# 每个工具保留的启动延迟样本数
+LATENCY_SAMPLES = 20
+
+
+class LaunchPlanner:
+    """为注册表中的工具缓存启动计划，并为收藏的工具保持空闲的预热进程
+
+    计划在注册表加载后一次性生成，之后启动工具不再查找路径或检查权限；
+    工具数据被注册表替换（清单修改）后，对应的计划自动失效。
+    """
+
+    def __init__(self, registry=None, warm=False, max_warm=2):
+        self.registry = registry
+        self.warm = bool(warm)
+        self.max_warm = max(0, int(max_warm))
+        self._plans = {}        # 工具 id -> LaunchPlan
+        self._helpers = {}      # 工具 id -> 空闲的预热进程
+        self._warm_ids = []     # 需要保持预热的工具 id
+        self._latency = {}      # 工具 id -> deque[(秒, 是否预热)]
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def prepare(self, background=True):
+        """为注册表中的全部工具生成启动计划"""
+        if self.registry is None:
+            return
+        if background:
+            threading.Thread(target=self.prepare, args=(False,), name="launch-planner", daemon=True).start()
+            return
+        for tool, manifest_path in self.registry.tool_paths():
+            try:
+                self.plan(tool, manifest_path)
+            except LaunchError:
+                # 找不到程序的工具不缓存，启动时再报告
+                pass
+            except Exception as e:
+                print(f"⚠️  生成启动计划失败 {tool.get('id')}: {e}")
+
+    def plan(self, tool, manifest_path=None):
+        """返回工具的启动计划（缓存命中时不访问磁盘）"""
+        tool_id = tool.get('id')
+        with self._lock:
+            plan = self._plans.get(tool_id)
+        if plan is not None and plan.source is tool:
+            return plan
+        plan = make_plan(tool, manifest_path)
+        with self._lock:
+            self._plans[tool_id] = plan
+            # 工具已更新，旧的预热进程可能指向旧程序
+            old = self._helpers.pop(tool_id, None)
+        if old is not None:
+            self._discard(old)
+            self._refill_async(tool_id)
+        return plan
+
+    def invalidate(self, tool_id=None):
+        """丢弃计划（及对应的预热进程），tool_id 为空表示全部"""
+        with self._lock:
+            if tool_id is None:
+                self._plans.clear()
+                helpers = list(self._helpers.values())
+                self._helpers.clear()
+            else:
+                self._plans.pop(tool_id, None)
+                helpers = [self._helpers.pop(tool_id)] if tool_id in self._helpers else []
+        for helper in helpers:
+            self._discard(helper)
+
+    def set_warm_tools(self, tool_ids):
+        """设置需要预热的工具（通常为收藏的工具），超出上限的忽略"""
+        tool_ids = list(tool_ids)[:self.max_warm] if self.warm else []
+        with self._lock:
+            self._warm_ids = tool_ids
+            obsolete = [tool_id for tool_id in self._helpers if tool_id not in tool_ids]
+            helpers = [self._helpers.pop(tool_id) for tool_id in obsolete]
+        for helper in helpers:
+            self._discard(helper)
+        for tool_id in tool_ids:
+            self._refill_async(tool_id)
+
+    def take_helper(self, plan):
+        """取走工具的预热进程（没有时返回 None），并在后台补充一个新的"""
+        with self._lock:
+            helper = self._helpers.get(plan.tool_id)
+            if helper is None or helper.plan is not plan:
+                return None
+            del self._helpers[plan.tool_id]
+        self._refill_async(plan.tool_id, delay=REFILL_DELAY)
+        if helper.poll() is not None:
+            return None
+        return helper
+
+    def _refill_async(self, tool_id, delay=0.0):
+        timer = threading.Timer(delay, self._refill, args=(tool_id,))
+        timer.name = "launch-warm"
+        timer.daemon = True
+        timer.start()
+
+    def _refill(self, tool_id):
+        with self._lock:
+            plan = self._plans.get(tool_id)
+            needed = (not self._closed and tool_id in self._warm_ids
+                      and tool_id not in self._helpers)
+        if not needed:
+            return
+        if plan is None and self.registry is not None:
+            tool = self.registry.get(tool_id)
+            if tool is None:
+                return
+            try:
+                plan = self.plan(tool, self.registry.manifest_path(tool_id))
+            except LaunchError:
+                return
+        self._replace_helper(tool_id, plan)
+
+    def _replace_helper(self, tool_id, plan):
+        if plan is None or not plan.is_python or not plan.capture or plan.elevate:
+            # 只有 Python 脚本工具可以预热；其它程序无法在启动前得知其命令行之外的任何状态
+            return
+        try:
+            helper = subprocess.Popen(
+                [sys.executable, '-c', HELPER_SOURCE],
+                cwd=plan.cwd,
+                env=plan.env,
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                **popen_options(True)
+            )
+        except OSError as e:
+            print(f"⚠️  启动预热进程失败 {tool_id}: {e}")
+            return
+        helper.plan = plan
+        with self._lock:
+            old = self._helpers.get(tool_id)
+            keep = not self._closed and tool_id in self._warm_ids and self._plans.get(tool_id) is plan
+            if keep:
+                self._helpers[tool_id] = helper
+        if keep and old is not None:
+            self._discard(old)
+        elif not keep:
+            self._discard(helper)
+
+    @staticmethod
+    def _discard(helper):
+        """关闭 stdin 让预热进程自行退出，在后台回收"""
+        def reap():
+            try:
+                helper.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                helper.kill()
+                helper.wait()
+            helper.stdout.close()
+            helper.stderr.close()
+
+        try:
+            helper.stdin.close()
+        except OSError:
+            pass
+        threading.Thread(target=reap, name="launch-warm-reap", daemon=True).start()
+
+    def record_latency(self, tool_id, seconds, warm):
+        """记录一次从请求启动到第一段输出的延迟"""
+        with self._lock:
+            samples = self._latency.setdefault(tool_id, deque(maxlen=LATENCY_SAMPLES))
+            samples.append((seconds, bool(warm)))
+
+    def latency_stats(self):
+        """各工具的启动延迟统计（毫秒）：{tool_id: {'launches', 'last_ms', 'cold_ms', 'warm_ms'}}"""
+        def median(values):
+            if not values:
+                return None
+            values = sorted(values)
+            return round(values[len(values) // 2] * 1000, 1)
+
+        with self._lock:
+            snapshot = {tool_id: list(samples) for tool_id, samples in self._latency.items()}
+        return {
+            tool_id: {
+                'launches': len(samples),
+                'last_ms': round(samples[-1][0] * 1000, 1),
+                'cold_ms': median([s for s, warm in samples if not warm]),
+                'warm_ms': median([s for s, warm in samples if warm]),
+            }
+            for tool_id, samples in snapshot.items()
+        }
+
+    def close(self):
+        """退出时结束全部预热进程"""
+        with self._lock:
+            self._closed = True
+            helpers = list(self._helpers.values())
+            self._helpers.clear()
+        for helper in helpers:
+            self._discard(helper)
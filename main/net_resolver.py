@@ -0,0 +1,142 @@
+# net_resolver.py - 带超时和缓存的主机名/IP解析
+import ipaddress
+import socket
+import threading
+import time
+
+import psutil
+
+from config import config
+
+
+def primary_ip_from_interfaces():
+    """不经过DNS，从网卡地址中推断主IPv4地址"""
+    try:
+        stats = psutil.net_if_stats()
+        addrs = psutil.net_if_addrs()
+    except Exception:
+        return None
+
+    candidates = []
+    for name, entries in addrs.items():
+        if name in stats and not stats[name].isup:
+            continue
+        for addr in entries:
+            if addr.family != socket.AF_INET:
+                continue
+            try:
+                ip = ipaddress.ip_address(addr.address)
+            except ValueError:
+                continue
+            if ip.is_loopback or ip.is_link_local or ip.is_unspecified:
+                continue
+            # 私有地址优先于其它地址（如VPN隧道分配的公网段）
+            candidates.append((0 if ip.is_private else 1, name, str(ip)))
+    if not candidates:
+        return None
+    return min(candidates)[2]
+
+
+class HostResolver:
+    """后台解析主机名对应的IP，请求方最多等待 timeout 秒"""
+
+    def __init__(self, timeout=1.0, ttl=300.0, negative_ttl=30.0):
+        self.timeout = float(timeout)
+        self.ttl = float(ttl)
+        self.negative_ttl = float(negative_ttl)
+        self._cache = {}     # hostname -> (时间戳, ip)
+        self._failures = {}  # hostname -> 最近一次解析失败或超时的时间戳
+        self._pending = {}   # hostname -> threading.Event
+        self._lock = threading.Lock()
+
+    def _lookup(self, hostname, done):
+        try:
+            ip = socket.gethostbyname(hostname)
+        except Exception:
+            ip = None
+        with self._lock:
+            if ip is not None:
+                self._cache[hostname] = (time.monotonic(), ip)
+                self._failures.pop(hostname, None)
+            else:
+                self._failures[hostname] = time.monotonic()
+            self._pending.pop(hostname, None)
+        done.set()
+
+    def _start_lookup(self, hostname):
+        # 同一主机名同一时间只有一个解析线程，慢DNS不会堆积线程
+        with self._lock:
+            done = self._pending.get(hostname)
+            if done is None:
+                done = threading.Event()
+                self._pending[hostname] = done
+                threading.Thread(target=self._lookup, args=(hostname, done),
+                                 name="dns-resolver", daemon=True).start()
+        return done
+
+    def _cached(self, hostname, allow_stale=False):
+        with self._lock:
+            entry = self._cache.get(hostname)
+        if entry is None:
+            return None
+        stamp, ip = entry
+        if allow_stale or time.monotonic() - stamp < self.ttl:
+            return ip
+        return None
+
+    def _recently_failed(self, hostname):
+        """失败或超时后的 negative_ttl 秒内不再等待 DNS"""
+        with self._lock:
+            stamp = self._failures.get(hostname)
+        return stamp is not None and time.monotonic() - stamp < self.negative_ttl
+
+    @staticmethod
+    def _prefer_interface(ip):
+        """没有结果或结果为回环地址时改用网卡地址"""
+        if ip is None or ip.startswith('127.'):
+            # 许多系统把主机名解析到回环地址，此时网卡地址更有意义
+            ip = primary_ip_from_interfaces() or ip
+        return ip
+
+    def _fallback(self, hostname):
+        """旧缓存或网卡地址"""
+        return self._prefer_interface(self._cached(hostname, allow_stale=True))
+
+    def prefetch(self, hostname=None):
+        """预先在后台解析，不等待结果"""
+        hostname = hostname or socket.gethostname()
+        if self._cached(hostname) is None and not self._recently_failed(hostname):
+            self._start_lookup(hostname)
+
+    def resolve(self, hostname=None, timeout=None):
+        """返回IP地址；超时或失败时依次退回旧缓存、网卡地址"""
+        hostname = hostname or socket.gethostname()
+        ip = self._cached(hostname)
+        if ip is not None:
+            return self._prefer_interface(ip)
+        if self._recently_failed(hostname):
+            return self._fallback(hostname)
+
+        done = self._start_lookup(hostname)
+        if not done.wait(self.timeout if timeout is None else timeout):
+            # 超时也记为失败；后台线程若之后解析成功会清除该记录
+            with self._lock:
+                self._failures[hostname] = time.monotonic()
+        return self._fallback(hostname)
+
+
+_resolver = None
+_resolver_lock = threading.Lock()
+
+
+def get_host_resolver():
+    """获取全局主机名解析器"""
+    global _resolver
+    with _resolver_lock:
+        if _resolver is None:
+            _resolver = HostResolver(
+                timeout=config.settings.get('dns_timeout', 1.0),
+                ttl=config.settings.get('dns_cache_ttl', 300.0),
+                negative_ttl=config.settings.get('dns_negative_ttl', 30.0),
+            )
+        return _resolver
@@ -0,0 +1,299 @@
+# process_table.py - 进程表：单次遍历采样、增量 CPU、排序筛选分页与行差异、进程树、结束/挂起
+import os
+import threading
+import time
+from collections import OrderedDict
+
+import psutil
+
+# 每次采样通过 process_iter 读取的字段（变化的字段）
+SAMPLE_ATTRS = ['ppid', 'name', 'status', 'cpu_times', 'memory_info', 'num_threads', 'create_time']
+# 可排序的列；名称类按小写排序
+SORT_FIELDS = ('pid', 'name', 'user', 'status', 'cpu', 'memory', 'threads', 'create_time')
+TEXT_FIELDS = ('name', 'user', 'status')
+# 行的字段（页面按此顺序解析 rows 中的数组）
+ROW_FIELDS = ('pid', 'ppid', 'name', 'user', 'status', 'cpu', 'memory', 'threads', 'create_time', 'exe', 'cmdline')
+
+
+class ProcessError(Exception):
+    """进程操作失败"""
+
+
+class _Static:
+    """进程生命周期内不变的字段，按 (pid, create_time) 缓存"""
+    __slots__ = ('exe', 'cmdline', 'user', 'haystack')
+
+    def __init__(self, proc, name, pid):
+        exe = cmdline = user = ''
+        try:
+            with proc.oneshot():
+                try:
+                    exe = proc.exe() or ''
+                except (psutil.AccessDenied, psutil.ZombieProcess, OSError):
+                    pass
+                try:
+                    cmdline = ' '.join(proc.cmdline())
+                except (psutil.AccessDenied, psutil.ZombieProcess, OSError):
+                    pass
+                try:
+                    user = proc.username() or ''
+                except (psutil.AccessDenied, KeyError, OSError):
+                    pass
+        except psutil.NoSuchProcess:
+            pass
+        self.exe = exe
+        self.cmdline = cmdline
+        self.user = user
+        # 筛选时匹配的文本（小写），只计算一次
+        self.haystack = f'{pid}\n{name}\n{exe}\n{cmdline}\n{user}'.lower()
+
+
+class ProcessTable:
+    """进程表引擎
+
+    每次采样只调用一次 process_iter(attrs=...)；exe、cmdline、用户名等不变的字段
+    按 (pid, create_time) 缓存，PID 被复用时自动失效。CPU 使用率由两次采样间
+    cpu_times 的差值计算，并按核心数归一化为整机的百分比（与任务管理器一致）。
+
+    query() 返回排序、筛选、分页后的一页；传入上一页的 token 时只返回变化的行
+    与离开该页的 pid，页面按 order 重排即可。
+    """
+
+    def __init__(self, min_interval=1.0, max_views=8):
+        self.min_interval = max(0.0, float(min_interval))
+        self.max_views = max(1, int(max_views))
+        self._cores = psutil.cpu_count() or 1
+        self._static = {}      # (pid, create_time) -> _Static
+        self._cpu = {}         # (pid, create_time) -> 上次采样的 CPU 秒数
+        self._rows = {}        # pid -> 行（元组，字段见 ROW_FIELDS）
+        self._haystacks = {}   # pid -> 筛选用的小写文本
+        self._children = {}    # ppid -> [pid]
+        self._sampled_at = None
+        self._generation = 0
+        self._views = OrderedDict()   # token -> {pid: 行}，最近使用的页面快照
+        self._next_token = 0
+        self._lock = threading.Lock()
+
+    def sample(self, force=False):
+        """采样一次；距上次采样不足 min_interval 秒时沿用上次结果"""
+        with self._lock:
+            now = time.monotonic()
+            if not force and self._sampled_at is not None and now - self._sampled_at < self.min_interval:
+                return False
+            elapsed = now - self._sampled_at if self._sampled_at is not None else None
+            scale = 100.0 / (elapsed * self._cores) if elapsed else 0.0
+            static_cache = self._static
+            previous_cpu = self._cpu
+            statics = {}
+            cpu_totals = {}
+            rows = {}
+            haystacks = {}
+            children = {}
+            for proc in psutil.process_iter(SAMPLE_ATTRS):
+                info = proc.info
+                pid = proc.pid
+                key = (pid, info['create_time'])
+                name = info['name'] or ''
+                static = static_cache.get(key)
+                if static is None:
+                    static = _Static(proc, name, pid)
+                statics[key] = static
+                cpu_times = info['cpu_times']
+                cpu_total = cpu_times.user + cpu_times.system if cpu_times is not None else None
+                cpu = 0.0
+                if cpu_total is not None:
+                    cpu_totals[key] = cpu_total
+                    last = previous_cpu.get(key)
+                    if last is not None:
+                        cpu = round(max(0.0, cpu_total - last) * scale, 1)
+                memory = info['memory_info']
+                ppid = info['ppid']
+                rows[pid] = (pid, ppid, name, static.user, info['status'] or '', cpu,
+                             memory.rss if memory is not None else 0, info['num_threads'] or 0,
+                             info['create_time'], static.exe, static.cmdline)
+                haystacks[pid] = static.haystack
+                if ppid is not None and ppid != pid:
+                    children.setdefault(ppid, []).append(pid)
+            # 只保留仍存在的进程，已退出进程的缓存随之释放
+            self._static = statics
+            self._cpu = cpu_totals
+            self._rows = rows
+            self._haystacks = haystacks
+            self._children = children
+            self._sampled_at = now
+            self._generation += 1
+            return True
+
+    def query(self, sort='cpu', descending=True, filter_text='', offset=0, limit=100, tree=False, token=None):
+        """返回一页进程
+
+        {'token', 'generation', 'total', 'offset', 'order': [本页 pid], 'rows': [变化的行],
+         'removed': [离开本页的 pid], 'full': 是否为完整的一页}；
+        token 为上一次返回的 token，已失效时返回完整的一页。tree 为真时按进程树排列，
+        行末附加层级深度，筛选时保留匹配进程的祖先。
+        """
+        if sort not in SORT_FIELDS:
+            raise ProcessError(f'不支持按 {sort} 排序')
+        self.sample()
+        offset = max(0, int(offset))
+        limit = max(1, int(limit))
+        with self._lock:
+            rows = self._rows
+            index = ROW_FIELDS.index(sort)
+            if sort in TEXT_FIELDS:
+                key = lambda pid: rows[pid][index].lower()
+            else:
+                key = lambda pid: rows[pid][index]
+            matched = self._filter(filter_text)
+            if tree:
+                ordered, depths = self._tree_order(matched, key, descending)
+            else:
+                # 先按 pid 排序，使得分相同的进程顺序稳定
+                ordered = sorted(matched)
+                ordered.sort(key=key, reverse=descending)
+                depths = None
+            page = ordered[offset:offset + limit]
+            if depths is None:
+                page_rows = {pid: rows[pid] for pid in page}
+            else:
+                page_rows = {pid: rows[pid] + (depths[pid],) for pid in page}
+            previous = self._views.pop(token, None) if token is not None else None
+            self._next_token += 1
+            new_token = self._next_token
+            self._views[new_token] = page_rows
+            while len(self._views) > self.max_views:
+                self._views.popitem(last=False)
+            generation = self._generation
+
+        if previous is None:
+            changed = list(page_rows.values())
+            removed = []
+        else:
+            changed = [row for pid, row in page_rows.items() if previous.get(pid) != row]
+            removed = [pid for pid in previous if pid not in page_rows]
+        return {
+            'fields': ROW_FIELDS + ('depth',) if tree else ROW_FIELDS,
+            'token': new_token,
+            'generation': generation,
+            'total': len(ordered),
+            'offset': offset,
+            'order': page,
+            'rows': changed,
+            'removed': removed,
+            'full': previous is None,
+        }
+
+    def _filter(self, filter_text):
+        """匹配筛选文本（pid、名称、路径、命令行、用户，空格分隔的各词都须命中）的 pid，调用方需持有锁"""
+        terms = (filter_text or '').lower().split()
+        if not terms:
+            return list(self._rows)
+        haystacks = self._haystacks
+        return [pid for pid, text in haystacks.items() if all(term in text for term in terms)]
+
+    def _tree_order(self, matched, key, descending):
+        """按进程树深度优先排列，兄弟进程按 key 排序；返回 (pid 列表, {pid: 深度})，调用方需持有锁"""
+        rows = self._rows
+        visible = set(matched)
+        if len(visible) < len(rows):
+            # 保留匹配进程的祖先，树结构才完整
+            for pid in matched:
+                parent = rows[pid][1]
+                while parent in rows and parent not in visible:
+                    visible.add(parent)
+                    parent = rows[parent][1]
+        children = self._children
+        roots = [pid for pid in visible if rows[pid][1] not in visible or rows[pid][1] == pid]
+
+        def arrange(pids):
+            pids = sorted(pids)
+            pids.sort(key=key, reverse=descending)
+            return pids
+
+        ordered = []
+        depths = {}
+        while True:
+            stack = [(pid, 0) for pid in reversed(arrange(roots))]
+            while stack:
+                pid, depth = stack.pop()
+                if pid in depths:
+                    continue
+                depths[pid] = depth
+                ordered.append(pid)
+                kids = [child for child in children.get(pid, ()) if child in visible and child not in depths]
+                stack.extend((child, depth + 1) for child in reversed(arrange(kids)))
+            if len(depths) == len(visible):
+                return ordered, depths
+            # 父子关系成环（采样期间 PID 被复用）时没有根，剩余进程作为根排在最后
+            roots = [pid for pid in visible if pid not in depths]
+
+    def _process(self, pid, create_time):
+        """按 pid 与创建时间取得进程，防止 PID 被复用后误操作其它进程"""
+        pid = int(pid)
+        if pid == os.getpid():
+            raise ProcessError('不能操作工具箱自身')
+        try:
+            proc = psutil.Process(pid)
+            if create_time is not None and abs(proc.create_time() - float(create_time)) > 0.01:
+                raise ProcessError('进程已结束')
+        except psutil.NoSuchProcess:
+            raise ProcessError('进程已结束')
+        return proc
+
+    def kill(self, pid, create_time=None, tree=False, timeout=3.0):
+        """结束进程（tree 为真时连同子进程），返回已请求结束的进程数
+
+        立即发送终止请求后返回，不等待进程退出；超时未退出的由后台线程强制结束。
+        """
+        proc = self._process(pid, create_time)
+        try:
+            procs = (proc.children(recursive=True) if tree else []) + [proc]
+        except psutil.NoSuchProcess:
+            raise ProcessError('进程已结束')
+        except psutil.AccessDenied:
+            raise ProcessError('权限不足，无法读取子进程')
+        if any(p.pid == os.getpid() for p in procs):
+            raise ProcessError('不能结束工具箱自身')
+        signalled = []
+        for p in procs:
+            try:
+                p.terminate()
+                signalled.append(p)
+            except psutil.NoSuchProcess:
+                signalled.append(p)
+            except psutil.AccessDenied:
+                pass
+        if not signalled:
+            raise ProcessError('权限不足，请以管理员身份运行')
+        threading.Thread(target=self._reap, args=(signalled, timeout),
+                         name="process-reaper", daemon=True).start()
+        return len(signalled)
+
+    def _reap(self, procs, timeout):
+        """等待进程退出，超时后强制结束，然后刷新进程表"""
+        _, alive = psutil.wait_procs(procs, timeout=timeout)
+        for p in alive:
+            try:
+                p.kill()
+            except psutil.Error:
+                pass
+        try:
+            self.sample(force=True)
+        except Exception as e:
+            print(f"⚠️  刷新进程列表失败: {e}")
+
+    def suspend(self, pid, create_time=None):
+        self._signal(pid, create_time, 'suspend')
+
+    def resume(self, pid, create_time=None):
+        self._signal(pid, create_time, 'resume')
+
+    def _signal(self, pid, create_time, action):
+        proc = self._process(pid, create_time)
+        try:
+            getattr(proc, action)()
+        except psutil.NoSuchProcess:
+            raise ProcessError('进程已结束')
+        except psutil.AccessDenied:
+            raise ProcessError('权限不足，请以管理员身份运行')
+        self.sample(force=True)
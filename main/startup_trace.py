@@ -0,0 +1,109 @@
+# startup_trace.py - 启动过程计时（Python 与页面两侧），可导出为 Chrome trace 格式
+import json
+import threading
+import time
+from contextlib import contextmanager
+
+# 计时起点：本模块应是 main.py 最先导入的模块
+_T0 = time.perf_counter()
+# 起点对应的墙上时间，用于换算页面侧（performance.timeOrigin）上报的时间
+_EPOCH0 = time.time()
+
+
+class StartupTracer:
+    """记录启动各阶段的单调时间戳，开销仅为一次 perf_counter 与列表追加"""
+
+    def __init__(self):
+        self._events = []  # (名称, 来源, 开始秒, 持续秒（瞬时事件为 None）, 线程名)
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def now():
+        """距计时起点的秒数"""
+        return time.perf_counter() - _T0
+
+    def add(self, name, start, duration=None, source='py'):
+        with self._lock:
+            self._events.append((name, source, start, duration, threading.current_thread().name))
+
+    def mark(self, name, source='py'):
+        """记录一个瞬时事件"""
+        self.add(name, self.now(), None, source)
+
+    @contextmanager
+    def span(self, name):
+        """记录一个阶段的开始与持续时间"""
+        start = self.now()
+        try:
+            yield
+        finally:
+            self.add(name, start, self.now() - start)
+
+    def add_js_events(self, events):
+        """接收页面上报的事件：[{'name': ..., 'time': 墙上时间毫秒}, ...]"""
+        for event in events or []:
+            try:
+                start = float(event['time']) / 1000 - _EPOCH0
+                self.add(str(event['name']), start, None, 'js')
+            except (KeyError, TypeError, ValueError):
+                continue
+
+    def timeline(self):
+        """按开始时间排序的事件列表（毫秒）"""
+        with self._lock:
+            events = sorted(self._events, key=lambda e: e[2])
+        return [
+            {
+                'name': name,
+                'source': source,
+                'start_ms': round(start * 1000, 2),
+                'duration_ms': round(duration * 1000, 2) if duration is not None else None,
+                'thread': thread,
+            }
+            for name, source, start, duration, thread in events
+        ]
+
+    def format_timeline(self):
+        """适合打印到控制台的时间线"""
+        lines = ["⏱️  启动时间线（自进程导入 startup_trace 起）:"]
+        for event in self.timeline():
+            duration = f"{event['duration_ms']:>9.1f}ms" if event['duration_ms'] is not None else ' ' * 11
+            lines.append(f"  {event['start_ms']:>9.1f}ms {duration}  [{event['source']}] {event['name']}")
+        return '\n'.join(lines)
+
+    def to_chrome_trace(self):
+        """转换为 Chrome trace-event 格式，可在 chrome://tracing 或 Perfetto 中打开"""
+        trace_events = []
+        threads = {}
+        for event in self.timeline():
+            thread = 'page' if event['source'] == 'js' else event['thread']
+            tid = threads.setdefault(thread, len(threads) + 1)
+            record = {
+                'name': event['name'],
+                'cat': event['source'],
+                'pid': 1,
+                'tid': tid,
+                'ts': int(event['start_ms'] * 1000),
+            }
+            if event['duration_ms'] is None:
+                record.update(ph='i', s='t')
+            else:
+                record.update(ph='X', dur=int(event['duration_ms'] * 1000))
+            trace_events.append(record)
+        for thread, tid in threads.items():
+            trace_events.append({'name': 'thread_name', 'ph': 'M', 'pid': 1, 'tid': tid,
+                                 'args': {'name': thread}})
+        return {'traceEvents': trace_events, 'displayTimeUnit': 'ms'}
+
+    def write_chrome_trace(self, path):
+        try:
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(self.to_chrome_trace(), f, ensure_ascii=False)
+            return True
+        except Exception as e:
+            print(f"⚠️  写入启动跟踪文件失败: {e}")
+            return False
+
+
+# 全局计时器
+tracer = StartupTracer()
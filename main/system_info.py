@@ -0,0 +1,261 @@
+# system_info.py - 分层缓存的系统信息采集器
+import platform
+import socket
+import threading
+import time
+from datetime import datetime
+
+import psutil
+
+from config import config
+from cpu_sampler import get_cpu_sampler
+from hardware_info import get_hardware_provider
+from net_resolver import get_host_resolver
+
+# 缓存层级
+TIER_STATIC = 'static'  # 会话内不变：系统、架构、核心数、CPU型号等硬件、Python、启动时间
+TIER_SLOW = 'slow'      # 缓慢变化：磁盘、网络接口，按TTL刷新
+TIER_LIVE = 'live'      # 实时：CPU使用率、内存、进程数、运行时间
+TIERS = (TIER_STATIC, TIER_SLOW, TIER_LIVE)
+
+
+class SystemInfoCollector:
+    """系统信息采集器，按静态/慢变/实时三层分别缓存"""
+
+    def __init__(self, slow_ttl=30.0, live_ttl=1.0):
+        self.ttls = {
+            TIER_STATIC: None,  # 永不过期，只能显式失效
+            TIER_SLOW: float(slow_ttl),
+            TIER_LIVE: float(live_ttl),
+        }
+        self._collectors = {
+            TIER_STATIC: self._collect_static,
+            TIER_SLOW: self._collect_slow,
+            TIER_LIVE: self._collect_live,
+        }
+        self._cache = {}
+        # 每层一把锁，慢层刷新不会阻塞实时层
+        self._locks = {tier: threading.Lock() for tier in TIERS}
+
+    def get_tier(self, tier):
+        """获取某一层的数据，过期时重新采集"""
+        with self._locks[tier]:
+            cached = self._cache.get(tier)
+            ttl = self.ttls[tier]
+            if cached is not None:
+                stamp, data = cached
+                if ttl is None or time.monotonic() - stamp < ttl:
+                    return data
+            data = self._collectors[tier]()
+            self._cache[tier] = (time.monotonic(), data)
+            return data
+
+    def invalidate(self, tier=None):
+        """使某一层（或全部）缓存失效"""
+        tiers = TIERS if tier is None else (tier,)
+        for name in tiers:
+            with self._locks[name]:
+                self._cache.pop(name, None)
+
+    def warm_up(self):
+        """在后台线程中预先采集静态层和慢变层"""
+        get_host_resolver().prefetch()
+
+        def run():
+            try:
+                self.get_tier(TIER_STATIC)
+                self.get_tier(TIER_SLOW)
+            except Exception as e:
+                print(f"⚠️  预加载系统信息失败: {e}")
+        threading.Thread(target=run, name="sysinfo-warmup", daemon=True).start()
+
+    def collect(self):
+        """合并三层数据，返回与原 get_system_info 相同结构的字典"""
+        static = self.get_tier(TIER_STATIC)
+        slow = self.get_tier(TIER_SLOW)
+        live = self.get_tier(TIER_LIVE)
+
+        info = {
+            'system': {**static['system'], **slow['system']},
+            'cpu': {**static['cpu'], **live['cpu']},
+            'hardware': dict(static['hardware']),
+            'memory': dict(live['memory']),
+            'disks': list(slow['disks']),
+            'network': list(slow['network']),
+            'boot_time': static['boot_time'],
+            'process_count': live['process_count'],
+            'python': dict(static['python']),
+            'uptime': live['uptime'],
+        }
+        return info
+
+    def _collect_static(self):
+        system_info = platform.uname()
+        system = {
+            '系统': platform.system(),
+            '版本': platform.version(),
+            '发行版': platform.platform(),
+            '架构': platform.architecture()[0],
+            '处理器': platform.processor(),
+            '机器': platform.machine(),
+            '节点': system_info.node,
+        }
+        try:
+            system['主机名'] = socket.gethostname()
+        except:
+            pass
+
+        cpu = {
+            '物理核心数': psutil.cpu_count(logical=False),
+            '逻辑核心数': psutil.cpu_count(logical=True),
+        }
+        # CPU型号等硬件字段由共享的提供者查询，只查询一次
+        hardware = get_hardware_provider()
+        cpu['型号'] = hardware.get('cpu_model') or platform.processor()
+        hardware_info = {}
+        for field, label in (('gpu', '显卡'), ('bios', 'BIOS'), ('board', '主板')):
+            value = hardware.get(field)
+            if value:
+                hardware_info[label] = value
+
+        try:
+            boot_timestamp = psutil.boot_time()
+            boot_time = datetime.fromtimestamp(boot_timestamp).strftime("%Y-%m-%d %H:%M:%S")
+        except:
+            boot_timestamp = None
+            boot_time = "未知"
+
+        return {
+            'system': system,
+            'cpu': cpu,
+            'hardware': hardware_info,
+            'boot_timestamp': boot_timestamp,
+            'boot_time': boot_time,
+            'python': {
+                '版本': platform.python_version(),
+                '编译器': platform.python_compiler(),
+                '实现': platform.python_implementation(),
+            },
+        }
+
+    def _collect_slow(self):
+        system = {}
+        # 解析在后台线程进行，最多等待 dns_timeout 秒
+        system['IP地址'] = get_host_resolver().resolve() or '未知'
+
+        # 磁盘信息
+        disks = []
+        for partition in psutil.disk_partitions():
+            try:
+                usage = psutil.disk_usage(partition.mountpoint)
+                disks.append({
+                    '设备': partition.device,
+                    '挂载点': partition.mountpoint,
+                    '文件系统': partition.fstype,
+                    '总空间': f"{usage.total / (1024**3):.2f} GB",
+                    '已用空间': f"{usage.used / (1024**3):.2f} GB",
+                    '可用空间': f"{usage.free / (1024**3):.2f} GB",
+                    '使用率': f"{usage.percent}%"
+                })
+            except:
+                continue
+
+        # 网络信息
+        net_info = []
+        try:
+            for name, addrs in psutil.net_if_addrs().items():
+                if name.lower() in ['lo', 'loopback']:
+                    continue
+
+                addr_info = {'接口': name, '地址': []}
+                for addr in addrs:
+                    if addr.family == socket.AF_INET:
+                        addr_info['地址'].append(f"IPv4: {addr.address}")
+                    elif addr.family == socket.AF_INET6:
+                        addr_info['地址'].append(f"IPv6: {addr.address}")
+                    elif addr.family == psutil.AF_LINK:
+                        addr_info['地址'].append(f"MAC: {addr.address}")
+
+                if addr_info['地址']:
+                    net_info.append(addr_info)
+        except:
+            net_info = []
+
+        return {
+            'system': system,
+            'disks': disks[:3],  # 只显示前3个磁盘
+            'network': net_info[:3],
+        }
+
+    def _collect_live(self):
+        # 从后台采样器读取最近一次结果，避免阻塞
+        sampler = get_cpu_sampler()
+        cpu_sample = sampler.latest()
+        if cpu_sample is None:
+            # 第一次采样尚未完成（间隔默认 1 秒）
+            cpu = {'使用率': '采样中...'}
+        else:
+            cpu = {
+                '使用率': f"{cpu_sample['total']}%",
+                '平均使用率': f"{sampler.average():.1f}%",
+                '每核心使用率': ' / '.join(f"{p}%" for p in cpu_sample['per_cpu']),
+            }
+        try:
+            freq = psutil.cpu_freq()
+            if freq:
+                cpu['频率'] = f"{freq.current:.2f} MHz"
+        except:
+            pass
+
+        mem = psutil.virtual_memory()
+        memory = {
+            '总内存': f"{mem.total / (1024**3):.2f} GB",
+            '可用内存': f"{mem.available / (1024**3):.2f} GB",
+            '已用内存': f"{mem.used / (1024**3):.2f} GB",
+            '使用率': f"{mem.percent}%",
+        }
+        try:
+            swap = psutil.swap_memory()
+            memory['交换内存'] = f"{swap.total / (1024**3):.2f} GB"
+            memory['交换使用率'] = f"{swap.percent}%"
+        except:
+            pass
+
+        try:
+            process_count = len(psutil.pids())
+        except:
+            process_count = "未知"
+
+        # 系统运行时间
+        boot_timestamp = self.get_tier(TIER_STATIC)['boot_timestamp']
+        try:
+            uptime = datetime.now() - datetime.fromtimestamp(boot_timestamp)
+            days = uptime.days
+            hours, remainder = divmod(uptime.seconds, 3600)
+            minutes, seconds = divmod(remainder, 60)
+            uptime_text = f"{days}天 {hours}小时 {minutes}分钟 {seconds}秒"
+        except:
+            uptime_text = "未知"
+
+        return {
+            'cpu': cpu,
+            'memory': memory,
+            'process_count': process_count,
+            'uptime': uptime_text,
+        }
+
+
+_collector = None
+_collector_lock = threading.Lock()
+
+
+def get_system_info_collector():
+    """获取全局系统信息采集器"""
+    global _collector
+    with _collector_lock:
+        if _collector is None:
+            _collector = SystemInfoCollector(
+                slow_ttl=config.settings.get('system_info_slow_ttl', 30.0),
+                live_ttl=config.settings.get('system_info_live_ttl', 1.0),
+            )
+        return _collector
@@ -0,0 +1,6 @@
+# conftest.py - 测试公共设置
+import sys
+from pathlib import Path
+
+# 让测试可以直接导入 main 目录下的模块
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
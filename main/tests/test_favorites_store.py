@@ -0,0 +1,77 @@
+# test_favorites_store.py - 收藏日志的追加、重放与压缩
+import time
+
+from favorites_store import FavoritesStore
+
+
+def journal_lines(path):
+    return [line for line in path.read_text(encoding='utf-8').splitlines() if line]
+
+
+def wait_compacted(store, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while store._compacting and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return not store._compacting
+
+
+def test_set_appends_and_reload_replays(tmp_path):
+    path = tmp_path / 'favorites.journal'
+    store = FavoritesStore(path)
+    assert store.set('cleaner', True)
+    assert store.set('ping', True)
+    assert store.set('cleaner', False)
+    assert len(journal_lines(path)) == 3
+
+    reloaded = FavoritesStore(path)
+    assert reloaded.get('cleaner') is False
+    assert reloaded.get('ping') is True
+    assert reloaded.get('missing', default=None) is None
+
+
+def test_apply_keeps_manifest_default_without_record(tmp_path):
+    store = FavoritesStore(tmp_path / 'favorites.journal')
+    store.set('ping', False)
+    assert store.apply({'id': 'ping', 'favorite': True})['favorite'] is False
+    assert store.apply({'id': 'zip', 'favorite': True})['favorite'] is True
+
+
+def test_torn_last_line_is_ignored(tmp_path):
+    path = tmp_path / 'favorites.journal'
+    path.write_text('{"id": "ping", "favorite": true}\n{"id": "clea', encoding='utf-8')
+    store = FavoritesStore(path)
+    assert store.get('ping') is True
+    assert store.get('clea', default=None) is None
+
+
+def test_compaction_after_threshold(tmp_path):
+    path = tmp_path / 'favorites.journal'
+    store = FavoritesStore(path, compact_threshold=4)
+    for i in range(4):
+        store.set('cleaner', i % 2 == 0)
+    store.set('ping', True)
+    # 2 个工具 + 阈值 4 = 6 行以内不压缩
+    assert len(journal_lines(path)) == 5
+    store.set('cleaner', True)
+    store.set('cleaner', False)
+    assert wait_compacted(store)
+    assert len(journal_lines(path)) == 2
+    assert not (tmp_path / 'favorites.journal.tmp').exists()
+
+    reloaded = FavoritesStore(path)
+    assert reloaded.get('cleaner') is False
+    assert reloaded.get('ping') is True
+
+
+def test_writes_after_compaction_are_kept(tmp_path):
+    path = tmp_path / 'favorites.journal'
+    store = FavoritesStore(path, compact_threshold=1)
+    for i in range(50):
+        store.set(f"tool_{i % 3}", i % 2 == 0)
+    assert wait_compacted(store)
+    store.set('tool_0', True)
+    store.compact()
+    expected = {f"tool_{i}": store.get(f"tool_{i}") for i in range(3)}
+    reloaded = FavoritesStore(path)
+    assert {tool_id: reloaded.get(tool_id) for tool_id in expected} == expected
+    assert len(journal_lines(path)) == 3
@@ -0,0 +1,83 @@
+# test_hardware_info.py - 基于伪造 /proc 与 /sys 目录的 SysfsBackend 测试
+import pytest
+
+from hardware_info import HardwareInfoProvider, SysfsBackend
+
+
+def write(path, text):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text, encoding='utf-8')
+
+
+@pytest.fixture
+def roots(tmp_path):
+    proc_dir, sys_dir = tmp_path / 'proc', tmp_path / 'sys'
+    proc_dir.mkdir()
+    sys_dir.mkdir()
+    return proc_dir, sys_dir
+
+
+def test_unavailable_without_cpuinfo(roots):
+    assert not SysfsBackend(*roots).is_available()
+
+
+def test_cpu_model_x86(roots):
+    proc_dir, sys_dir = roots
+    write(proc_dir / 'cpuinfo', "processor\t: 0\nvendor_id\t: GenuineIntel\n"
+                                "model name\t: Intel(R) Core(TM) i7-9700 CPU @ 3.00GHz\n\n"
+                                "processor\t: 1\nmodel name\t: Intel(R) Core(TM) i7-9700 CPU @ 3.00GHz\n")
+    backend = SysfsBackend(proc_dir, sys_dir)
+    assert backend.is_available()
+    assert backend.query('cpu_model') == 'Intel(R) Core(TM) i7-9700 CPU @ 3.00GHz'
+
+
+def test_cpu_model_arm(roots):
+    proc_dir, sys_dir = roots
+    write(proc_dir / 'cpuinfo', "processor\t: 0\nBogoMIPS\t: 108.00\n\nHardware\t: BCM2835\n")
+    assert SysfsBackend(proc_dir, sys_dir).query('cpu_model') == 'BCM2835'
+
+
+def test_dmi_fields(roots):
+    proc_dir, sys_dir = roots
+    dmi_dir = sys_dir / 'class' / 'dmi' / 'id'
+    write(dmi_dir / 'bios_vendor', "American Megatrends Inc.\n")
+    write(dmi_dir / 'bios_version', "F12\n")
+    write(dmi_dir / 'board_vendor', "Gigabyte Technology Co., Ltd.\n")
+    # board_name 缺失时只返回厂商
+    backend = SysfsBackend(proc_dir, sys_dir)
+    assert backend.query('bios') == 'American Megatrends Inc. F12'
+    assert backend.query('board') == 'Gigabyte Technology Co., Ltd.'
+
+
+def test_missing_fields_are_none(roots):
+    backend = SysfsBackend(*roots)
+    assert backend.query('cpu_model') is None
+    assert backend.query('gpu') is None
+    assert backend.query('bios') is None
+
+
+def test_gpu_skips_connectors(roots):
+    proc_dir, sys_dir = roots
+    drm_dir = sys_dir / 'class' / 'drm'
+    write(drm_dir / 'card0' / 'device' / 'uevent', "DRIVER=i915\nPCI_ID=8086:3E92\n")
+    write(drm_dir / 'card0-HDMI-A-1' / 'device' / 'uevent', "DRIVER=ignored\n")
+    write(drm_dir / 'card1' / 'device' / 'uevent', "DRIVER=nouveau\n")
+    write(drm_dir / 'renderD128' / 'device' / 'uevent', "DRIVER=ignored\n")
+    assert SysfsBackend(proc_dir, sys_dir).query('gpu') == 'i915 8086:3E92, nouveau'
+
+
+def test_unknown_field(roots):
+    with pytest.raises(KeyError):
+        SysfsBackend(*roots).query('fan_speed')
+
+
+def test_provider_caches_values(roots):
+    proc_dir, sys_dir = roots
+    write(proc_dir / 'cpuinfo', "model name\t: First CPU\n")
+    provider = HardwareInfoProvider(SysfsBackend(proc_dir, sys_dir))
+    assert provider.get('cpu_model') == 'First CPU'
+    write(proc_dir / 'cpuinfo', "model name\t: Second CPU\n")
+    assert provider.get('cpu_model') == 'First CPU'
+    provider.invalidate()
+    assert provider.get('cpu_model') == 'Second CPU'
+    assert set(provider.get_all()) == {'cpu_model', 'gpu', 'bios', 'board'}
@@ -0,0 +1,96 @@
+# test_live_monitor.py - 实时监控的环形缓冲区
+import pytest
+
+np = pytest.importorskip('numpy')
+
+from live_monitor import MetricRing  # noqa: E402
+
+
+def filled(capacity, rows, columns=('a', 'b')):
+    ring = MetricRing(columns, capacity)
+    for i in range(rows):
+        ring.append(1000.0 + i, [float(i), float(10 * i)])
+    return ring
+
+
+def test_append_and_wraparound():
+    ring = filled(4, 6)
+    assert len(ring) == 4 and ring.seq == 6
+    times, values = ring.window()
+    assert times.tolist() == [1002.0, 1003.0, 1004.0, 1005.0]
+    assert values[:, 0].tolist() == [2.0, 3.0, 4.0, 5.0]
+
+
+def test_since_returns_only_new_rows():
+    ring = filled(8, 5)
+    seq, times, values = ring.since(3)
+    assert seq == 5
+    assert times.tolist() == [1003.0, 1004.0]
+    seq, times, _ = ring.since(seq)
+    assert seq == 5 and len(times) == 0
+    # 落后超过容量时从最早保留的行开始
+    ring = filled(4, 10)
+    seq, times, _ = ring.since(0)
+    assert seq == 10 and times.tolist() == [1006.0, 1007.0, 1008.0, 1009.0]
+
+
+def test_window_by_seconds():
+    ring = filled(16, 10)
+    times, _ = ring.window(3)
+    assert times.tolist() == [1006.0, 1007.0, 1008.0, 1009.0]
+    # 跨过缓冲区末尾时也只取窗口内的行
+    ring = filled(8, 13)
+    times, values = ring.window(2)
+    assert times.tolist() == [1010.0, 1011.0, 1012.0]
+    assert values[:, 1].tolist() == [100.0, 110.0, 120.0]
+
+
+def test_returned_arrays_are_copies():
+    ring = filled(4, 4)
+    times, values = ring.window()
+    values[:] = -1
+    assert ring.window()[1][0, 0] == 0.0
+
+
+def test_stats_match_numpy():
+    rng = np.random.default_rng(1)
+    data = rng.random((50, 3)) * 100
+    ring = MetricRing(['x', 'y', 'z'], 64, dtype=np.float64)
+    for i, row in enumerate(data):
+        ring.append(float(i), row)
+    stats = ring.stats(percentiles=(50, 95))
+    assert stats['count'] == 50 and stats['start'] == 0.0 and stats['end'] == 49.0
+    for i, name in enumerate('xyz'):
+        column = stats['columns'][name]
+        assert column['min'] == pytest.approx(data[:, i].min(), abs=0.01)
+        assert column['max'] == pytest.approx(data[:, i].max(), abs=0.01)
+        assert column['avg'] == pytest.approx(data[:, i].mean(), abs=0.01)
+        assert column['p50'] == pytest.approx(np.percentile(data[:, i], 50), abs=0.01)
+        assert column['p95'] == pytest.approx(np.percentile(data[:, i], 95), abs=0.01)
+
+
+def test_stats_ignore_nan_and_select_columns():
+    ring = MetricRing(['cpu', 'swap'], 8)
+    for i, cpu in enumerate([10.0, float('nan'), 30.0]):
+        ring.append(float(i), [cpu, float('nan')])
+    stats = ring.stats(columns=['cpu', 'swap', 'unknown'])
+    assert set(stats['columns']) == {'cpu', 'swap'}
+    assert stats['columns']['cpu']['min'] == 10.0
+    assert stats['columns']['cpu']['avg'] == 20.0
+    assert stats['columns']['cpu']['max'] == 30.0
+    assert stats['columns']['cpu']['p50'] == 20.0
+    # 整列没有数据时统计值为 None
+    assert all(value is None for value in stats['columns']['swap'].values())
+
+
+def test_stats_empty_window():
+    ring = MetricRing(['a'], 4)
+    assert ring.stats(60) == {'count': 0, 'start': None, 'end': None, 'columns': {}}
+
+
+def test_memory_is_fixed():
+    ring = MetricRing(['a', 'b', 'c'], 100)
+    nbytes = ring.nbytes
+    for i in range(1000):
+        ring.append(float(i), [1.0, 2.0, 3.0])
+    assert ring.nbytes == nbytes == 100 * 8 + 100 * 3 * 4
@@ -0,0 +1,102 @@
+# test_net_resolver.py - 主机名解析的超时、失败缓存与回环地址替换
+import threading
+import time
+
+import pytest
+
+import net_resolver
+from net_resolver import HostResolver
+
+INTERFACE_IP = '192.168.1.5'
+
+
+class FakeDns:
+    """替代 socket.gethostbyname：按主机名返回结果，可阻塞以模拟慢 DNS"""
+
+    def __init__(self, answers):
+        self.answers = answers
+        self.calls = []
+        self.release = threading.Event()
+        self.release.set()
+
+    def __call__(self, hostname):
+        self.calls.append(hostname)
+        self.release.wait(10)
+        answer = self.answers[hostname]
+        if isinstance(answer, Exception):
+            raise answer
+        return answer
+
+
+@pytest.fixture
+def dns(monkeypatch):
+    fake = FakeDns({'loop': '127.0.1.1', 'lan': '10.0.0.7', 'bad': OSError('no such host')})
+    monkeypatch.setattr(net_resolver.socket, 'gethostbyname', fake)
+    monkeypatch.setattr(net_resolver, 'primary_ip_from_interfaces', lambda: INTERFACE_IP)
+    yield fake
+    fake.release.set()
+
+
+def test_regular_answer_is_cached(dns):
+    resolver = HostResolver(timeout=1.0)
+    assert resolver.resolve('lan') == '10.0.0.7'
+    assert resolver.resolve('lan') == '10.0.0.7'
+    assert dns.calls == ['lan']
+
+
+def test_loopback_replaced_on_repeated_calls(dns):
+    resolver = HostResolver(timeout=1.0)
+    assert resolver.resolve('loop') == INTERFACE_IP
+    # 第二次命中缓存，同样替换为网卡地址
+    assert resolver.resolve('loop') == INTERFACE_IP
+    assert dns.calls == ['loop']
+
+
+def test_loopback_kept_without_interface_address(dns, monkeypatch):
+    monkeypatch.setattr(net_resolver, 'primary_ip_from_interfaces', lambda: None)
+    resolver = HostResolver(timeout=1.0)
+    assert resolver.resolve('loop') == '127.0.1.1'
+    assert resolver.resolve('loop') == '127.0.1.1'
+
+
+def test_timeout_falls_back_and_is_negative_cached(dns):
+    dns.release.clear()
+    resolver = HostResolver(timeout=0.1, negative_ttl=30.0)
+    start = time.monotonic()
+    assert resolver.resolve('lan') == INTERFACE_IP
+    assert time.monotonic() - start < 1.0
+    # 失败记录有效期内直接返回网卡地址，不再等待
+    start = time.monotonic()
+    assert resolver.resolve('lan', timeout=5.0) == INTERFACE_IP
+    assert time.monotonic() - start < 0.5
+    assert dns.calls == ['lan']
+
+    # 后台解析之后成功：清除失败记录并缓存结果
+    dns.release.set()
+    deadline = time.monotonic() + 5
+    while resolver._cached('lan') is None and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert resolver.resolve('lan') == '10.0.0.7'
+
+
+def test_failure_negative_ttl_expires(dns):
+    resolver = HostResolver(timeout=1.0, negative_ttl=0.2)
+    assert resolver.resolve('bad') == INTERFACE_IP
+    assert resolver.resolve('bad') == INTERFACE_IP
+    assert dns.calls == ['bad']
+    # 有效期过后重新尝试 DNS
+    time.sleep(0.25)
+    resolver.prefetch('bad')
+    deadline = time.monotonic() + 5
+    while len(dns.calls) < 2 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert dns.calls == ['bad', 'bad']
+
+
+def test_stale_cache_used_after_failure(dns):
+    resolver = HostResolver(timeout=1.0, ttl=0.05)
+    assert resolver.resolve('lan') == '10.0.0.7'
+    time.sleep(0.1)
+    dns.answers['lan'] = OSError('dns down')
+    assert resolver.resolve('lan') == '10.0.0.7'
+    assert dns.calls == ['lan', 'lan']
@@ -0,0 +1,197 @@
+# test_process_table.py - 进程表的差异查询、进程树与进程操作
+import subprocess
+import sys
+import time
+from collections import namedtuple
+from contextlib import contextmanager
+
+import psutil
+import pytest
+
+import process_table
+from process_table import ProcessError, ProcessTable, ROW_FIELDS
+
+CpuTimes = namedtuple('CpuTimes', 'user system')
+MemoryInfo = namedtuple('MemoryInfo', 'rss')
+
+
+class FakeProcess:
+    """process_iter 返回的进程，只提供 ProcessTable 用到的接口"""
+
+    def __init__(self, pid, ppid, name, cpu=0.0, rss=1024, create_time=100.0):
+        self.pid = pid
+        self.info = {'ppid': ppid, 'name': name, 'status': 'running', 'cpu_times': CpuTimes(cpu, 0.0),
+                     'memory_info': MemoryInfo(rss), 'num_threads': 1, 'create_time': create_time}
+
+    @contextmanager
+    def oneshot(self):
+        yield
+
+    def exe(self):
+        return f"/usr/bin/{self.info['name']}"
+
+    def cmdline(self):
+        return [self.info['name']]
+
+    def username(self):
+        return 'tester'
+
+
+@pytest.fixture
+def system(monkeypatch):
+    """可修改的伪造进程列表：{pid: FakeProcess}"""
+    processes = {}
+    monkeypatch.setattr(process_table.psutil, 'process_iter',
+                        lambda attrs: iter(list(processes.values())))
+    return processes
+
+
+def add(system, *args, **kwargs):
+    proc = FakeProcess(*args, **kwargs)
+    system[proc.pid] = proc
+    return proc
+
+
+def field(row, name):
+    return row[ROW_FIELDS.index(name)]
+
+
+def test_query_diff_by_token(system):
+    add(system, 1, 0, 'init', rss=10)
+    add(system, 10, 1, 'editor', rss=5000)
+    add(system, 11, 1, 'shell', rss=3000)
+    add(system, 12, 1, 'daemon', rss=1000)
+    table = ProcessTable(min_interval=3600)
+    first = table.query('memory', limit=10)
+    assert first['full'] and first['order'] == [10, 11, 12, 1]
+    assert len(first['rows']) == 4
+
+    # 12 退出，13 启动，10 的内存变化，11 与 1 不变
+    del system[12]
+    add(system, 13, 1, 'browser', rss=9000)
+    system[10].info['memory_info'] = MemoryInfo(6000)
+    table.sample(force=True)
+    diff = table.query('memory', limit=10, token=first['token'])
+    assert not diff['full']
+    assert diff['order'] == [13, 10, 11, 1]
+    assert sorted(field(row, 'pid') for row in diff['rows']) == [10, 13]
+    assert diff['removed'] == [12]
+    assert diff['generation'] == first['generation'] + 1
+
+    # 已使用过的 token 失效，返回完整的一页
+    again = table.query('memory', limit=10, token=first['token'])
+    assert again['full'] and len(again['rows']) == 4
+
+
+def test_query_page_and_removed_from_page(system):
+    for pid in range(1, 7):
+        add(system, pid, 0, f'p{pid}', rss=pid * 100)
+    table = ProcessTable(min_interval=3600)
+    page = table.query('memory', limit=2)
+    assert page['order'] == [6, 5] and page['total'] == 6
+    system[7] = FakeProcess(7, 0, 'p7', rss=700)
+    table.sample(force=True)
+    diff = table.query('memory', limit=2, token=page['token'])
+    assert diff['order'] == [7, 6]
+    assert [field(row, 'pid') for row in diff['rows']] == [7]
+    assert diff['removed'] == [5]
+
+
+def test_cpu_from_cpu_times_delta(system, monkeypatch):
+    proc = add(system, 5, 0, 'busy', cpu=1.0)
+    table = ProcessTable(min_interval=0)
+    table.query()
+    proc.info['cpu_times'] = CpuTimes(3.0, 0.0)
+    clock = [table._sampled_at + 4.0]
+    monkeypatch.setattr(process_table.time, 'monotonic', lambda: clock[0])
+    table._cores = 1
+    row = table.query()['rows'][0]
+    assert field(row, 'cpu') == pytest.approx(50.0)
+
+
+def test_filter_matches_all_terms(system):
+    add(system, 1, 0, 'init')
+    add(system, 20, 1, 'python3')
+    add(system, 21, 1, 'python-helper')
+    table = ProcessTable(min_interval=3600)
+    assert sorted(table.query('pid', False, 'python')['order']) == [20, 21]
+    assert table.query('pid', False, 'python helper')['order'] == [21]
+    assert table.query('pid', False, '20')['order'] == [20]
+
+
+def test_tree_order_keeps_matching_ancestors(system):
+    add(system, 1, 0, 'init')
+    add(system, 2, 1, 'session', rss=10)
+    add(system, 3, 2, 'terminal', rss=20)
+    add(system, 4, 3, 'target-worker')
+    add(system, 5, 1, 'unrelated', rss=30)
+    add(system, 6, 2, 'other', rss=5)
+    table = ProcessTable(min_interval=3600)
+
+    full = table.query('memory', tree=True)
+    assert full['fields'][-1] == 'depth'
+    depths = {field(row, 'pid'): row[-1] for row in full['rows']}
+    # 兄弟进程按内存降序，子进程紧跟父进程
+    assert full['order'] == [1, 5, 2, 3, 4, 6]
+    assert depths == {1: 0, 5: 1, 2: 1, 3: 2, 4: 3, 6: 2}
+
+    filtered = table.query('memory', tree=True, filter_text='target')
+    assert filtered['order'] == [1, 2, 3, 4]
+    assert [row[-1] for row in filtered['rows']] == [0, 1, 2, 3]
+
+
+def test_tree_order_survives_parent_cycle(system):
+    # 采样期间 PID 被复用，父子关系可能成环
+    add(system, 7, 8, 'a')
+    add(system, 8, 7, 'b')
+    table = ProcessTable(min_interval=3600)
+    assert sorted(table.query('pid', tree=True)['order']) == [7, 8]
+
+
+def test_unknown_sort_field(system):
+    with pytest.raises(ProcessError):
+        ProcessTable().query('nonsense')
+
+
+@pytest.fixture
+def child():
+    proc = subprocess.Popen([sys.executable, '-c', 'import time; time.sleep(30)'])
+    yield proc
+    proc.kill()
+    proc.wait()
+
+
+def test_create_time_guard_against_pid_reuse(child):
+    table = ProcessTable()
+    create_time = psutil.Process(child.pid).create_time()
+    with pytest.raises(ProcessError):
+        table.suspend(child.pid, create_time - 100)
+    assert psutil.Process(child.pid).status() != psutil.STATUS_STOPPED
+    with pytest.raises(ProcessError):
+        table.kill(child.pid, create_time + 100)
+    assert child.poll() is None
+    with pytest.raises(ProcessError):
+        table.kill(child.pid + 10 ** 6)
+
+
+def test_cannot_act_on_self():
+    with pytest.raises(ProcessError):
+        ProcessTable().kill(psutil.Process().pid)
+
+
+@pytest.mark.skipif(sys.platform == 'win32', reason="Windows 上 terminate 即强制结束")
+def test_kill_returns_before_stubborn_process_exits():
+    code = "import signal, time; signal.signal(signal.SIGTERM, signal.SIG_IGN); print(1, flush=True); time.sleep(30)"
+    proc = subprocess.Popen([sys.executable, '-c', code], stdout=subprocess.PIPE)
+    try:
+        proc.stdout.readline()
+        table = ProcessTable()
+        start = time.monotonic()
+        assert table.kill(proc.pid, psutil.Process(proc.pid).create_time(), timeout=0.5) == 1
+        assert time.monotonic() - start < 0.3
+        assert proc.poll() is None
+        # 超时后由后台线程强制结束
+        assert proc.wait(timeout=5) != 0
+    finally:
+        proc.kill()
+        proc.wait()
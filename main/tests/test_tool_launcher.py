@@ -0,0 +1,103 @@
+# test_tool_launcher.py - 工具进程的启动、输出捕获、并发上限与结束
+import sys
+import time
+
+import pytest
+
+from tool_launcher import (ToolLauncher, LaunchError, STATUS_EXITED, STATUS_RUNNING,
+                           STATUS_STOPPED)
+
+
+def wait_for(predicate, timeout=10.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.02)
+    return False
+
+
+def write_tool(tools_dir, name, source, category='system'):
+    """在临时工具目录中写入一个工具程序与它的清单，返回 (工具数据, 清单路径)"""
+    category_dir = tools_dir / category
+    category_dir.mkdir(parents=True, exist_ok=True)
+    (category_dir / name).write_text(source, encoding='utf-8')
+    tool = {'id': name.rsplit('.', 1)[0], 'name': name, 'executable': name, 'status': 'on'}
+    return tool, category_dir / f"{tool['id']}.json"
+
+
+@pytest.fixture
+def launcher():
+    launcher = ToolLauncher(max_running=2)
+    yield launcher
+    launcher.stop_all(timeout=1.0)
+
+
+def test_launch_captures_output_and_exit_code(tmp_path, launcher):
+    tool, manifest = write_tool(tmp_path, 'hello.py', "import sys\nprint('你好')\nsys.exit(3)\n")
+    run = launcher.launch(tool, manifest)
+    assert wait_for(lambda: run.status == STATUS_EXITED)
+    assert run.exit_code == 3
+    output = launcher.read_output(run.run_id)
+    assert output['text'].strip() == '你好'
+    assert output['finished']
+    assert run.first_output_latency is not None
+
+
+@pytest.mark.skipif(sys.platform == 'win32', reason="需要 /bin/sh")
+def test_launch_shell_script_without_exec_bit(tmp_path, launcher):
+    tool, manifest = write_tool(tmp_path, 'hello.sh', "echo from-sh\necho err >&2\n")
+    run = launcher.launch(tool, manifest)
+    assert wait_for(lambda: run.status == STATUS_EXITED)
+    assert run.exit_code == 0
+    assert sorted(launcher.read_output(run.run_id)['text'].split()) == ['err', 'from-sh']
+
+
+def test_missing_executable(tmp_path, launcher):
+    tool = {'id': 'ghost', 'executable': 'no-such-tool.py'}
+    with pytest.raises(LaunchError):
+        launcher.launch(tool, tmp_path / 'system' / 'ghost.json')
+
+
+def test_max_running_cap(tmp_path, launcher):
+    tool, manifest = write_tool(tmp_path, 'sleeper.py', "import time\ntime.sleep(30)\n")
+    first = launcher.launch(tool, manifest)
+    launcher.launch(tool, manifest)
+    with pytest.raises(LaunchError):
+        launcher.launch(tool, manifest)
+    assert len(launcher.list_runs()) == 2
+
+    # 结束一个之后又可以启动
+    assert launcher.stop(first.run_id)
+    assert wait_for(lambda: first.status == STATUS_STOPPED)
+    launcher.launch(tool, manifest)
+
+
+def test_stop_returns_immediately_and_kills_process_tree(tmp_path, launcher):
+    # 父进程忽略 SIGTERM，只能在超时后被强制结束
+    source = ("import signal, subprocess, sys, time\n"
+              "signal.signal(signal.SIGTERM, signal.SIG_IGN)\n"
+              "subprocess.Popen([sys.executable, '-c', 'import time; time.sleep(30)'])\n"
+              "print('ready', flush=True)\n"
+              "time.sleep(30)\n")
+    tool, manifest = write_tool(tmp_path, 'stubborn.py', source)
+    run = launcher.launch(tool, manifest)
+    assert wait_for(lambda: 'ready' in launcher.read_output(run.run_id)['text'])
+    assert run.status == STATUS_RUNNING
+
+    import psutil
+    children = psutil.Process(run.pid).children(recursive=True)
+    start = time.monotonic()
+    assert launcher.stop(run.run_id, timeout=0.5)
+    assert time.monotonic() - start < 0.5
+    assert wait_for(lambda: run.status == STATUS_STOPPED)
+    assert not any(child.is_running() and child.status() != psutil.STATUS_ZOMBIE for child in children)
+
+
+def test_stop_unknown_or_finished_run(tmp_path, launcher):
+    assert not launcher.stop(12345)
+    tool, manifest = write_tool(tmp_path, 'quick.py', "pass\n")
+    run = launcher.launch(tool, manifest)
+    assert wait_for(lambda: run.status == STATUS_EXITED)
+    assert not launcher.stop(run.run_id)
+    assert launcher.get_run(run.run_id) is run
@@ -0,0 +1,114 @@
+# test_tool_output.py - 工具输出的环形缓冲、管道读取与批量推送
+import io
+import threading
+import time
+
+from tool_output import OutputBroadcaster, OutputRing, pump_stream
+
+CAPACITY = 1024
+
+
+def test_read_within_capacity():
+    ring = OutputRing(CAPACITY)
+    ring.write('hello ')
+    ring.write('world')
+    assert ring.read() == ('hello world', 0, 11)
+    assert ring.read(6) == ('world', 6, 11)
+    assert ring.read(6, limit=3) == ('wor', 6, 9)
+    assert ring.read(11) == ('', 11, 11)
+    # 超出末尾的偏移按末尾处理
+    assert ring.read(100) == ('', 11, 11)
+
+
+def test_writes_past_capacity_move_start():
+    ring = OutputRing(CAPACITY)
+    text = ''.join(f'{i:04d}' for i in range(600))   # 2400 个字符
+    for i in range(0, len(text), 100):
+        ring.write(text[i:i + 100])
+    assert ring.end == 2400
+    assert ring.start == 2400 - CAPACITY
+    data, start, next_offset = ring.read(ring.start, limit=CAPACITY)
+    assert (start, next_offset) == (2400 - CAPACITY, 2400)
+    assert data == text[-CAPACITY:]
+
+
+def test_data_after_wraparound_is_contiguous():
+    ring = OutputRing(CAPACITY)
+    ring.write('a' * 1000)
+    ring.write('b' * 100)    # 超出容量，首块被截去一部分
+    ring.write('c' * 50)
+    assert ring.start == 1150 - CAPACITY
+    data, start, _ = ring.read(1000)
+    assert (data, start) == ('b' * 100 + 'c' * 50, 1000)
+    # 分页读取跨越多个块
+    pages = []
+    offset = ring.start
+    while offset < ring.end:
+        data, _, offset = ring.read(offset, limit=300)
+        pages.append(data)
+    assert ''.join(pages) == 'a' * (1000 - ring.start) + 'b' * 100 + 'c' * 50
+
+
+def test_single_write_larger_than_capacity():
+    ring = OutputRing(CAPACITY)
+    ring.write('x' * 10)
+    ring.write('0123456789' * 300)
+    assert ring.end == 3010
+    assert ring.start == 3010 - CAPACITY
+    data, start, _ = ring.read(0, limit=CAPACITY)
+    assert start == ring.start
+    assert data == ('0123456789' * 300)[-CAPACITY:]
+
+
+def test_reader_fallen_behind_resumes_at_start():
+    ring = OutputRing(CAPACITY)
+    ring.write('first line\n')
+    _, _, cursor = ring.read()
+    for i in range(200):
+        ring.write(f'line {i:03d}\n')
+    assert cursor < ring.start
+    data, start, next_offset = ring.read(cursor, limit=64)
+    # 被覆盖的部分跳过，从保留的最早位置继续
+    assert start == ring.start
+    assert next_offset == start + len(data)
+    assert data == ring.read(ring.start, limit=64)[0]
+
+
+def test_first_write_callback_runs_once():
+    ring = OutputRing(CAPACITY)
+    calls = []
+    ring.on_first_write = calls.append
+    ring.write('')
+    ring.write('a')
+    ring.write('b')
+    assert len(calls) == 1
+
+
+def test_pump_stream_decodes_split_characters():
+    data = '你好，世界\n'.encode('utf-8')
+    ring = OutputRing(CAPACITY)
+    # 每次只读 1 字节，多字节字符被拆开
+    pump_stream(io.BufferedReader(io.BytesIO(data), buffer_size=1), ring, encoding='utf-8', chunk_size=1)
+    assert ring.read()[0] == '你好，世界\n'
+
+
+def test_broadcaster_batches_and_reports_finished():
+    batches = []
+    received = threading.Event()
+
+    def sink(batch):
+        batches.append(batch)
+        if any(chunk.get('finished') for chunk in batch):
+            received.set()
+
+    broadcaster = OutputBroadcaster(sink, interval=0.01)
+    ring = OutputRing(CAPACITY)
+    broadcaster.track(7, ring)
+    ring.write('abc')
+    ring.write('def')
+    time.sleep(0.05)
+    ring.close()
+    assert received.wait(5)
+    chunks = [chunk for batch in batches for chunk in batch]
+    assert ''.join(chunk['text'] for chunk in chunks) == 'abcdef'
+    assert chunks[-1]['finished'] and chunks[-1]['next_offset'] == 6
@@ -0,0 +1,183 @@
+# test_tool_registry.py - 增量工具注册表
+import json
+import os
+
+import pytest
+
+from tool_registry import ToolRegistry
+
+
+def write_manifest(tools_dir, category, tool_id, **fields):
+    path = tools_dir / category / f"{tool_id}.json"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tool = {'id': tool_id, 'name': tool_id, 'executable': f"{tool_id}.exe"}
+    tool.update(fields)
+    path.write_text(json.dumps(tool, ensure_ascii=False), encoding='utf-8')
+    # 保证 mtime 变化（部分文件系统的时间精度较粗）
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    return path
+
+
+@pytest.fixture
+def tools_dir(tmp_path):
+    tools_dir = tmp_path / 'tools'
+    write_manifest(tools_dir, 'system', 'cleaner')
+    write_manifest(tools_dir, 'network', 'ping')
+    return tools_dir
+
+
+def ids(tools):
+    return sorted(tool['id'] for tool in tools)
+
+
+def test_changes_since_unchanged_and_full(tools_dir):
+    registry = ToolRegistry(tools_dir)
+    registry.refresh()
+    version = registry.version
+    assert registry.changes_since(version) == {'version': version, 'unchanged': True}
+    for stale in (None, version + 1):
+        changes = registry.changes_since(stale)
+        assert changes['full']
+        assert ids(changes['tools']) == ['cleaner', 'ping']
+
+
+def test_changes_since_reports_added_updated_removed(tools_dir):
+    registry = ToolRegistry(tools_dir)
+    registry.refresh()
+    base = registry.version
+
+    write_manifest(tools_dir, 'system', 'cleaner', name='清理大师')
+    write_manifest(tools_dir, 'utilities', 'zip')
+    (tools_dir / 'network' / 'ping.json').unlink()
+    delta = registry.refresh()
+    assert ids(delta['added']) == ['zip']
+    assert ids(delta['updated']) == ['cleaner']
+    assert ids(delta['removed']) == ['ping']
+    assert (delta['from_version'], delta['version']) == (base, registry.version)
+
+    changes = registry.changes_since(base)
+    assert ids(changes['added']) == ['zip']
+    assert ids(changes['updated']) == ['cleaner']
+    assert changes['removed'] == ['ping']
+    assert registry.changes_since(registry.version)['unchanged']
+
+
+def test_unchanged_refresh_has_no_versions(tools_dir):
+    registry = ToolRegistry(tools_dir)
+    registry.refresh()
+    version = registry.version
+    assert registry.refresh() == {'added': [], 'updated': [], 'removed': []}
+    assert registry.version == version
+
+
+def test_touch_marks_tool_updated(tools_dir):
+    registry = ToolRegistry(tools_dir)
+    registry.refresh()
+    base = registry.version
+    assert registry.touch('cleaner') == base + 1
+    assert registry.touch('missing') == base + 1
+    changes = registry.changes_since(base)
+    assert ids(changes['updated']) == ['cleaner']
+    assert changes['added'] == [] and changes['removed'] == []
+
+
+def test_removed_then_readded_is_added(tools_dir):
+    registry = ToolRegistry(tools_dir)
+    registry.refresh()
+    base = registry.version
+    (tools_dir / 'network' / 'ping.json').unlink()
+    registry.refresh()
+    write_manifest(tools_dir, 'network', 'ping')
+    registry.refresh()
+    changes = registry.changes_since(base)
+    assert ids(changes['added']) == ['ping']
+    assert changes['removed'] == []
+
+
+def test_index_restores_tools(tools_dir, tmp_path):
+    index_path = tmp_path / 'tools_index.bin'
+    ToolRegistry(tools_dir, index_path=index_path).refresh()
+    registry = ToolRegistry(tools_dir, index_path=index_path)
+    assert ids(registry.tools()) == ['cleaner', 'ping']
+    # 索引仍然有效时刷新不产生变化，version 之前的客户端需要全量同步
+    assert not any(registry.refresh().values())
+    assert registry.changes_since(0)['full']
+
+
+def test_manifest_path_by_id(tools_dir):
+    registry = ToolRegistry(tools_dir)
+    registry.refresh()
+    assert registry.manifest_path('ping') == str(tools_dir / 'network' / 'ping.json')
+    assert registry.manifest_path('missing') is None
+
+
+def test_duplicate_id_is_reported_not_overwritten(tools_dir):
+    registry = ToolRegistry(tools_dir)
+    registry.refresh()
+    duplicate = write_manifest(tools_dir, 'utilities', 'copy', id='ping', name='另一个 ping')
+    delta = registry.refresh()
+    assert not any(delta.values())
+    assert registry.get('ping')['name'] == 'ping'
+    assert registry.manifest_path('ping') == str(tools_dir / 'network' / 'ping.json')
+    errors = registry.errors()
+    assert [error['path'] for error in errors] == [str(duplicate)]
+    assert 'ping' in errors[0]['error']
+
+    # 胜出的清单被删除：监视器只刷新该路径，重复的清单同样接替
+    winner = tools_dir / 'network' / 'ping.json'
+    base = registry.version
+    winner.unlink()
+    delta = registry.refresh([winner])
+    assert [tool['name'] for tool in delta['removed']] == ['ping']
+    assert [tool['name'] for tool in delta['added']] == ['另一个 ping']
+    assert delta['from_version'] == base and delta['version'] == registry.version
+    assert registry.get('ping')['name'] == '另一个 ping'
+    assert registry.manifest_path('ping') == str(duplicate)
+    assert registry.errors() == []
+    changes = registry.changes_since(base)
+    assert ids(changes['added']) == ['ping'] and changes['removed'] == []
+
+
+def test_duplicate_promoted_when_winner_renamed_or_changes_id(tools_dir):
+    registry = ToolRegistry(tools_dir)
+    registry.refresh()
+    duplicate = write_manifest(tools_dir, 'utilities', 'copy', id='ping', name='另一个 ping')
+    registry.refresh()
+
+    # 胜出的清单改了 id：原 id 空出，由重复的清单接替
+    winner = write_manifest(tools_dir, 'network', 'ping', id='ping2')
+    registry.refresh([winner])
+    assert registry.manifest_path('ping') == str(duplicate)
+    assert registry.manifest_path('ping2') == str(winner)
+    assert registry.errors() == []
+
+    # 胜出的清单重命名（删除加新建）：仍由它保留该 id，另一份清单继续记为错误
+    renamed = write_manifest(tools_dir, 'network', 'ping3', id='ping', name='改名')
+    registry.refresh([renamed])
+    assert registry.manifest_path('ping') == str(duplicate)
+    moved = tools_dir / 'utilities' / 'moved.json'
+    os.replace(duplicate, moved)
+    registry.refresh([duplicate, moved])
+    assert registry.get('ping')['name'] == '另一个 ping'
+    assert registry.manifest_path('ping') == str(moved)
+    assert [error['path'] for error in registry.errors()] == [str(renamed)]
+
+
+def test_positions_of_added_tools_follow_registry_order(tools_dir):
+    registry = ToolRegistry(tools_dir)
+    registry.refresh()
+    base = registry.version
+    write_manifest(tools_dir, 'audio', 'mixer')
+    write_manifest(tools_dir, 'network', 'arp')
+    delta = registry.refresh()
+    order = [tool['id'] for tool in registry.tools()]
+    assert order == ['mixer', 'arp', 'ping', 'cleaner']
+    assert delta['positions'] == {'mixer': 0, 'arp': 1}
+    assert registry.changes_since(base)['positions'] == {'mixer': 0, 'arp': 1}
+
+    # 页面按下标从小到大插入后，顺序与全量同步一致
+    page = ['ping', 'cleaner']
+    for tool_id, at in sorted(delta['positions'].items(), key=lambda item: item[1]):
+        page.insert(at, tool_id)
+    assert page == order
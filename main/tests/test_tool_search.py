@@ -0,0 +1,110 @@
+# test_tool_search.py - 工具搜索索引
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+import tool_search
+from tool_search import ToolSearchIndex
+
+TOOLS = [
+    {'id': 'cleaner', 'name': '系统清理大师', 'description': '清理垃圾文件', 'category': 'system'},
+    {'id': 'monitor', 'name': '系统监控', 'description': '查看大师级的系统状态', 'category': 'system'},
+    {'id': 'ping', 'name': 'Ping Tool', 'description': '网络延迟测试', 'category': 'network'},
+    {'id': 'pinger', 'name': '批量 Ping', 'description': 'ping many hosts', 'category': 'network'},
+    {'id': 'zip', 'name': '压缩工具', 'description': 'zip archiver', 'category': 'utilities'},
+]
+
+# 测试用的拼音表，不依赖 pypinyin
+SYLLABLES = {'系': 'xi', '统': 'tong', '清': 'qing', '理': 'li', '大': 'da', '师': 'shi', '监': 'jian',
+             '控': 'kong', '批': 'pi', '量': 'liang', '压': 'ya', '缩': 'suo', '工': 'gong', '具': 'ju'}
+
+
+@pytest.fixture
+def index():
+    index = ToolSearchIndex()
+    index.reset(TOOLS)
+    return index
+
+
+@pytest.fixture
+def fake_pinyin(monkeypatch):
+    monkeypatch.setattr(tool_search, '_lazy_pinyin', lambda text: [SYLLABLES.get(ch, ch) for ch in text])
+
+
+def search(index, query, **kwargs):
+    return index.search(query, **kwargs)[0]
+
+
+def test_cjk_single_and_bigram(index):
+    assert sorted(search(index, '系统')) == ['cleaner', 'monitor']
+    assert search(index, '压') == ['zip']
+
+
+def test_cjk_requires_contiguous_text(index):
+    assert search(index, '统清理') == ['cleaner']
+    # "大清"与"清理"两个二元组都命中 split，但"大清理"没有连续出现
+    index.update([{'id': 'split', 'name': '清理', 'description': '大清'}], [])
+    assert search(index, '大清理') == []
+
+
+def test_latin_prefix_and_multiple_segments(index):
+    assert sorted(search(index, 'pin')) == ['ping', 'pinger']
+    assert search(index, 'ping 批量') == ['pinger']
+    assert search(index, 'zi') == ['zip']
+    assert index.search('不存在', limit=5) == ([], 0)
+    assert index.search('   ') == ([], 0)
+
+
+def test_name_weight_and_prefix_bonus(index):
+    # 名称中的词比描述中的得分高；名称以查询开头的工具再加分
+    assert search(index, '大师')[0] == 'cleaner'
+    assert search(index, 'ping') == ['ping', 'pinger']
+
+
+def test_limit_and_total(index):
+    ids, total = index.search('系统', limit=1)
+    assert len(ids) == 1 and total == 2
+
+
+def test_usage_boosts_reorder(index):
+    assert search(index, 'ping', boosts={'pinger': 1.0}) == ['pinger', 'ping']
+    # 不命中的工具不会因为常用而出现
+    assert search(index, 'ping', boosts={'zip': 1.0}) == ['ping', 'pinger']
+
+
+def test_incremental_update_after_build(index):
+    index.build()
+    index.update([{'id': 'zip', 'name': '解压缩', 'description': ''},
+                  {'id': 'disk', 'name': '磁盘清理', 'description': ''}], ['pinger'])
+    assert sorted(search(index, '清理')) == ['cleaner', 'disk']
+    assert search(index, '压缩工具') == []
+    assert search(index, '批量') == []
+    assert len(index) == 5
+
+
+def test_update_before_build(index):
+    index.update([{'id': 'ping', 'name': '网络测速'}], ['zip'])
+    assert search(index, '测速') == ['ping']
+    assert search(index, 'zip') == []
+    assert len(index) == 4
+
+
+def test_pinyin_full_and_initials(index, fake_pinyin):
+    assert search(index, 'xitong') == ['cleaner', 'monitor']
+    assert search(index, 'qingli') == ['cleaner']
+    assert search(index, 'xtql') == ['cleaner']
+    assert search(index, 'yasuo') == ['zip']
+
+
+def test_pypinyin_not_imported_with_module():
+    code = "import sys, tool_search; print('pypinyin' in sys.modules)"
+    result = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True,
+                            cwd=Path(tool_search.__file__).parent, check=True)
+    assert result.stdout.strip() == 'False'
+
+
+def test_real_pypinyin(index):
+    pytest.importorskip('pypinyin')
+    assert search(index, 'xtql') == ['cleaner']
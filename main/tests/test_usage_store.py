@@ -0,0 +1,130 @@
+# test_usage_store.py - 按时间衰减的工具使用频率
+import time
+
+import pytest
+
+from usage_store import UsageTracker
+
+DAY = 86400.0
+
+
+@pytest.fixture
+def journal(tmp_path):
+    return tmp_path / 'usage.journal'
+
+
+def test_score_halves_every_half_life(journal):
+    tracker = UsageTracker(journal, half_life_days=7)
+    now = time.time()
+    tracker.record('ping', when=now)
+    assert tracker.score('ping', now) == pytest.approx(1.0)
+    assert tracker.score('ping', now + 7 * DAY) == pytest.approx(0.5)
+    assert tracker.score('ping', now + 14 * DAY) == pytest.approx(0.25)
+    assert tracker.score('missing', now) == 0.0
+
+
+def test_launches_add_up_and_old_ones_decay(journal):
+    tracker = UsageTracker(journal, half_life_days=7)
+    now = time.time()
+    # 三周前启动 4 次（合计 0.5）不如昨天启动 1 次（约 0.9）
+    for _ in range(4):
+        tracker.record('old', when=now - 21 * DAY)
+    tracker.record('fresh', when=now - DAY)
+    tracker.record('fresh', when=now - DAY)
+    assert tracker.score('old', now) == pytest.approx(0.5)
+    assert tracker.score('fresh', now) == pytest.approx(2 * 2 ** (-1 / 7))
+    assert [tool_id for tool_id, _ in tracker.top(5)] == ['fresh', 'old']
+    assert tracker.stats('old') == {'count': 4, 'last_used': pytest.approx(now - 21 * DAY, abs=1e-3)}
+
+
+def test_top_respects_accept_and_limit(journal):
+    tracker = UsageTracker(journal)
+    now = time.time()
+    for i, tool_id in enumerate(['a', 'b', 'c', 'd']):
+        for _ in range(i + 1):
+            tracker.record(tool_id, when=now)
+    assert [tool_id for tool_id, _ in tracker.top(2)] == ['d', 'c']
+    assert [tool_id for tool_id, _ in tracker.top(2, accept=lambda tool_id: tool_id != 'd')] == ['c', 'b']
+    # 弹出的条目放回堆中，重复查询结果一致
+    assert [tool_id for tool_id, _ in tracker.top(10)] == ['d', 'c', 'b', 'a']
+
+
+def test_heap_stays_correct_after_many_updates(journal):
+    tracker = UsageTracker(journal, compact_threshold=100000)
+    now = time.time()
+    for i in range(500):
+        tracker.record(f"tool_{i % 7}", when=now + i)
+    expected = sorted((f"tool_{i}" for i in range(7)), key=lambda tool_id: -tracker.score(tool_id, now))
+    assert [tool_id for tool_id, _ in tracker.top(7)] == expected
+    assert len(tracker._heap) <= 2 * 7 + 64
+
+
+def test_recent(journal):
+    tracker = UsageTracker(journal)
+    now = time.time()
+    tracker.record('a', when=now - 30)
+    tracker.record('b', when=now - 20)
+    tracker.record('a', when=now - 10)
+    assert [tool_id for tool_id, _ in tracker.recent(5)] == ['a', 'b']
+
+
+def test_boosts_normalized_and_cached(journal):
+    tracker = UsageTracker(journal, half_life_days=7)
+    now = time.time()
+    tracker.record('a', when=now)
+    tracker.record('b', when=now - 7 * DAY)
+    boosts = tracker.boosts()
+    assert boosts == {'a': pytest.approx(1.0), 'b': pytest.approx(0.5)}
+    assert tracker.boosts() is boosts
+    tracker.record('b', when=now)
+    assert tracker.boosts()['b'] == pytest.approx(1.0)
+    assert tracker.boosts()['a'] == pytest.approx(1.0 / 1.5)
+
+
+def test_reload_replays_journal(journal):
+    tracker = UsageTracker(journal)
+    now = time.time()
+    tracker.record('a', when=now - DAY)
+    tracker.record('a', when=now)
+    tracker.record('b', when=now)
+    reloaded = UsageTracker(journal)
+    for tool_id in ('a', 'b'):
+        assert reloaded.score(tool_id, now) == pytest.approx(tracker.score(tool_id, now))
+    assert reloaded.stats('a')['count'] == 2
+
+
+def test_compaction_keeps_scores_and_trims(journal):
+    tracker = UsageTracker(journal, max_tools=3, compact_threshold=1000)
+    now = time.time()
+    for i in range(6):
+        for _ in range(i + 1):
+            tracker.record(f"tool_{i}", when=now - DAY)
+    before = {f"tool_{i}": tracker.score(f"tool_{i}", now) for i in range(6)}
+    tracker.compact()
+    lines = journal.read_text(encoding='utf-8').splitlines()
+    assert len(lines) == 3
+    assert [tool_id for tool_id, _ in tracker.top(10)] == ['tool_5', 'tool_4', 'tool_3']
+
+    reloaded = UsageTracker(journal)
+    for tool_id in ('tool_5', 'tool_4', 'tool_3'):
+        assert reloaded.score(tool_id, now) == pytest.approx(before[tool_id])
+        assert reloaded.stats(tool_id)['count'] == int(tool_id[-1]) + 1
+    assert reloaded.score('tool_0', now) == 0.0
+
+
+def test_compaction_triggered_by_journal_growth(journal):
+    tracker = UsageTracker(journal, compact_threshold=4)
+    for _ in range(10):
+        tracker.record('a')
+    deadline = time.monotonic() + 5
+    while time.monotonic() < deadline and len(journal.read_text(encoding='utf-8').splitlines()) > 5:
+        time.sleep(0.01)
+    assert len(journal.read_text(encoding='utf-8').splitlines()) <= 5
+    assert UsageTracker(journal).stats('a')['count'] == 10
+
+
+def test_torn_last_line_is_ignored(journal):
+    journal.write_text('{"id": "a", "t": 1700000000.0}\n{"id": "b", "t', encoding='utf-8')
+    tracker = UsageTracker(journal)
+    assert tracker.stats('a')['count'] == 1
+    assert tracker.stats('b') is None
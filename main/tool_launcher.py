@@ -0,0 +1,421 @@
+# tool_launcher.py - 工具进程的启动与监管
+import functools
+import itertools
+import json
+import os
+import shutil
+import subprocess
+import sys
+import threading
+import time
+from collections import deque
+from pathlib import Path
+
+from tool_output import OutputBroadcaster, OutputRing, pump_stream
+
+IS_WINDOWS = sys.platform == 'win32'
+
+# 运行状态
+STATUS_STARTING = 'starting'
+STATUS_RUNNING = 'running'
+STATUS_EXITED = 'exited'
+STATUS_STOPPED = 'stopped'
+STATUS_FAILED = 'failed'
+
+
+class LaunchError(Exception):
+    """工具无法启动（找不到程序、超出并发上限等），消息可直接展示给用户"""
+
+
+@functools.lru_cache(maxsize=None)
+def is_admin():
+    """当前进程是否具有管理员/root 权限（进程生命周期内不会变化，只检查一次）"""
+    if IS_WINDOWS:
+        try:
+            import ctypes
+            return bool(ctypes.windll.shell32.IsUserAnAdmin())
+        except Exception:
+            return False
+    return hasattr(os, 'geteuid') and os.geteuid() == 0
+
+
+def resolve_executable(tool, manifest_path=None):
+    """根据清单的 executable 字段找到可执行文件
+
+    依次查找：绝对路径、清单所在目录、清单目录下以工具 id 命名的子目录、PATH。
+    """
+    executable = tool.get('executable')
+    if not executable:
+        raise LaunchError(f"工具 {tool.get('id')} 未声明 executable")
+
+    candidate = Path(executable)
+    if candidate.is_absolute():
+        if candidate.is_file():
+            return candidate
+        raise LaunchError(f"找不到工具程序: {executable}")
+
+    if manifest_path is not None:
+        manifest_dir = Path(manifest_path).parent
+        for base in (manifest_dir, manifest_dir / str(tool.get('id', ''))):
+            path = base / executable
+            if path.is_file():
+                return path
+
+    found = shutil.which(executable)
+    if found:
+        return Path(found)
+    raise LaunchError(f"找不到工具程序: {executable}")
+
+
+def build_command(executable, args=None):
+    """按文件类型构造命令行（脚本交给对应的解释器）"""
+    executable = Path(executable)
+    suffix = executable.suffix.lower()
+    args = list(args or [])
+    if suffix == '.py':
+        return [sys.executable, str(executable)] + args
+    if IS_WINDOWS and suffix in ('.bat', '.cmd'):
+        return ['cmd.exe', '/c', str(executable)] + args
+    if IS_WINDOWS and suffix == '.ps1':
+        return ['powershell.exe', '-NoProfile', '-ExecutionPolicy', 'Bypass', '-File', str(executable)] + args
+    if not IS_WINDOWS and suffix == '.sh' and not os.access(executable, os.X_OK):
+        return ['/bin/sh', str(executable)] + args
+    return [str(executable)] + args
+
+
+def popen_options(capture):
+    """启动工具进程时与平台相关的 Popen 参数（预热进程与普通启动共用）"""
+    if IS_WINDOWS:
+        # 捕获输出时不弹出控制台窗口；否则控制台工具在独立窗口中运行
+        console = subprocess.CREATE_NO_WINDOW if capture else subprocess.CREATE_NEW_CONSOLE
+        return {'creationflags': console | subprocess.CREATE_NEW_PROCESS_GROUP}
+    return {'start_new_session': True}
+
+
+class LaunchPlan:
+    """预先解析好的启动参数：程序路径、命令行、工作目录、环境变量与提权需求"""
+
+    __slots__ = ('tool_id', 'source', 'command', 'cwd', 'env', 'requires_admin', 'elevate', 'capture')
+
+    def __init__(self, tool_id, source, command, cwd, env, requires_admin, elevate, capture):
+        self.tool_id = tool_id
+        self.source = source        # 生成计划时的工具数据，注册表替换后计划即过期
+        self.command = command
+        self.cwd = cwd
+        self.env = env              # None 表示继承工具箱的环境变量
+        self.requires_admin = requires_admin
+        self.elevate = elevate      # 需要通过 UAC 提权启动
+        self.capture = capture
+
+    @property
+    def is_python(self):
+        return len(self.command) >= 2 and self.command[0] == sys.executable and self.command[1].endswith('.py')
+
+
+def make_plan(tool, manifest_path=None):
+    """解析工具的启动参数，找不到程序时抛出 LaunchError"""
+    executable = resolve_executable(tool, manifest_path)
+    command = build_command(executable)
+    requires_admin = bool(tool.get('requires_admin'))
+    # 提权启动的进程与工具箱不在同一会话，无法重定向输出
+    elevate = requires_admin and IS_WINDOWS and not is_admin()
+    capture = bool(tool.get('capture_output', True)) and not elevate
+
+    overrides = {str(k): str(v) for k, v in (tool.get('env') or {}).items()}
+    if capture and command[0] == sys.executable:
+        # 输出接到管道时 Python 默认整块缓冲，关闭缓冲才能及时看到第一行输出
+        overrides.setdefault('PYTHONUNBUFFERED', '1')
+    env = dict(os.environ, **overrides) if overrides else None
+    return LaunchPlan(tool.get('id'), tool, command, str(executable.parent), env,
+                      requires_admin, elevate, capture)
+
+
+class ToolRun:
+    """一次工具运行的记录"""
+
+    def __init__(self, run_id, tool_id, command, cwd, output=None, env=None):
+        self.run_id = run_id
+        self.tool_id = tool_id
+        self.command = command
+        self.cwd = cwd
+        self.env = env
+        self.output = output       # OutputRing，不捕获输出时为 None
+        self._readers = []
+        self.launch_clock = time.perf_counter()
+        self.first_output_latency = None   # 从请求启动到第一段输出的秒数
+        self.warm = False          # 由预热进程接管启动
+        self.pid = None
+        self.status = STATUS_STARTING
+        self.exit_code = None
+        self.start_time = time.time()
+        self.end_time = None
+        self.elevated = False
+        self.process = None        # subprocess.Popen 或 psutil.Process（提权启动时）
+        self.stop_requested = False
+
+    def to_dict(self):
+        return {
+            'run_id': self.run_id,
+            'tool_id': self.tool_id,
+            'pid': self.pid,
+            'status': self.status,
+            'exit_code': self.exit_code,
+            'start_time': self.start_time,
+            'end_time': self.end_time,
+            'elevated': self.elevated,
+            'captures_output': self.output is not None,
+            'warm': self.warm,
+            'first_output_ms': (round(self.first_output_latency * 1000, 1)
+                                if self.first_output_latency is not None else None),
+        }
+
+
+class ToolLauncher:
+    """启动工具进程，跟踪运行中的实例并限制同时运行的数量"""
+
+    def __init__(self, max_running=4, history_size=50, output_capacity=256 * 1024, output_sink=None,
+                 planner=None):
+        self.max_running = max(1, int(max_running))
+        # planner 提供缓存的启动计划与预热进程（见 launch_planner.py），为空时每次现场解析
+        self.planner = planner
+        self.output_capacity = output_capacity
+        # output_sink 接收批量输出 [{run_id, offset, next_offset, text, ...}]
+        self._broadcaster = OutputBroadcaster(output_sink) if output_sink is not None else None
+        self._runs = {}                              # run_id -> 运行中的 ToolRun
+        self._history = deque(maxlen=history_size)   # 已结束的 ToolRun
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def launch(self, tool, manifest_path=None, args=None):
+        """启动工具，立即返回运行记录；进程退出由后台线程回收"""
+        if tool.get('status', 'on') != 'on':
+            raise LaunchError(f"工具 {tool.get('name', tool.get('id'))} 暂不可用")
+        plan = self.planner.plan(tool, manifest_path) if self.planner is not None else make_plan(tool, manifest_path)
+        command = plan.command + list(args or [])
+
+        with self._lock:
+            if len(self._runs) >= self.max_running:
+                raise LaunchError(f"同时运行的工具已达上限（{self.max_running} 个）")
+            output = OutputRing(self.output_capacity) if plan.capture else None
+            run = ToolRun(next(self._ids), plan.tool_id, command, plan.cwd, output, plan.env)
+            self._runs[run.run_id] = run
+        if output is not None:
+            output.on_first_write = lambda clock: self._on_first_output(run, clock)
+
+        if plan.elevate:
+            # UAC 确认框会一直等待用户操作，放到后台线程中，调用方立即返回
+            threading.Thread(target=self._spawn_and_supervise, args=(run, self._spawn_elevated),
+                             name=f"tool-run-{run.run_id}", daemon=True).start()
+            return run
+
+        if plan.requires_admin and not is_admin():
+            # 非 Windows 平台不做提权，按普通权限运行
+            print(f"⚠️  工具 {run.tool_id} 需要管理员权限，当前以普通权限运行")
+        # 只有不带额外参数的启动才能交给预热进程（预热时命令行已固定）
+        helper = self.planner.take_helper(plan) if self.planner is not None and not args else None
+        try:
+            self._spawn(run, helper)
+        except Exception as e:
+            self._finish(run, STATUS_FAILED)
+            if self.planner is not None:
+                # 程序可能已被移动或删除，下次启动时重新解析
+                self.planner.invalidate(plan.tool_id)
+            raise LaunchError(f"启动失败: {e}")
+        threading.Thread(target=self._supervise, args=(run,),
+                         name=f"tool-run-{run.run_id}", daemon=True).start()
+        return run
+
+    def _spawn_and_supervise(self, run, spawn):
+        try:
+            spawn(run)
+        except Exception as e:
+            print(f"❌ 启动工具失败 {run.tool_id}: {e}")
+            self._finish(run, STATUS_FAILED)
+            return
+        self._supervise(run)
+
+    def _spawn(self, run, helper=None):
+        if helper is not None and self._hand_over(run, helper):
+            run.process = helper
+            run.warm = True
+        else:
+            stream = subprocess.PIPE if run.output is not None else subprocess.DEVNULL
+            run.process = subprocess.Popen(
+                run.command,
+                cwd=run.cwd,
+                env=run.env,
+                stdin=subprocess.DEVNULL,
+                stdout=stream,
+                stderr=stream,
+                **popen_options(run.output is not None)
+            )
+        run.pid = run.process.pid
+        run.status = STATUS_RUNNING
+        if run.output is not None:
+            # stdout 与 stderr 各由一个线程读取，按到达顺序写入同一个缓冲区
+            for pipe in (run.process.stdout, run.process.stderr):
+                reader = threading.Thread(target=pump_stream, args=(pipe, run.output),
+                                          name=f"tool-output-{run.run_id}", daemon=True)
+                reader.start()
+                run._readers.append(reader)
+            if self._broadcaster is not None:
+                self._broadcaster.track(run.run_id, run.output)
+
+    @staticmethod
+    def _hand_over(run, helper):
+        """把脚本路径和参数交给已启动的预热进程；进程已退出时返回 False"""
+        try:
+            helper.stdin.write(json.dumps(run.command[1:]).encode('utf-8') + b'\n')
+            helper.stdin.close()
+            return True
+        except (OSError, ValueError):
+            helper.kill()
+            return False
+
+    def _on_first_output(self, run, clock):
+        run.first_output_latency = clock - run.launch_clock
+        if self.planner is not None:
+            self.planner.record_latency(run.tool_id, run.first_output_latency, run.warm)
+
+    def _spawn_elevated(self, run):
+        """通过 UAC 提权启动（仅 Windows），并取回新进程的 PID 以便跟踪"""
+        def quote(text):
+            return "'" + str(text).replace("'", "''") + "'"
+        quoted_args = ','.join(quote(arg) for arg in run.command[1:])
+        script = (f"$p = Start-Process -FilePath {quote(run.command[0])} -Verb RunAs -PassThru "
+                  f"-WorkingDirectory {quote(run.cwd)}" + (f" -ArgumentList {quoted_args}" if quoted_args else '')
+                  + "; $p.Id")
+        result = subprocess.run(
+            ['powershell.exe', '-NoProfile', '-NonInteractive', '-Command', script],
+            capture_output=True, text=True, creationflags=subprocess.CREATE_NO_WINDOW,
+        )
+        if result.returncode != 0 or not result.stdout.strip().isdigit():
+            raise LaunchError("已取消提权或提权启动失败")
+        run.pid = int(result.stdout.strip())
+        run.elevated = True
+        run.status = STATUS_RUNNING
+        import psutil
+        try:
+            run.process = psutil.Process(run.pid)
+        except psutil.NoSuchProcess:
+            run.process = None
+
+    def _supervise(self, run):
+        import psutil  # 启动工具时才需要，不在模块加载时导入
+        try:
+            if isinstance(run.process, subprocess.Popen):
+                run.exit_code = run.process.wait()
+            elif run.process is not None:
+                # 非子进程只能等待结束，拿不到退出码
+                run.process.wait()
+        except psutil.NoSuchProcess:
+            pass
+        except Exception as e:
+            print(f"⚠️  监视工具进程失败 {run.tool_id}: {e}")
+        # 等待读取线程收完剩余输出（子进程可能还持有管道，不无限等待）
+        for reader in run._readers:
+            reader.join(timeout=1.0)
+        self._finish(run, STATUS_STOPPED if run.stop_requested else STATUS_EXITED)
+
+    def _finish(self, run, status):
+        with self._lock:
+            if self._runs.pop(run.run_id, None) is None:
+                return
+            run.status = status
+            run.end_time = time.time()
+            self._history.append(run)
+        if run.output is not None:
+            run.output.close()
+
+    def read_output(self, run_id, offset=0, limit=64 * 1024):
+        """按偏移量分页读取某次运行的输出，找不到运行记录时返回 None"""
+        run = self.get_run(run_id)
+        if run is None or run.output is None:
+            return None
+        text, start, next_offset = run.output.read(offset, limit)
+        return {
+            'text': text,
+            'offset': start,
+            'next_offset': next_offset,
+            'truncated': start > offset,  # 请求的位置已被覆盖
+            'end': run.output.end,
+            'finished': run.status not in (STATUS_STARTING, STATUS_RUNNING),
+        }
+
+    def list_runs(self, include_finished=False):
+        """运行中的工具（可选包含最近结束的）"""
+        with self._lock:
+            runs = list(self._runs.values())
+            if include_finished:
+                runs += list(self._history)
+        return [run.to_dict() for run in sorted(runs, key=lambda r: r.run_id)]
+
+    def get_run(self, run_id):
+        with self._lock:
+            run = self._runs.get(run_id)
+            if run is None:
+                run = next((r for r in self._history if r.run_id == run_id), None)
+        return run
+
+    def stop(self, run_id, timeout=3.0):
+        """结束一次运行（连同其子进程）：立即发送终止信号，超时未退出的由后台线程强制结束
+
+        不等待进程退出；退出后运行状态变为 stopped，捕获输出的运行会经输出推送告知界面。
+        返回 False 表示无法结束（仍在等待提权确认或权限不足）。
+        """
+        with self._lock:
+            run = self._runs.get(run_id)
+        if run is None:
+            return False
+        processes = self._terminate(run)
+        if processes is None:
+            return False
+        if processes:
+            threading.Thread(target=self._reap, args=(processes, timeout),
+                             name=f"tool-stop-{run.run_id}", daemon=True).start()
+        return True
+
+    def stop_all(self, timeout=3.0):
+        """结束全部运行并等待它们退出（工具箱关闭时调用，不留下孤儿进程）"""
+        with self._lock:
+            runs = list(self._runs.values())
+        processes = []
+        for run in runs:
+            processes += self._terminate(run) or []
+        if processes:
+            self._reap(processes, timeout)
+
+    @staticmethod
+    def _terminate(run):
+        """向运行的进程树发送终止信号，返回这些进程；无法结束时返回 None"""
+        if run.pid is None:
+            return None  # 仍在等待提权确认
+        run.stop_requested = True
+        import psutil
+        try:
+            parent = psutil.Process(run.pid)
+            processes = parent.children(recursive=True) + [parent]
+        except psutil.NoSuchProcess:
+            return []
+        except psutil.AccessDenied:
+            # 提权启动的进程无法由普通权限结束
+            return None
+        for process in processes:
+            try:
+                process.terminate()
+            except psutil.NoSuchProcess:
+                pass
+            except psutil.AccessDenied:
+                return None
+        return processes
+
+    @staticmethod
+    def _reap(processes, timeout):
+        """等待进程退出，超时后强制结束"""
+        import psutil
+        _, alive = psutil.wait_procs(processes, timeout=timeout)
+        for process in alive:
+            try:
+                process.kill()
+            except psutil.Error:
+                pass
@@ -0,0 +1,166 @@
+# tool_output.py - 工具输出的环形缓冲与批量推送
+import codecs
+import locale
+import threading
+import time
+from collections import deque
+
+
+class OutputRing:
+    """固定容量的文本环形缓冲区
+
+    偏移量是自进程启动以来的绝对字符数，超出容量的旧内容被丢弃；
+    读取方凭偏移量分页，落后太多时从仍保留的最早位置开始。
+    """
+
+    def __init__(self, capacity=256 * 1024):
+        self.capacity = max(1024, int(capacity))
+        self._chunks = deque()
+        self._size = 0       # 当前保留的字符数
+        self.start = 0       # 保留内容的起始偏移
+        self.end = 0         # 已写入的总字符数
+        self.closed = False
+        # 第一次写入时以 time.perf_counter() 的时刻调用，用于统计启动到首次输出的延迟
+        self.on_first_write = None
+        self._lock = threading.Lock()
+
+    def write(self, text):
+        if not text:
+            return
+        callback = None
+        with self._lock:
+            if self.on_first_write is not None:
+                callback, self.on_first_write = self.on_first_write, None
+                clock = time.perf_counter()
+            self._append(text)
+        if callback is not None:
+            callback(clock)
+
+    def _append(self, text):
+        """调用方需持有锁"""
+        if len(text) > self.capacity:
+            # 单次写入就超过容量：只保留末尾部分
+            self.start = self.end + len(text) - self.capacity
+            self.end += len(text)
+            self._chunks = deque([text[-self.capacity:]])
+            self._size = self.capacity
+            return
+        self._chunks.append(text)
+        self._size += len(text)
+        self.end += len(text)
+        while self._size > self.capacity:
+            overflow = self._size - self.capacity
+            head = self._chunks[0]
+            if len(head) <= overflow:
+                self._chunks.popleft()
+                self._size -= len(head)
+                self.start += len(head)
+            else:
+                self._chunks[0] = head[overflow:]
+                self._size -= overflow
+                self.start += overflow
+
+    def read(self, offset=0, limit=64 * 1024):
+        """从 offset 开始读取最多 limit 个字符，返回 (文本, 实际起始偏移, 下一偏移)"""
+        with self._lock:
+            offset = min(max(offset, self.start), self.end)
+            skip = offset - self.start
+            remaining = min(limit, self.end - offset)
+            parts = []
+            for chunk in self._chunks:
+                if remaining <= 0:
+                    break
+                if skip >= len(chunk):
+                    skip -= len(chunk)
+                    continue
+                piece = chunk[skip:skip + remaining]
+                parts.append(piece)
+                remaining -= len(piece)
+                skip = 0
+            text = ''.join(parts)
+            return text, offset, offset + len(text)
+
+    def close(self):
+        self.closed = True
+
+
+def output_encoding():
+    """子进程输出的编码（中文 Windows 控制台程序通常为 GBK）"""
+    return locale.getpreferredencoding(False) or 'utf-8'
+
+
+def pump_stream(stream, ring, encoding=None, chunk_size=4096):
+    """在后台线程中持续读取管道并写入环形缓冲区，直到 EOF"""
+    decoder = codecs.getincrementaldecoder(encoding or output_encoding())(errors='replace')
+    try:
+        read = getattr(stream, 'read1', stream.read)
+        while True:
+            data = read(chunk_size)
+            if not data:
+                break
+            ring.write(decoder.decode(data))
+        ring.write(decoder.decode(b'', final=True))
+    except (OSError, ValueError):
+        pass
+    finally:
+        try:
+            stream.close()
+        except OSError:
+            pass
+
+
+class OutputBroadcaster:
+    """定期把各次运行的新输出合并成一批推送给界面，避免逐行调用 evaluate_js"""
+
+    def __init__(self, sink, interval=0.1, max_chunk=16 * 1024):
+        self.sink = sink
+        self.interval = float(interval)
+        self.max_chunk = int(max_chunk)
+        self._rings = {}     # run_id -> OutputRing
+        self._pushed = {}    # run_id -> 已推送到的偏移
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def track(self, run_id, ring):
+        with self._lock:
+            self._rings[run_id] = ring
+            self._pushed[run_id] = 0
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="tool-output", daemon=True)
+                self._thread.start()
+
+    def _collect(self):
+        batch = []
+        with self._lock:
+            for run_id, ring in list(self._rings.items()):
+                pushed = self._pushed[run_id]
+                if ring.end > pushed:
+                    # 界面落后太多时只推送最新的一段，其余可通过分页接口读取
+                    start = max(pushed, ring.end - self.max_chunk)
+                    text, offset, next_offset = ring.read(start, self.max_chunk)
+                    batch.append({'run_id': run_id, 'offset': offset, 'next_offset': next_offset,
+                                  'skipped': offset > pushed, 'text': text})
+                    self._pushed[run_id] = next_offset
+                elif ring.closed:
+                    del self._rings[run_id]
+                    del self._pushed[run_id]
+                    batch.append({'run_id': run_id, 'offset': ring.end, 'next_offset': ring.end,
+                                  'skipped': False, 'text': '', 'finished': True})
+            idle = not self._rings
+        return batch, idle
+
+    def _run(self):
+        while True:
+            # 每个间隔最多推送一次，期间的输出合并为一批
+            time.sleep(self.interval)
+            batch, idle = self._collect()
+            if batch:
+                try:
+                    self.sink(batch)
+                except Exception as e:
+                    print(f"⚠️  推送工具输出失败: {e}")
+            if idle:
+                with self._lock:
+                    if not self._rings:
+                        self._thread = None
+                        return
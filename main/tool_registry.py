@@ -0,0 +1,359 @@
+# tool_registry.py - 增量工具注册表
+import marshal
+import os
+import sys
+import threading
+from pathlib import Path
+
+from utils import ensure_tools_dir, load_tool_manifests
+
+# 索引文件格式版本，结构变化时递增
+INDEX_FORMAT = 1
+
+# 最多保留的删除记录数，更早的客户端需要全量同步
+MAX_TOMBSTONES = 4096
+
+
+class ManifestEntry:
+    """一个工具清单文件的解析结果及其文件状态"""
+
+    __slots__ = ('path', 'category', 'mtime_ns', 'size', 'tool')
+
+    def __init__(self, path, category, mtime_ns, size, tool):
+        self.path = path
+        self.category = category
+        self.mtime_ns = mtime_ns
+        self.size = size
+        self.tool = tool
+
+    def matches(self, stat_result):
+        return self.mtime_ns == stat_result.st_mtime_ns and self.size == stat_result.st_size
+
+
+class ToolRegistry:
+    """常驻内存的工具注册表，只重新解析新增、修改或删除的清单文件"""
+
+    def __init__(self, tools_dir, index_path=None, max_workers=8, overlay=None):
+        self.tools_dir = Path(tools_dir)
+        self.max_workers = max_workers
+        # 覆盖层：对每个解析出的工具调用一次，用于叠加用户状态（如收藏）
+        self.overlay = overlay
+        # 磁盘索引：保存全部解析结果及 mtime/size，冷启动时免去逐个读取 JSON
+        self.index_path = Path(index_path) if index_path else None
+        self._entries = {}  # 相对路径 -> ManifestEntry
+        self._by_id = {}    # 工具 id -> ManifestEntry
+        self._errors = {}   # 相对路径 -> ((mtime_ns, size), 错误信息)
+        self._shadowed = {} # 因 id 重复未加载的清单：相对路径 -> 工具 id
+        self._sorted = None
+        # 版本号：每次内容变化递增，供前端按版本增量同步
+        self.version = 0
+        self._stamps = {}      # 工具 id -> [加入时的版本, 最后修改的版本]
+        self._tombstones = {}  # 已删除工具 id -> 删除时的版本（按删除顺序）
+        self._horizon = 0      # 早于此版本的客户端无法增量同步
+        self._lock = threading.RLock()
+        self._refresh_lock = threading.Lock()
+        if self.index_path is not None:
+            self.load_index()
+
+    def load_index(self):
+        """从磁盘索引恢复条目，之后的 refresh 只会重新解析过期的文件"""
+        try:
+            with open(self.index_path, 'rb') as f:
+                data = marshal.loads(f.read())
+        except FileNotFoundError:
+            return False
+        except Exception as e:
+            print(f"⚠️  工具索引损坏，将重新建立: {e}")
+            return False
+
+        if (not isinstance(data, dict) or data.get('format') != INDEX_FORMAT
+                or data.get('python') != sys.version_info[:2]):
+            return False
+
+        # 条目以相对路径为键，工具目录整体移动（如U盘盘符变化）后索引仍然有效
+        with self._lock:
+            self._entries = {}
+            self._by_id = {}
+            prefix = str(self.tools_dir) + os.sep
+            for key, (category, mtime_ns, size, tool) in data['entries'].items():
+                path = prefix + key.replace('/', os.sep)
+                if self.overlay is not None:
+                    tool = self.overlay(tool)
+                entry = ManifestEntry(path, category, mtime_ns, size, tool)
+                self._entries[key] = entry
+                self._by_id.setdefault(tool.get('id'), entry)
+            self._sorted = None
+            self.version += 1
+            self._stamps = {tool_id: [self.version, self.version] for tool_id in self._by_id}
+            self._tombstones = {}
+            self._horizon = self.version
+        return True
+
+    def save_index(self):
+        """原子地写入磁盘索引"""
+        if self.index_path is None:
+            return False
+        with self._lock:
+            data = {
+                'format': INDEX_FORMAT,
+                'python': sys.version_info[:2],
+                'entries': {
+                    key: (entry.category, entry.mtime_ns, entry.size, entry.tool)
+                    for key, entry in self._entries.items()
+                },
+            }
+            payload = marshal.dumps(data)
+        tmp_path = self.index_path.with_name(self.index_path.name + '.tmp')
+        try:
+            with open(tmp_path, 'wb') as f:
+                f.write(payload)
+            os.replace(tmp_path, self.index_path)
+            return True
+        except Exception as e:
+            print(f"⚠️  保存工具索引失败: {e}")
+            return False
+
+    def _key(self, path):
+        return Path(path).relative_to(self.tools_dir).as_posix()
+
+    def _stat_all(self):
+        """遍历目录，只做 stat 不读文件"""
+        found = {}
+        try:
+            with os.scandir(self.tools_dir) as categories:
+                for category_dir in categories:
+                    if not category_dir.is_dir():
+                        continue
+                    with os.scandir(category_dir.path) as files:
+                        for entry in files:
+                            if entry.name.endswith('.json') and entry.is_file():
+                                key = f"{category_dir.name}/{entry.name}"
+                                found[key] = (entry.path, category_dir.name, entry.stat())
+        except OSError as e:
+            print(f"⚠️  扫描工具失败: {e}")
+        return found
+
+    def _stat_paths(self, paths):
+        """只检查给定的文件（供文件监视器使用）"""
+        found = {}
+        for path in paths:
+            path = Path(path)
+            try:
+                key = self._key(path)
+            except ValueError:
+                continue
+            if len(Path(key).parts) != 2 or path.suffix != '.json':
+                continue
+            try:
+                found[key] = (str(path), path.parent.name, path.stat())
+            except OSError:
+                found[key] = None  # 文件已删除
+        return found
+
+    def refresh(self, paths=None):
+        """刷新注册表，返回变化：{'added': [...], 'updated': [...], 'removed': [...]}
+
+        有变化时另含 'from_version' 与 'version'：这组变化把注册表从前者带到后者；
+        以及 'positions'：新增工具在 tools() 中的下标。
+
+        paths 为空时遍历整个目录（仅 stat）；给定 paths 时只检查这些文件。
+        两种方式都只解析发生变化的文件。
+        """
+        with self._refresh_lock:
+            if paths is None:
+                ensure_tools_dir(self.tools_dir)
+                found = self._stat_all()
+            else:
+                found = self._stat_paths(paths)
+            delta = self._apply(found, full=paths is None)
+            # 胜出的清单被删除、改名或改了 id 后，被它遮蔽的同 id 清单接替（监视器只给出变化的路径）
+            with self._lock:
+                orphaned = [self.tools_dir / key for key, tool_id in self._shadowed.items()
+                            if tool_id not in self._by_id]
+            if orphaned:
+                delta = self._merge_deltas(delta, self._apply(self._stat_paths(orphaned), full=False))
+            return delta
+
+    def _merge_deltas(self, first, second):
+        """合并两次连续的 _apply 结果"""
+        if 'version' not in second:
+            return first
+        if 'version' not in first:
+            return second
+        merged = {name: first[name] + second[name] for name in ('added', 'updated', 'removed')}
+        merged['from_version'] = first['from_version']
+        merged['version'] = second['version']
+        with self._lock:
+            merged['positions'] = self._positions(merged['added'])
+        return merged
+
+    def errors(self):
+        """当前无法加载的清单（含 id 与其他清单重复的）：[{'path', 'category', 'error'}, ...]"""
+        with self._lock:
+            return [dict(self._errors[key][1]) for key in sorted(self._errors)]
+
+    def _is_current(self, key, stat_result):
+        entry = self._entries.get(key)
+        if entry is not None and entry.matches(stat_result):
+            return True
+        # 解析失败且文件未再修改的清单不重复解析
+        # id 重复的清单记录为 None，每次都重新检查，另一份清单删除后即可恢复
+        failed = self._errors.get(key)
+        return failed is not None and failed[0] == (stat_result.st_mtime_ns, stat_result.st_size)
+
+    def _apply(self, found, full):
+        delta = {'added': [], 'updated': [], 'removed': []}
+        with self._lock:
+            known = set(self._entries) | set(self._errors)
+            removed_keys = known - set(found) if full else set()
+            removed_keys.update(key for key, info in found.items() if info is None and key in known)
+            stale = [(key, info) for key, info in sorted(found.items(), key=lambda kv: kv[0].split('/'))
+                     if info is not None and not self._is_current(key, info[2])]
+
+        # 解析在锁外并行进行，读取方（tools/get）不会被阻塞
+        results, load_errors = load_tool_manifests([(info[0], info[1]) for _, info in stale],
+                                                   max_workers=self.max_workers)
+        errors_by_path = {error['path']: error for error in load_errors}
+
+        with self._lock:
+            version = self.version + 1
+            for key in sorted(removed_keys):
+                self._errors.pop(key, None)
+                self._shadowed.pop(key, None)
+                if key in self._entries:
+                    delta['removed'].append(self._remove(key, version))
+            for (key, (path, category, stat_result)), tool in zip(stale, results):
+                old = self._entries.get(key)
+                if tool is None:
+                    # 解析失败的清单视为不可用，记录错误直到文件被修复
+                    self._shadowed.pop(key, None)
+                    self._errors[key] = ((stat_result.st_mtime_ns, stat_result.st_size),
+                                         errors_by_path[str(path)])
+                    if old is not None:
+                        delta['removed'].append(self._remove(key, version))
+                    continue
+                self._errors.pop(key, None)
+                self._shadowed.pop(key, None)
+                if self.overlay is not None:
+                    tool = self.overlay(tool)
+                tool_id = tool.get('id')
+                owner = self._by_id.get(tool_id)
+                if owner is not None and owner is not old:
+                    # 与其他清单的 id 重复：保留先加载的工具，这份清单记为错误
+                    self._errors[key] = (None, {
+                        'path': str(path), 'category': category,
+                        'error': f"工具 id 重复: {tool_id}（已由 {self._key(owner.path)} 定义）",
+                    })
+                    self._shadowed[key] = tool_id
+                    if old is not None:
+                        delta['removed'].append(self._remove(key, version))
+                    continue
+                if old is not None and old.tool.get('id') != tool_id:
+                    # 清单中的 id 被修改：按删除旧工具、新增新工具处理
+                    delta['removed'].append(self._remove(key, version))
+                    old = None
+                entry = ManifestEntry(path, category, stat_result.st_mtime_ns, stat_result.st_size, tool)
+                self._entries[key] = entry
+                self._by_id[tool_id] = entry
+                self._stamp(tool_id, version, created=old is None)
+                delta['updated' if old is not None else 'added'].append(tool)
+
+            if any(delta.values()):
+                self._sorted = None
+                # 增量对应的版本区间，页面只在自己处于 from_version 时直接应用
+                delta['from_version'] = self.version
+                delta['version'] = self.version = version
+                delta['positions'] = self._positions(delta['added'])
+        if 'version' in delta:
+            self.save_index()
+        return delta
+
+    def _remove(self, key, version):
+        entry = self._entries.pop(key)
+        tool = entry.tool
+        tool_id = tool.get('id')
+        if self._by_id.get(tool_id) is entry:
+            del self._by_id[tool_id]
+            self._stamps.pop(tool_id, None)
+            self._tombstones.pop(tool_id, None)
+            self._tombstones[tool_id] = version
+            if len(self._tombstones) > MAX_TOMBSTONES:
+                oldest = next(iter(self._tombstones))
+                self._horizon = self._tombstones.pop(oldest)
+        return tool
+
+    def _stamp(self, tool_id, version, created):
+        if created or tool_id not in self._stamps:
+            self._stamps[tool_id] = [version, version]
+            self._tombstones.pop(tool_id, None)
+        else:
+            self._stamps[tool_id][1] = version
+
+    def manifest_path(self, tool_id):
+        """工具清单文件的路径（用于解析相对的 executable）"""
+        with self._lock:
+            entry = self._by_id.get(tool_id)
+            return entry.path if entry is not None else None
+
+    def tool_paths(self):
+        """全部工具及其清单路径：[(工具数据, 清单路径), ...]"""
+        with self._lock:
+            return [(entry.tool, entry.path) for entry in self._entries.values()]
+
+    def touch(self, tool_id):
+        """工具数据在内存中被修改（如切换收藏）后调用，使版本号前进"""
+        with self._lock:
+            if tool_id not in self._by_id:
+                return self.version
+            self.version += 1
+            self._stamp(tool_id, self.version, created=False)
+            return self.version
+
+    def changes_since(self, version):
+        """返回自 version 以来的变化
+
+        - 没有变化：{'version': v, 'unchanged': True}
+        - 可以增量：{'version': v, 'added': [...], 'updated': [...], 'removed': [id, ...],
+          'positions': {新增工具 id: 在 tools() 中的下标}}
+        - 版本过旧或未知：{'version': v, 'full': True, 'tools': [...]}
+        """
+        with self._lock:
+            if version == self.version:
+                return {'version': self.version, 'unchanged': True}
+            if version is None or version < self._horizon or version > self.version:
+                return {'version': self.version, 'full': True, 'tools': self.tools()}
+
+            added, updated = [], []
+            for tool in self.tools():
+                created, modified = self._stamps[tool.get('id')]
+                if created > version:
+                    added.append(tool)
+                elif modified > version:
+                    updated.append(tool)
+            removed = [tool_id for tool_id, removed_at in self._tombstones.items() if removed_at > version]
+            return {'version': self.version, 'added': added, 'updated': updated, 'removed': removed,
+                    'positions': self._positions(added)}
+
+    def _positions(self, tools):
+        """工具在 tools() 排序中的下标，页面按此插入新增的工具，顺序与全量同步一致；调用方需持有锁"""
+        if not tools:
+            return {}
+        wanted = {tool.get('id') for tool in tools}
+        return {tool.get('id'): i for i, tool in enumerate(self.tools()) if tool.get('id') in wanted}
+
+    def tools(self):
+        """按（分类, 文件名）排序的工具列表"""
+        with self._lock:
+            if self._sorted is None:
+                self._sorted = [self._entries[key].tool
+                                for key in sorted(self._entries, key=lambda k: k.split('/'))]
+            return list(self._sorted)
+
+    def get(self, tool_id):
+        """按 id 查找工具"""
+        with self._lock:
+            entry = self._by_id.get(tool_id)
+            return entry.tool if entry is not None else None
+
+    def __len__(self):
+        return len(self._entries)
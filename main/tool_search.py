@@ -0,0 +1,286 @@
+# tool_search.py - 工具搜索索引：中文单字与二元组、拉丁词前缀、拼音全拼与首字母
+#
+# 拼音匹配需要 pypinyin（pip install pypinyin），未安装时只按文字匹配。
+# pypinyin 导入时要加载词典，放到第一次建立索引时才导入，不占用启动时间。
+import bisect
+import heapq
+import re
+import threading
+
+# pypinyin.lazy_pinyin，尚未导入时为 None，未安装时为 False
+_lazy_pinyin = None
+
+# 参与搜索的字段及权重
+FIELD_WEIGHTS = (('name', 3.0), ('description', 1.0), ('category', 1.0), ('id', 1.0))
+# 名称拼音的权重
+PINYIN_WEIGHT = 2.0
+# 查询在名称开头出现时的额外得分
+PREFIX_BONUS = 1.0
+# 使用频率（0~1）换算为得分的倍数
+USAGE_WEIGHT = 1.5
+
+_CJK_RANGES = '\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff'
+_SEGMENT_PATTERN = re.compile(f'[{_CJK_RANGES}]+|[a-z0-9]+')
+_CJK_PATTERN = re.compile(f'[{_CJK_RANGES}]')
+
+
+def _segments(text):
+    """小写后拆分为连续的汉字段与拉丁/数字段"""
+    return _SEGMENT_PATTERN.findall(text.lower())
+
+
+def _is_cjk(segment):
+    return _CJK_PATTERN.match(segment) is not None
+
+
+def _load_pinyin():
+    """第一次使用时导入 pypinyin，返回 lazy_pinyin（未安装时为 False）"""
+    global _lazy_pinyin
+    if _lazy_pinyin is None:
+        try:
+            from pypinyin import lazy_pinyin
+        except ImportError:
+            lazy_pinyin = False
+        _lazy_pinyin = lazy_pinyin
+    return _lazy_pinyin
+
+
+def _syllables(text):
+    """汉字段的拼音音节列表（未安装 pypinyin 时为空）"""
+    lazy_pinyin = _load_pinyin()
+    if not lazy_pinyin:
+        return []
+    return [syllable.lower() for syllable in lazy_pinyin(text)]
+
+
+def _doc_terms(texts):
+    """工具文本产生的词条：[(是否汉字词条, 词条, 权重), ...]"""
+    terms = []
+    for field, weight in FIELD_WEIGHTS:
+        for segment in _segments(texts[field]):
+            if _is_cjk(segment):
+                grams = set(segment) | {segment[i:i + 2] for i in range(len(segment) - 1)}
+                terms.extend((True, gram, weight) for gram in grams)
+            else:
+                terms.append((False, segment, weight))
+    for segment in _segments(texts['name']):
+        if not _is_cjk(segment):
+            continue
+        syllables = _syllables(segment)
+        for i in range(len(syllables)):
+            terms.append((False, ''.join(syllables[i:]), PINYIN_WEIGHT))
+            terms.append((False, ''.join(s[0] for s in syllables[i:] if s), PINYIN_WEIGHT))
+    return terms
+
+
+def pinyin_available():
+    return bool(_load_pinyin())
+
+
+class ToolSearchIndex:
+    """工具的倒排索引
+
+    - 汉字：单字与相邻二字组合，查询中的汉字段要求所有二元组都命中，再以原文核对是否连续；
+    - 拉丁字母与数字：按词索引，查询按词前缀匹配；
+    - 拼音：名称中每个音节起始的全拼与首字母后缀（"qinglidashi"、"qlds"），
+      查询按前缀匹配，因此 "xitong"、"qingli"、"xtql" 都能找到"系统清理大师"。
+
+    索引在第一次搜索时建立，之后随工具增删增量更新。
+    """
+
+    def __init__(self):
+        self._docs = {}        # 工具 id -> 各字段小写文本
+        self._orders = {}      # 工具 id -> 排序位置（得分相同时按工具列表顺序）
+        self._ordered_ids = None  # 按排序位置排列的全部工具 id（缓存）
+        self._heads = {}       # 名称首字符 -> {工具 id}，用于查找名称以查询开头的工具
+        self._cjk = {}         # 单字/二元组 -> {工具 id: 权重}
+        self._words = {}       # 拉丁词/拼音后缀 -> {工具 id: 权重}
+        self._vocabulary = []  # _words 的键，排序后用于前缀查找
+        self._vocabulary_dirty = False
+        self._source = []
+        self._built = False
+        self._next_order = 0
+        self._lock = threading.Lock()
+
+    def reset(self, tools):
+        """以新的工具列表替换索引内容（下次搜索时重建）"""
+        with self._lock:
+            self._source = list(tools)
+            self._built = False
+
+    def update(self, changed, removed_ids):
+        """增量更新：changed 为新增或修改的工具，removed_ids 为删除的工具 id"""
+        with self._lock:
+            if not self._built:
+                removed = set(removed_ids)
+                changed_by_id = {tool.get('id'): tool for tool in changed}
+                source = [changed_by_id.pop(tool.get('id'), tool) for tool in self._source
+                          if tool.get('id') not in removed]
+                self._source = source + list(changed_by_id.values())
+                return
+            for tool_id in removed_ids:
+                self._remove(tool_id)
+            for tool in changed:
+                # 修改过的工具保持原来的排序位置
+                self._add(tool, order=self._remove(tool.get('id')))
+
+    def build(self, background=False):
+        """建立索引（background 为真时在后台线程中进行）"""
+        if background:
+            threading.Thread(target=self.build, name="tool-search-index", daemon=True).start()
+            return
+        with self._lock:
+            self._ensure_built()
+
+    def __len__(self):
+        with self._lock:
+            return len(self._docs) if self._built else len(self._source)
+
+    def _ensure_built(self):
+        if self._built:
+            return
+        self._docs = {}
+        self._orders = {}
+        self._ordered_ids = None
+        self._heads = {}
+        self._cjk = {}
+        self._words = {}
+        self._next_order = 0
+        for tool in self._source:
+            self._add(tool)
+        self._source = []
+        self._built = True
+
+    def _add(self, tool, order=None):
+        tool_id = tool.get('id')
+        if tool_id is None:
+            return
+        texts = {field: str(tool.get(field) or '').lower() for field, _ in FIELD_WEIGHTS}
+        if order is None:
+            order = self._next_order
+            self._next_order += 1
+        self._docs[tool_id] = texts
+        self._orders[tool_id] = order
+        self._ordered_ids = None
+        self._heads.setdefault(texts['name'][:1], set()).add(tool_id)
+        for is_cjk, term, weight in _doc_terms(texts):
+            postings = self._cjk if is_cjk else self._words
+            docs = postings.get(term)
+            if docs is None:
+                docs = postings[term] = {}
+                self._vocabulary_dirty |= not is_cjk
+            if weight > docs.get(tool_id, 0.0):
+                docs[tool_id] = weight
+
+    def _remove(self, tool_id):
+        """从索引中删除工具，返回它的排序位置（不存在时为 None）"""
+        texts = self._docs.pop(tool_id, None)
+        if texts is None:
+            return None
+        self._ordered_ids = None
+        heads = self._heads.get(texts['name'][:1])
+        heads.discard(tool_id)
+        if not heads:
+            del self._heads[texts['name'][:1]]
+        # 只清理该工具文本产生的词条，不遍历整个索引
+        for is_cjk, term, _ in _doc_terms(texts):
+            postings = self._cjk if is_cjk else self._words
+            docs = postings.get(term)
+            if docs is not None and docs.pop(tool_id, None) is not None and not docs:
+                del postings[term]
+                self._vocabulary_dirty |= not is_cjk
+        return self._orders.pop(tool_id)
+
+    def _prefix_matches(self, prefix):
+        """以 prefix 开头的拉丁词/拼音词条 -> {工具 id: 权重}（返回值只读）"""
+        if self._vocabulary_dirty:
+            self._vocabulary = sorted(self._words)
+            self._vocabulary_dirty = False
+        vocabulary = self._vocabulary
+        start = bisect.bisect_left(vocabulary, prefix)
+        end = bisect.bisect_left(vocabulary, prefix + '\uffff', start)
+        if end - start == 1 and vocabulary[start] == prefix:
+            # 只有一个完整匹配的词条，直接使用其倒排表
+            return self._words[prefix]
+        scores = {}
+        for term in vocabulary[start:end]:
+            # 完整匹配一个词比只匹配前缀得分高
+            factor = 1.0 if len(term) == len(prefix) else 0.8
+            for tool_id, weight in self._words[term].items():
+                score = weight * factor
+                if score > scores.get(tool_id, 0.0):
+                    scores[tool_id] = score
+        return scores
+
+    def _cjk_matches(self, segment):
+        """包含整个汉字段的工具 -> {工具 id: 权重}（返回值只读）"""
+        if len(segment) <= 2:
+            # 单字与二元组的倒排表本身就是精确结果
+            return self._cjk.get(segment, {})
+        grams = sorted((segment[i:i + 2] for i in range(len(segment) - 1)),
+                       key=lambda gram: len(self._cjk.get(gram, ())))
+        candidates = self._cjk.get(grams[0])
+        if not candidates:
+            return {}
+        candidates = set(candidates)
+        for gram in grams[1:]:
+            candidates &= self._cjk.get(gram, {}).keys()
+            if not candidates:
+                return {}
+        # 二元组都命中不代表连续出现，用原文核对
+        scores = {}
+        for tool_id in candidates:
+            texts = self._docs[tool_id]
+            weight = max((w for field, w in FIELD_WEIGHTS if segment in texts[field]), default=0.0)
+            if weight:
+                scores[tool_id] = weight
+        return scores
+
+    def search(self, query, limit=None, boosts=None):
+        """返回 (按相关度排序的工具 id 列表, 命中总数)；查询中的各段都必须命中
+
+        boosts 为 {工具 id: 0~1} 的使用频率，常用的工具排在相关度相近的工具前面。
+        """
+        segments = _segments(query or '')
+        if not segments:
+            return [], 0
+        with self._lock:
+            self._ensure_built()
+            scores = None
+            for segment in segments:
+                matches = self._cjk_matches(segment) if _is_cjk(segment) else self._prefix_matches(segment)
+                if scores is None:
+                    scores = matches
+                else:
+                    # 遍历较小的一方求交集
+                    small, large = (scores, matches) if len(scores) <= len(matches) else (matches, scores)
+                    scores = {tool_id: score + large[tool_id] for tool_id, score in small.items()
+                              if tool_id in large}
+                if not scores:
+                    return [], 0
+            ordered = self._in_order(scores)
+            # 名称以查询开头的工具额外加分；只核对名称首字符相同的工具
+            first = segments[0]
+            bonus = [tool_id for tool_id in self._heads.get(first[0], ())
+                     if tool_id in scores and self._docs[tool_id]['name'].startswith(first)]
+            used = [tool_id for tool_id in boosts if tool_id in scores] if boosts else None
+            if bonus or used:
+                scores = dict(scores)
+                for tool_id in bonus:
+                    scores[tool_id] += PREFIX_BONUS
+                for tool_id in used or ():
+                    scores[tool_id] += boosts[tool_id] * USAGE_WEIGHT
+            # 稳定排序：得分相同的工具保持原顺序（scores 可能是倒排表本身，须在锁内使用）
+            if limit:
+                ranked = heapq.nlargest(limit, ordered, key=scores.__getitem__)
+            else:
+                ranked = sorted(ordered, key=scores.__getitem__, reverse=True)
+        return ranked, len(ordered)
+
+    def _in_order(self, ids):
+        """按工具列表顺序排列 ids（命中很多时遍历缓存的顺序表，避免排序）"""
+        if len(ids) * 4 < len(self._orders):
+            return sorted(ids, key=self._orders.__getitem__)
+        if self._ordered_ids is None:
+            self._ordered_ids = sorted(self._orders, key=self._orders.__getitem__)
+        return [tool_id for tool_id in self._ordered_ids if tool_id in ids]
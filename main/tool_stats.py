@@ -0,0 +1,194 @@
+# tool_stats.py - 已启动工具的资源占用统计
+import threading
+import time
+from collections import deque
+
+import psutil
+
+# 句柄数：Windows 为 handle，其它平台为文件描述符
+_HANDLE_METHOD = 'num_handles' if psutil.WINDOWS else 'num_fds'
+
+
+class _ToolTotals:
+    """单个工具的滚动统计"""
+
+    def __init__(self, history_length):
+        self.history = deque(maxlen=history_length)  # 每次采样: (cpu%, rss)
+        self.runs = set()          # 观察到的运行 id
+        self.active = 0
+        self.cpu_time = 0.0        # 累计 CPU 秒数（含已结束的运行）
+        self.read_bytes = 0
+        self.write_bytes = 0
+        self.rss_peak = 0
+        self.latest = None
+
+    def to_dict(self):
+        latest = self.latest or {}
+        cpu_values = [cpu for cpu, _ in self.history]
+        rss_values = [rss for _, rss in self.history]
+        return {
+            'runs': len(self.runs),
+            'active': self.active,
+            'cpu_percent': latest.get('cpu_percent', 0.0),
+            'cpu_percent_avg': round(sum(cpu_values) / len(cpu_values), 1) if cpu_values else 0.0,
+            'cpu_time': round(self.cpu_time, 2),
+            'rss': latest.get('rss', 0),
+            'rss_avg': int(sum(rss_values) / len(rss_values)) if rss_values else 0,
+            'rss_peak': self.rss_peak,
+            'read_bytes': self.read_bytes,
+            'write_bytes': self.write_bytes,
+            'handles': latest.get('handles'),
+            'processes': latest.get('processes', 0),
+        }
+
+
+class ToolResourceMonitor:
+    """定期统计每个运行中工具进程树的 CPU、内存、I/O 与句柄数，按工具 id 汇总
+
+    每次采样只遍历一次进程表（process_iter 只取 ppid），再对进程树中的进程
+    一次性读取详细指标，不为每个子进程单独创建 psutil.Process。
+    """
+
+    def __init__(self, launcher, interval=2.0, history_length=30):
+        self.launcher = launcher
+        self.interval = max(0.5, float(interval))
+        self.history_length = max(1, int(history_length))
+        self._tools = {}       # 工具 id -> _ToolTotals
+        self._runs = {}        # 运行 id -> 上次采样的累计值 {'cpu_time', 'read_bytes', 'write_bytes', 'clock'}
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="tool-stats", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.interval + 1)
+        self._thread = None
+
+    def _run(self):
+        while not self._stop_event.wait(self.interval):
+            try:
+                self.sample()
+            except Exception as e:
+                print(f"⚠️  统计工具资源占用失败: {e}")
+
+    def sample(self):
+        """采样一次；没有运行中的工具时不遍历进程表"""
+        runs = [run for run in self.launcher.list_runs() if run['pid'] is not None]
+        if not runs and not self._runs:
+            return
+        trees = self._collect_trees([run['pid'] for run in runs]) if runs else {}
+        clock = time.monotonic()
+
+        with self._lock:
+            for totals in self._tools.values():
+                totals.active = 0
+            tick = {}  # 工具 id -> 本次采样的汇总
+            for run in runs:
+                usage = trees.get(run['pid'])
+                if usage is None:
+                    continue
+                totals = self._tools.get(run['tool_id'])
+                if totals is None:
+                    totals = self._tools[run['tool_id']] = _ToolTotals(self.history_length)
+                totals.runs.add(run['run_id'])
+                totals.active += 1
+
+                previous = self._runs.get(run['run_id'])
+                # 子进程退出后其 CPU 时间不再计入进程树，增量可能为负，按 0 处理
+                cpu_delta = max(0.0, usage['cpu_time'] - previous['cpu_time']) if previous else usage['cpu_time']
+                elapsed = clock - previous['clock'] if previous else None
+                totals.cpu_time += cpu_delta
+                totals.read_bytes += max(0, usage['read_bytes'] - (previous['read_bytes'] if previous else 0))
+                totals.write_bytes += max(0, usage['write_bytes'] - (previous['write_bytes'] if previous else 0))
+                self._runs[run['run_id']] = dict(usage, clock=clock)
+
+                current = tick.setdefault(run['tool_id'], {'cpu_percent': 0.0, 'rss': 0, 'handles': None,
+                                                           'processes': 0})
+                if elapsed:
+                    current['cpu_percent'] += 100.0 * cpu_delta / elapsed
+                current['rss'] += usage['rss']
+                current['processes'] += usage['processes']
+                if usage['handles'] is not None:
+                    current['handles'] = (current['handles'] or 0) + usage['handles']
+
+            for tool_id, current in tick.items():
+                current['cpu_percent'] = round(current['cpu_percent'], 1)
+                totals = self._tools[tool_id]
+                totals.latest = current
+                totals.history.append((current['cpu_percent'], current['rss']))
+                totals.rss_peak = max(totals.rss_peak, current['rss'])
+            for tool_id, totals in self._tools.items():
+                if tool_id not in tick:
+                    totals.latest = None
+            # 已结束的运行不再需要上次采样值
+            alive = {run['run_id'] for run in runs}
+            for run_id in [run_id for run_id in self._runs if run_id not in alive]:
+                del self._runs[run_id]
+
+    @staticmethod
+    def _collect_trees(root_pids):
+        """遍历一次进程表，返回 {根 pid: 进程树汇总}"""
+        processes = {}
+        children = {}
+        for proc in psutil.process_iter(['ppid']):
+            ppid = proc.info['ppid']
+            processes[proc.pid] = proc
+            if ppid is not None:
+                children.setdefault(ppid, []).append(proc.pid)
+
+        trees = {}
+        for root in root_pids:
+            if root not in processes:
+                continue
+            usage = {'cpu_time': 0.0, 'rss': 0, 'read_bytes': 0, 'write_bytes': 0, 'handles': None,
+                     'processes': 0}
+            stack = [root]
+            seen = set()
+            while stack:
+                pid = stack.pop()
+                if pid in seen:
+                    continue
+                seen.add(pid)
+                stack.extend(children.get(pid, ()))
+                try:
+                    _add_process_usage(usage, processes[pid])
+                except (psutil.NoSuchProcess, psutil.ZombieProcess):
+                    continue
+                except psutil.AccessDenied:
+                    # 提权启动的进程可能无法读取，只计数
+                    usage['processes'] += 1
+            trees[root] = usage
+        return trees
+
+    def stats(self):
+        """按工具 id 汇总的统计：{tool_id: {...}}"""
+        with self._lock:
+            return {tool_id: totals.to_dict() for tool_id, totals in self._tools.items()}
+
+
+def _add_process_usage(usage, proc):
+    with proc.oneshot():
+        cpu = proc.cpu_times()
+        usage['cpu_time'] += cpu.user + cpu.system
+        usage['rss'] += proc.memory_info().rss
+        try:
+            io = proc.io_counters()
+            usage['read_bytes'] += io.read_bytes
+            usage['write_bytes'] += io.write_bytes
+        except (AttributeError, psutil.AccessDenied):
+            # macOS 不支持 io_counters
+            pass
+        try:
+            handles = getattr(proc, _HANDLE_METHOD)()
+            usage['handles'] = (usage['handles'] or 0) + handles
+        except psutil.AccessDenied:
+            pass
+    usage['processes'] += 1
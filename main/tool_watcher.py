@@ -0,0 +1,210 @@
+# tool_watcher.py - 工具目录监视（Linux 使用 inotify，其它平台轮询）
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import threading
+import time
+
+# inotify 事件常量（见 <sys/inotify.h>）
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = 0x00000800
+IN_CLOEXEC = 0x00080000
+
+WATCH_MASK = (IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO |
+              IN_CREATE | IN_DELETE | IN_DELETE_SELF | IN_MOVE_SELF)
+_EVENT_HEADER = struct.Struct('iIII')
+
+# 表示需要完整扫描（目录结构变化或事件队列溢出）
+FULL_RESCAN = object()
+
+
+class InotifyBackend:
+    """基于 inotify 的事件源，产出发生变化的文件路径"""
+
+    name = 'inotify'
+
+    def __init__(self, root):
+        self.root = str(root)
+        self._libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        self._fd = self._libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 失败")
+        self._watches = {}  # wd -> 目录路径
+        self._add_watch(self.root)
+        with os.scandir(self.root) as entries:
+            for entry in entries:
+                if entry.is_dir():
+                    self._add_watch(entry.path)
+
+    @classmethod
+    def is_supported(cls):
+        if not sys.platform.startswith('linux'):
+            return False
+        libc_name = ctypes.util.find_library('c') or 'libc.so.6'
+        try:
+            return hasattr(ctypes.CDLL(libc_name), 'inotify_init1')
+        except OSError:
+            return False
+
+    def _add_watch(self, path):
+        wd = self._libc.inotify_add_watch(self._fd, os.fsencode(path), WATCH_MASK)
+        if wd >= 0:
+            self._watches[wd] = path
+
+    def read(self, timeout):
+        """等待最多 timeout 秒，返回变化的路径列表（可能包含 FULL_RESCAN）"""
+        ready, _, _ = select.select([self._fd], [], [], timeout)
+        if not ready:
+            return []
+        try:
+            data = os.read(self._fd, 64 * 1024)
+        except BlockingIOError:
+            return []
+
+        changes = []
+        offset = 0
+        while offset < len(data):
+            wd, mask, _cookie, length = _EVENT_HEADER.unpack_from(data, offset)
+            offset += _EVENT_HEADER.size
+            name = data[offset:offset + length].rstrip(b'\0')
+            offset += length
+
+            if mask & IN_Q_OVERFLOW:
+                changes.append(FULL_RESCAN)
+                continue
+            directory = self._watches.get(wd)
+            if mask & IN_IGNORED:
+                self._watches.pop(wd, None)
+                continue
+            if directory is None:
+                continue
+            if mask & IN_ISDIR or mask & (IN_DELETE_SELF | IN_MOVE_SELF):
+                # 分类目录增删：为新目录加监视，并完整扫描一次
+                if mask & (IN_CREATE | IN_MOVED_TO) and directory == self.root:
+                    self._add_watch(os.path.join(directory, os.fsdecode(name)))
+                changes.append(FULL_RESCAN)
+                continue
+            if name:
+                changes.append(os.path.join(directory, os.fsdecode(name)))
+        return changes
+
+    def close(self):
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+
+class PollingBackend:
+    """轮询事件源：定期请求一次完整扫描（注册表只 stat，不重复解析）"""
+
+    name = 'polling'
+
+    def __init__(self, root, interval=2.0):
+        self.root = str(root)
+        self.interval = max(0.2, float(interval))
+        self._next_poll = time.monotonic() + self.interval
+        self._stop_event = threading.Event()
+
+    def read(self, timeout):
+        wait = min(timeout, max(0.0, self._next_poll - time.monotonic()))
+        if self._stop_event.wait(wait) or time.monotonic() < self._next_poll:
+            return []
+        self._next_poll = time.monotonic() + self.interval
+        return [FULL_RESCAN]
+
+    def close(self):
+        self._stop_event.set()
+
+
+class ToolWatcher:
+    """监视工具目录，合并一段时间内的事件后把变化推送给回调"""
+
+    def __init__(self, registry, on_delta, debounce=0.3, poll_interval=2.0, max_delay=2.0):
+        self.registry = registry
+        self.on_delta = on_delta
+        self.debounce = float(debounce)
+        self.poll_interval = float(poll_interval)
+        self.max_delay = max(self.debounce, float(max_delay))
+        self.backend = None
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    def _create_backend(self):
+        if InotifyBackend.is_supported():
+            try:
+                return InotifyBackend(self.registry.tools_dir)
+            except OSError as e:
+                print(f"⚠️  inotify 不可用，改为轮询: {e}")
+        return PollingBackend(self.registry.tools_dir, self.poll_interval)
+
+    def start(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self.registry.tools_dir.mkdir(parents=True, exist_ok=True)
+        self.backend = self._create_backend()
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="tool-watcher", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop_event.set()
+        if self.backend is not None:
+            self.backend.close()
+        if self._thread is not None:
+            self._thread.join(timeout=self.poll_interval + 1)
+        self._thread = None
+
+    def _run(self):
+        pending = set()
+        full_rescan = False
+        first_event = None
+        while not self._stop_event.is_set():
+            # 有待处理事件时，只等待一个防抖间隔
+            timeout = self.debounce if (pending or full_rescan) else 1.0
+            try:
+                changes = self.backend.read(timeout)
+            except (OSError, ValueError) as e:
+                if not self._stop_event.is_set():
+                    print(f"⚠️  工具目录监视已停止: {e}")
+                break
+
+            for change in changes:
+                if change is FULL_RESCAN:
+                    full_rescan = True
+                else:
+                    pending.add(change)
+            if changes and first_event is None:
+                first_event = time.monotonic()
+
+            quiet = not changes
+            overdue = first_event is not None and time.monotonic() - first_event >= self.max_delay
+            if (pending or full_rescan) and (quiet or overdue):
+                self._flush(None if full_rescan else pending)
+                pending = set()
+                full_rescan = False
+                first_event = None
+
+    def _flush(self, paths):
+        try:
+            delta = self.registry.refresh(paths)
+        except Exception as e:
+            print(f"⚠️  刷新工具注册表失败: {e}")
+            return
+        if any(delta.values()):
+            try:
+                self.on_delta(delta)
+            except Exception as e:
+                print(f"⚠️  推送工具变化失败: {e}")
@@ -0,0 +1,1060 @@
+// app.js - 主界面脚本（通过 window.pywebview.api 调用 Python）
+// 启动计时：记录页面侧的关键时刻，首屏渲染后一次性报告给 Python
+const startupMarks = [];
+function markStartup(name) {
+    startupMarks.push({ name: name, time: performance.timeOrigin + performance.now() });
+}
+startupMarks.push({ name: 'js.navigation_start', time: performance.timeOrigin });
+markStartup('js.script');
+
+function reportStartup() {
+    // 等下一帧绘制后再记录，代表首屏真正显示的时刻
+    requestAnimationFrame(() => setTimeout(() => {
+        markStartup('js.first_render');
+        performance.getEntriesByType('paint').forEach(entry => {
+            startupMarks.push({ name: `js.${entry.name}`, time: performance.timeOrigin + entry.startTime });
+        });
+        window.pywebview.api.report_startup_events(startupMarks);
+    }, 0));
+}
+
+// 全局变量
+let currentSearchEngine = '百度';
+let toolsData = [];
+let toolsVersion = null;
+let frequentToolIds = [];
+
+// 工具网格（tool_grid.js），卡片上的按钮通过事件委托处理
+const toolGridOptions = {
+    onAction: (action, toolId) => action === 'favorite' ? toggleFavorite(toolId) : launchTool(toolId)
+};
+const frequentGrid = new ToolGrid(document.getElementById('frequent-tools'),
+    Object.assign({ emptyText: '还没有使用记录，启动过的工具会显示在这里' }, toolGridOptions));
+const favoriteGrid = new ToolGrid(document.getElementById('favorite-tools'),
+    Object.assign({ emptyText: '暂无收藏的工具' }, toolGridOptions));
+const allToolsGrid = new ToolGrid(document.getElementById('all-tools'), toolGridOptions);
+
+// 页面切换函数
+function switchPage(pageId) {
+    // 更新活动导航项
+    document.querySelectorAll('.nav-item').forEach(item => {
+        item.classList.toggle('active', item.dataset.page === pageId);
+    });
+
+    // 更新页面标题
+    const pageTitles = {
+        'dashboard': '主页',
+        'system': '系统信息',
+        'tools': '所有工具',
+        'processes': '进程管理',
+        'settings': '设置',
+        'about': '关于'
+    };
+    document.getElementById('page-title').textContent = pageTitles[pageId] || 'R-tools Box';
+
+    // 切换页面内容
+    document.querySelectorAll('.page').forEach(page => {
+        page.classList.remove('active');
+    });
+    document.getElementById(pageId).classList.add('active');
+
+    // 资源占用只在工具页面可见时刷新
+    if (pageId === 'tools') {
+        startToolStats();
+    } else {
+        stopToolStats();
+    }
+
+    // 实时监控只在系统信息页面可见时推送
+    if (pageId === 'system') {
+        startLiveMonitor();
+    } else {
+        stopLiveMonitor();
+    }
+
+    // 进程列表只在进程管理页面可见时刷新
+    if (pageId === 'processes') {
+        startProcesses();
+    } else {
+        stopProcesses();
+    }
+
+    // 主页与工具页面加载工具（主页经 loadToolsForPage 调用 loadHomePage）
+    if (['tools', 'dashboard'].includes(pageId)) {
+        loadToolsForPage(pageId);
+    } else if (pageId === 'system') {
+        loadSystemInfo();
+    }
+
+    return false;
+}
+
+// 加载主页
+async function loadHomePage() {
+    // 搜索引擎、收藏网站、收藏工具一次取回
+    try {
+        renderDashboard(await window.pywebview.api.get_dashboard(toolsVersion));
+    } catch (error) {
+        console.error('加载主页失败:', error);
+    }
+}
+
+function renderDashboard(dashboard) {
+    if (!dashboard.success) return;
+    renderSearchEngines(dashboard.engines);
+    renderFavoriteSites(dashboard.sites);
+    if (dashboard.tools.success) applyToolsPatch(dashboard.tools);
+    if (dashboard.usage.success) frequentToolIds = dashboard.usage.frequent;
+    renderFavoriteTools();
+}
+
+// 切换到主页或工具页时刷新数据，每次切换只经过一次接口调用
+async function loadToolsForPage(pageId) {
+    try {
+        if (pageId === 'dashboard') {
+            await loadHomePage();
+            return;
+        }
+        const response = await window.pywebview.api.batch([
+            ['get_tools_since', toolsVersion],
+            ['get_tool_stats']
+        ]);
+        const [tools, stats] = response.results;
+        if (tools.success) applyToolsPatch(tools);
+        renderAllTools();
+        renderToolStats(stats);
+    } catch (error) {
+        console.error('加载工具失败:', error);
+    }
+}
+
+// 首屏数据：Python 在页面加载完成后主动推送，收到后直接渲染，无需逐个请求
+let initialState = null;
+
+window.onInitialState = function(state) {
+    if (initialState) return;
+    initialState = state;
+    markStartup('js.initial_state');
+    renderDashboard(state);
+};
+
+// 图标子集重新生成后，用 Python 推送的内嵌样式替换原来的 <link>/<style id="icon-css">
+window.onIconsUpdated = function(css) {
+    const style = document.createElement('style');
+    style.id = 'icon-css';
+    style.textContent = css;
+    const old = document.getElementById('icon-css');
+    if (old) old.replaceWith(style);
+    else document.head.appendChild(style);
+};
+
+// 加载搜索引擎
+async function loadSearchEngines() {
+    try {
+        renderSearchEngines(await window.pywebview.api.get_search_engines());
+    } catch (error) {
+        console.error('加载搜索引擎失败:', error);
+    }
+}
+
+function renderSearchEngines(response) {
+    if (!response.success) return;
+    const selector = document.getElementById('engine-selector');
+    selector.innerHTML = '';
+
+    for (const [name, engine] of Object.entries(response.engines)) {
+        const btn = document.createElement('button');
+        btn.className = `engine-btn ${name === response.default ? 'active' : ''}`;
+        btn.innerHTML = `<i class="${engine.icon}"></i> ${name}`;
+        btn.onclick = () => selectSearchEngine(name, btn);
+        selector.appendChild(btn);
+
+        if (name === response.default) {
+            currentSearchEngine = name;
+        }
+    }
+}
+
+// 选择搜索引擎
+function selectSearchEngine(engine, button) {
+    currentSearchEngine = engine;
+    document.querySelectorAll('.engine-btn').forEach(btn => {
+        btn.classList.remove('active');
+    });
+    button.classList.add('active');
+}
+
+// 执行主搜索
+async function performMainSearch() {
+    const query = document.getElementById('main-search-input').value.trim();
+    if (!query) return;
+
+    try {
+        const response = await window.pywebview.api.search(query, currentSearchEngine);
+        showNotification(response.message, response.success ? 'info' : 'error');
+    } catch (error) {
+        showNotification('搜索失败', 'error');
+    }
+}
+
+// 渲染收藏网站
+function renderFavoriteSites(response) {
+    if (!response.success) return;
+    const container = document.getElementById('favorite-sites');
+    container.innerHTML = '';
+
+    response.sites.forEach(site => {
+        const card = document.createElement('div');
+        card.className = 'site-card';
+        card.onclick = () => openSite(site.url);
+        card.innerHTML = `
+            <div class="site-header">
+                <div class="site-icon">
+                    <i class="${site.icon}"></i>
+                </div>
+                <div class="site-info">
+                    <h3>${site.name}</h3>
+                    <p>${site.url}</p>
+                    <span class="site-category">${site.category}</span>
+                </div>
+            </div>
+        `;
+        container.appendChild(card);
+    });
+}
+
+// 按版本号增量同步工具列表，返回数据是否有变化
+async function syncTools() {
+    const response = await window.pywebview.api.get_tools_since(toolsVersion);
+    if (!response.success) return false;
+    return applyToolsPatch(response);
+}
+
+// 工具 id -> 工具数据，toolsData 变化后重新建立
+let toolsById = null;
+
+function toolsIndex() {
+    if (!toolsById) toolsById = new Map(toolsData.map(tool => [tool.id, tool]));
+    return toolsById;
+}
+
+// 把 unchanged / 增量 / full 三种形式的结果应用到 toolsData
+function applyToolsPatch(patch) {
+    if (patch.unchanged) {
+        toolsVersion = patch.version;
+        return false;
+    }
+    toolsById = null;
+    if (patch.full) {
+        toolsData = patch.tools;
+        toolsVersion = patch.version;
+        return true;
+    }
+
+    // 新增的工具先从原位置移除（同一 id 可能换了清单），再按注册表中的下标插入
+    const removed = new Set([...patch.removed, ...patch.added.map(tool => tool.id)]);
+    const updated = new Map(patch.updated.map(tool => [tool.id, tool]));
+
+    toolsData = toolsData
+        .filter(tool => !removed.has(tool.id))
+        .map(tool => updated.has(tool.id) ? updated.get(tool.id) : tool);
+    // 按下标从小到大插入，每个工具落在与全量同步相同的位置
+    const positions = patch.positions || {};
+    const position = tool => tool.id in positions ? positions[tool.id] : Infinity;
+    [...patch.added].sort((a, b) => position(a) - position(b)).forEach(tool => {
+        const at = position(tool);
+        if (at >= toolsData.length) toolsData.push(tool);
+        else toolsData.splice(at, 0, tool);
+    });
+    if (patch.version !== undefined) toolsVersion = patch.version;
+    return true;
+}
+
+// 渲染主页上的常用工具与收藏工具
+function renderFavoriteTools() {
+    // 更新工具数量
+    document.getElementById('tools-count').textContent = toolsData.length;
+    const byId = toolsIndex();
+    frequentGrid.setTools(frequentToolIds.map(id => byId.get(id)).filter(Boolean));
+    favoriteGrid.setTools(toolsData.filter(tool => tool.favorite));
+}
+
+// 启动工具后刷新常用工具（只在主页可见时）
+async function refreshFrequentTools() {
+    if (document.querySelector('.page.active').id !== 'dashboard') return;
+    try {
+        const usage = await window.pywebview.api.get_tool_usage();
+        if (!usage.success) return;
+        frequentToolIds = usage.frequent;
+        renderFavoriteTools();
+    } catch (error) {
+        console.error('加载常用工具失败:', error);
+    }
+}
+
+// 加载所有工具
+async function loadAllTools() {
+    try {
+        await syncTools();
+        renderAllTools();
+    } catch (error) {
+        console.error('加载工具失败:', error);
+    }
+}
+
+// 渲染所有工具（只生成视口附近的卡片，未变化的卡片不重建）
+function renderAllTools() {
+    // 更新工具数量
+    document.getElementById('tools-count').textContent = toolsData.length;
+    searchTools();
+}
+
+// 工具目录变化（由Python端监视器推送）
+window.onToolsDelta = async function(delta) {
+    if (toolsVersion === delta.from_version) {
+        applyToolsPatch(delta);
+    } else {
+        // 页面与推送的起点版本不一致（漏掉了推送或已同步到更新的版本），按页面自己的版本重新同步
+        try {
+            if (!await syncTools()) return;
+        } catch (error) {
+            console.error('同步工具失败:', error);
+            return;
+        }
+    }
+    renderFavoriteTools();
+    renderAllTools();
+};
+
+// 加载系统信息
+async function loadSystemInfo() {
+    try {
+        const response = await window.pywebview.api.get_system_info();
+        if (response.success) {
+            const container = document.getElementById('system-info-grid');
+            container.innerHTML = '';
+
+            response.info.forEach(([title, info]) => {
+                const card = document.createElement('div');
+                card.className = 'info-card';
+
+                let content = '';
+                if (typeof info === 'object') {
+                    for (const [key, value] of Object.entries(info)) {
+                        content += `
+                            <div class="info-item">
+                                <div class="info-label">${key}</div>
+                                <div class="info-value">${value}</div>
+                            </div>
+                        `;
+                    }
+                } else {
+                    content = `
+                        <div class="info-item">
+                            <div class="info-value">${info}</div>
+                        </div>
+                    `;
+                }
+
+                card.innerHTML = `
+                    <h3>${title}</h3>
+                    ${content}
+                `;
+                container.appendChild(card);
+            });
+        }
+    } catch (error) {
+        console.error('加载系统信息失败:', error);
+    }
+}
+
+// 实时监控：Python 端把采样写入环形缓冲区，系统信息页可见时按批推送（window.onLiveSamples），
+// 页面只保留最近 LIVE_WINDOW 秒用于绘制走势图；统计值（平均、峰值、P95）由 Python 端计算
+const LIVE_WINDOW = 120;
+const formatPercent = value => `${value.toFixed(1)}%`;
+const formatRate = value => `${formatBytes(value)}/s`;
+const LIVE_METRICS = [
+    { column: 'cpu', label: 'CPU', format: formatPercent, max: 100 },
+    { column: 'memory', label: '内存', format: formatPercent, max: 100 },
+    { column: 'swap', label: '交换区', format: formatPercent, max: 100 },
+    { column: 'disk_read', label: '磁盘读取', format: formatRate },
+    { column: 'disk_write', label: '磁盘写入', format: formatRate }
+];
+let liveMonitor = null;
+let liveMonitorSeq = 0;
+
+async function startLiveMonitor() {
+    const seq = ++liveMonitorSeq;
+    const note = document.getElementById('live-monitor-note');
+    try {
+        const response = await window.pywebview.api.start_live_monitor(LIVE_WINDOW);
+        // 等待期间已离开系统信息页
+        if (seq !== liveMonitorSeq) return;
+        if (!response.success) {
+            note.textContent = response.message;
+            return;
+        }
+        note.textContent = `每 ${response.interval} 秒采样，保留 ${Math.round(response.capacity * response.interval / 60)} 分钟`;
+        liveMonitor = {
+            columns: response.columns,
+            limit: Math.ceil(LIVE_WINDOW / response.interval),
+            series: response.columns.map(() => []),
+            stats: {},
+            tiles: buildLiveTiles(response.columns)
+        };
+        window.onLiveSamples(response.batch);
+    } catch (error) {
+        console.error('启动实时监控失败:', error);
+    }
+}
+
+function stopLiveMonitor() {
+    liveMonitorSeq++;
+    if (!liveMonitor) return;
+    liveMonitor = null;
+    window.pywebview.api.stop_live_monitor();
+}
+
+function createLiveTile(container, label) {
+    const tile = document.createElement('div');
+    tile.innerHTML = `
+        <div class="live-metric-header">
+            <span class="live-metric-label"></span>
+            <span class="live-metric-value">-</span>
+        </div>
+        <canvas class="sparkline"></canvas>
+        <div class="live-metric-stats"></div>
+    `;
+    tile.querySelector('.live-metric-label').textContent = label;
+    container.appendChild(tile);
+    return {
+        value: tile.querySelector('.live-metric-value'),
+        canvas: tile.querySelector('canvas'),
+        stats: tile.querySelector('.live-metric-stats')
+    };
+}
+
+function buildLiveTiles(columns) {
+    const metrics = document.getElementById('live-metrics');
+    const cores = document.getElementById('live-cores');
+    metrics.innerHTML = '';
+    cores.innerHTML = '';
+    const tiles = [];
+    LIVE_METRICS.forEach(metric => {
+        const index = columns.indexOf(metric.column);
+        if (index >= 0) tiles.push(Object.assign({ index: index }, metric, createLiveTile(metrics, metric.label)));
+    });
+    columns.forEach((column, index) => {
+        if (!column.startsWith('core')) return;
+        const label = `核心 ${column.slice(4)}`;
+        tiles.push(Object.assign({ index: index, column: column, format: formatPercent, max: 100, compact: true },
+            createLiveTile(cores, label)));
+    });
+    return tiles;
+}
+
+window.onLiveSamples = function(batch) {
+    if (!liveMonitor) return;
+    batch.values.forEach((values, index) => {
+        const series = liveMonitor.series[index];
+        series.push(...values);
+        if (series.length > liveMonitor.limit) series.splice(0, series.length - liveMonitor.limit);
+    });
+    liveMonitor.stats = batch.stats;
+    // 页面不可见时不绘制，下一批到达时再画
+    if (!document.hidden) requestAnimationFrame(renderLiveMonitor);
+};
+
+function renderLiveMonitor() {
+    if (!liveMonitor) return;
+    liveMonitor.tiles.forEach(tile => {
+        const series = liveMonitor.series[tile.index];
+        const latest = series.length ? series[series.length - 1] : null;
+        tile.value.textContent = latest === null ? '-' : tile.format(latest);
+        const stats = liveMonitor.stats[tile.column];
+        if (stats && stats.avg !== null) {
+            tile.stats.textContent = tile.compact
+                ? `平均 ${tile.format(stats.avg)}`
+                : `平均 ${tile.format(stats.avg)} · 峰值 ${tile.format(stats.max)} · P95 ${tile.format(stats.p95)}`;
+        } else {
+            tile.stats.textContent = '无数据';
+        }
+        drawSparkline(tile.canvas, series, liveMonitor.limit, tile.max);
+    });
+}
+
+function drawSparkline(canvas, values, slots, max) {
+    const ratio = window.devicePixelRatio || 1;
+    const width = canvas.clientWidth;
+    const height = canvas.clientHeight;
+    if (!width || !height) return;
+    if (canvas.width !== Math.round(width * ratio) || canvas.height !== Math.round(height * ratio)) {
+        canvas.width = Math.round(width * ratio);
+        canvas.height = Math.round(height * ratio);
+    }
+    const ctx = canvas.getContext('2d');
+    ctx.setTransform(ratio, 0, 0, ratio, 0, 0);
+    ctx.clearRect(0, 0, width, height);
+    // 没有固定上限的指标（磁盘速率）按窗口内最大值缩放
+    const top = max || Math.max(1, ...values.filter(value => value !== null));
+    const step = width / Math.max(1, slots - 1);
+    const offset = slots - values.length;
+    ctx.beginPath();
+    let drawing = false;
+    values.forEach((value, i) => {
+        if (value === null) {
+            drawing = false;
+            return;
+        }
+        const x = (offset + i) * step;
+        const y = height - 2 - (height - 4) * Math.min(value, top) / top;
+        if (drawing) ctx.lineTo(x, y);
+        else ctx.moveTo(x, y);
+        drawing = true;
+    });
+    ctx.strokeStyle = '#002FA7';
+    ctx.lineWidth = 1.5;
+    ctx.stroke();
+}
+
+// 搜索工具：匹配与排序由 Python 端的索引完成（支持拼音与首字母），页面只显示结果
+let searchSeq = 0;
+
+async function searchTools() {
+    const query = document.getElementById('search-tools').value.trim();
+    const seq = ++searchSeq;
+    if (!query) {
+        allToolsGrid.setTools(toolsData);
+        return;
+    }
+    try {
+        const response = await window.pywebview.api.search_tools(query, 0);
+        // 等待期间输入已变化，丢弃过期的结果
+        if (seq !== searchSeq || !response.success) return;
+        const byId = toolsIndex();
+        allToolsGrid.setTools(response.ids.map(id => byId.get(id)).filter(Boolean));
+    } catch (error) {
+        console.error('搜索工具失败:', error);
+    }
+}
+
+// 启动工具
+async function launchTool(toolId) {
+    try {
+        const response = await window.pywebview.api.launch_tool(toolId);
+        showNotification(response.message, response.success ? 'info' : 'error');
+        if (response.success && response.page) {
+            // 在界面内实现的工具，打开对应页面
+            switchPage(response.page);
+        } else if (response.success && response.run.captures_output) {
+            trackToolRun(response.run);
+        }
+        if (response.success) refreshFrequentTools();
+    } catch (error) {
+        showNotification('启动失败', 'error');
+    }
+}
+
+// 工具资源占用
+let toolStatsTimer = null;
+
+function formatBytes(bytes) {
+    if (bytes === null || bytes === undefined) return '-';
+    const units = ['B', 'KB', 'MB', 'GB'];
+    let i = 0;
+    while (bytes >= 1024 && i < units.length - 1) {
+        bytes /= 1024;
+        i++;
+    }
+    return `${bytes.toFixed(i ? 1 : 0)} ${units[i]}`;
+}
+
+async function loadToolStats() {
+    try {
+        renderToolStats(await window.pywebview.api.get_tool_stats());
+    } catch (error) {
+        console.error('加载资源占用失败:', error);
+    }
+}
+
+function renderToolStats(response) {
+    if (!response.success) return;
+    const entries = Object.entries(response.stats);
+    const tbody = document.getElementById('tool-stats');
+    if (!entries.length) {
+        tbody.innerHTML = '<tr><td colspan="10">暂无统计数据</td></tr>';
+        return;
+    }
+    // 工具名称来自清单，只以 textContent 写入，不拼接进 HTML
+    const byId = toolsIndex();
+    tbody.textContent = '';
+    entries.forEach(([toolId, s]) => {
+        const tool = byId.get(toolId);
+        const tr = document.createElement('tr');
+        for (const text of [
+            tool ? tool.name : toolId,
+            `${s.active}/${s.runs}`,
+            `${s.cpu_percent.toFixed(1)}%`,
+            `${s.cpu_percent_avg.toFixed(1)}%`,
+            `${s.cpu_time.toFixed(1)}s`,
+            formatBytes(s.rss),
+            formatBytes(s.rss_peak),
+            formatBytes(s.read_bytes),
+            formatBytes(s.write_bytes),
+            s.handles === null ? '-' : s.handles
+        ]) {
+            const td = document.createElement('td');
+            td.textContent = text;
+            tr.appendChild(td);
+        }
+        tbody.appendChild(tr);
+    });
+}
+
+function startToolStats() {
+    // 首次数据随工具列表一起取回（见 loadToolsForPage）
+    if (toolStatsTimer) return;
+    toolStatsTimer = setInterval(loadToolStats, 2000);
+}
+
+function stopToolStats() {
+    clearInterval(toolStatsTimer);
+    toolStatsTimer = null;
+}
+
+// 进程管理：Python 端维护进程表并计算每页的行差异，页面按 pid 复用表格行
+const PROCESS_PAGE_SIZE = 100;
+const PROCESS_STATUS = {
+    'running': '运行中',
+    'sleeping': '休眠',
+    'disk-sleep': '等待 I/O',
+    'idle': '空闲',
+    'stopped': '已挂起',
+    'zombie': '僵尸',
+    'dead': '已结束'
+};
+// 文本列默认升序，数值列默认降序
+const PROCESS_TEXT_COLUMNS = ['name', 'user', 'status'];
+const processView = {
+    sort: 'cpu',
+    descending: true,
+    offset: 0,
+    total: 0,
+    token: null,
+    fields: {},
+    rows: new Map(),      // pid -> 行数组
+    elements: new Map(),  // pid -> <tr>
+    seq: 0,
+    timer: null,
+    filterTimer: null
+};
+
+function startProcesses() {
+    if (processView.timer) return;
+    loadProcesses();
+    processView.timer = setInterval(loadProcesses, 2000);
+}
+
+function stopProcesses() {
+    clearInterval(processView.timer);
+    processView.timer = null;
+}
+
+async function loadProcesses() {
+    const seq = ++processView.seq;
+    try {
+        const response = await window.pywebview.api.get_processes(
+            processView.sort, processView.descending,
+            document.getElementById('process-filter').value.trim(),
+            processView.offset, PROCESS_PAGE_SIZE,
+            document.getElementById('process-tree').checked,
+            processView.token
+        );
+        // 等待期间又发起了新的查询，丢弃过期的结果
+        if (seq !== processView.seq) return;
+        if (!response.success) {
+            showNotification(response.message, 'error');
+            return;
+        }
+        applyProcessPage(response);
+    } catch (error) {
+        console.error('加载进程列表失败:', error);
+    }
+}
+
+// 条件变化后重新从第一页查询
+function reloadProcesses() {
+    processView.offset = 0;
+    loadProcesses();
+}
+
+function filterProcesses() {
+    clearTimeout(processView.filterTimer);
+    processView.filterTimer = setTimeout(reloadProcesses, 200);
+}
+
+function pageProcesses(direction) {
+    const offset = processView.offset + direction * PROCESS_PAGE_SIZE;
+    if (offset < 0 || offset >= processView.total) return;
+    processView.offset = offset;
+    loadProcesses();
+}
+
+function sortProcesses(column) {
+    if (processView.sort === column) {
+        processView.descending = !processView.descending;
+    } else {
+        processView.sort = column;
+        processView.descending = !PROCESS_TEXT_COLUMNS.includes(column);
+    }
+    document.querySelectorAll('#process-header th').forEach(th => {
+        th.classList.toggle('sorted', th.dataset.sort === column);
+        th.classList.toggle('ascending', th.dataset.sort === column && !processView.descending);
+    });
+    reloadProcesses();
+}
+
+function applyProcessPage(page) {
+    const tbody = document.getElementById('process-rows');
+    processView.token = page.token;
+    processView.total = page.total;
+    processView.offset = page.offset;
+    processView.fields = {};
+    page.fields.forEach((name, i) => (processView.fields[name] = i));
+    if (page.full) processView.rows.clear();
+    page.removed.forEach(pid => processView.rows.delete(pid));
+    page.rows.forEach(row => {
+        const pid = row[0];
+        processView.rows.set(pid, row);
+        let tr = processView.elements.get(pid);
+        if (!tr) {
+            tr = createProcessRow(pid);
+            processView.elements.set(pid, tr);
+        }
+        updateProcessRow(tr, row);
+    });
+    // 按 order 排列，只移动位置变化的行
+    let cursor = tbody.firstChild;
+    page.order.forEach(pid => {
+        const tr = processView.elements.get(pid);
+        if (tr === cursor) {
+            cursor = cursor.nextSibling;
+        } else {
+            tbody.insertBefore(tr, cursor);
+        }
+    });
+    while (cursor) {
+        const next = cursor.nextSibling;
+        cursor.remove();
+        if (cursor.dataset) processView.elements.delete(Number(cursor.dataset.pid));
+        cursor = next;
+    }
+    const pages = Math.max(1, Math.ceil(page.total / PROCESS_PAGE_SIZE));
+    document.getElementById('process-page').textContent =
+        `第 ${Math.floor(page.offset / PROCESS_PAGE_SIZE) + 1} / ${pages} 页`;
+    document.getElementById('process-summary').textContent = `共 ${page.total} 个进程`;
+}
+
+function createProcessRow(pid) {
+    const tr = document.createElement('tr');
+    tr.dataset.pid = pid;
+    tr.innerHTML = `
+        <td></td><td></td><td></td><td></td><td></td><td></td><td></td>
+        <td>
+            <div class="process-actions">
+                <button data-action="suspend"></button>
+                <button data-action="kill" title="结束进程">结束</button>
+                <button data-action="kill_tree" title="结束进程及其全部子进程">结束进程树</button>
+            </div>
+        </td>
+    `;
+    return tr;
+}
+
+function updateProcessRow(tr, row) {
+    const f = processView.fields;
+    const cells = tr.cells;
+    const cmdline = row[f.cmdline] || row[f.exe] || '';
+    cells[0].textContent = row[f.name];
+    cells[0].title = cmdline;
+    cells[0].style.paddingLeft = f.depth === undefined ? '' : `${10 + row[f.depth] * 16}px`;
+    cells[1].textContent = row[f.pid];
+    cells[2].textContent = row[f.user] || '-';
+    cells[3].textContent = PROCESS_STATUS[row[f.status]] || row[f.status];
+    cells[4].textContent = `${row[f.cpu].toFixed(1)}%`;
+    cells[5].textContent = formatBytes(row[f.memory]);
+    cells[6].textContent = row[f.threads];
+    const suspend = tr.querySelector('[data-action="suspend"], [data-action="resume"]');
+    const stopped = row[f.status] === 'stopped';
+    suspend.dataset.action = stopped ? 'resume' : 'suspend';
+    suspend.textContent = stopped ? '恢复' : '挂起';
+}
+
+async function processAction(pid, action) {
+    const row = processView.rows.get(pid);
+    if (!row) return;
+    const f = processView.fields;
+    if (action === 'kill' || action === 'kill_tree') {
+        const scope = action === 'kill_tree' ? '及其全部子进程' : '';
+        if (!confirm(`确定要结束 ${row[f.name]}（PID ${pid}）${scope}吗？`)) return;
+    }
+    try {
+        const response = await window.pywebview.api.process_action(pid, row[f.create_time], action);
+        showNotification(response.message, response.success ? 'info' : 'error');
+        loadProcesses();
+    } catch (error) {
+        showNotification('操作失败', 'error');
+    }
+}
+
+document.getElementById('process-header').addEventListener('click', event => {
+    const th = event.target.closest('th[data-sort]');
+    if (th) sortProcesses(th.dataset.sort);
+});
+
+document.getElementById('process-rows').addEventListener('click', event => {
+    const button = event.target.closest('button[data-action]');
+    if (button) processAction(Number(button.closest('tr').dataset.pid), button.dataset.action);
+});
+
+// 工具运行输出（Python端按批推送，每次运行只保留末尾一段）
+const TOOL_OUTPUT_LIMIT = 200000;
+const toolOutputs = {};
+
+function trackToolRun(run) {
+    if (toolOutputs[run.run_id]) return;
+    toolOutputs[run.run_id] = { toolId: run.tool_id, text: '', next: 0, finished: false };
+
+    const tool = toolsData.find(t => t.id === run.tool_id);
+    const option = document.createElement('option');
+    option.value = run.run_id;
+    option.textContent = `#${run.run_id} ${tool ? tool.name : run.tool_id}`;
+    const select = document.getElementById('tool-output-run');
+    select.insertBefore(option, select.firstChild);
+    select.value = run.run_id;
+    showToolOutput();
+}
+
+window.onToolOutput = function(batch) {
+    batch.forEach(chunk => {
+        if (!toolOutputs[chunk.run_id]) {
+            trackToolRun({ run_id: chunk.run_id, tool_id: '' });
+        }
+        const entry = toolOutputs[chunk.run_id];
+        if (chunk.skipped) entry.text += '\n…（部分输出已省略）…\n';
+        entry.text = (entry.text + chunk.text).slice(-TOOL_OUTPUT_LIMIT);
+        entry.next = chunk.next_offset;
+        if (chunk.finished) entry.finished = true;
+    });
+    showToolOutput();
+};
+
+function showToolOutput() {
+    const runId = document.getElementById('tool-output-run').value;
+    const entry = toolOutputs[runId];
+    if (!entry) return;
+    const output = document.getElementById('tool-output');
+    const atBottom = output.scrollTop + output.clientHeight >= output.scrollHeight - 20;
+    output.textContent = entry.text + (entry.finished ? '\n[进程已结束]' : '');
+    if (atBottom) output.scrollTop = output.scrollHeight;
+}
+
+// 切换收藏状态
+async function toggleFavorite(toolId) {
+    const tool = toolsData.find(t => t.id === toolId);
+    if (tool) {
+        const newFavorite = !tool.favorite;
+        try {
+            const response = await window.pywebview.api.toggle_favorite(toolId, newFavorite);
+            if (response.success) {
+                tool.favorite = newFavorite;
+
+                // 只拉取变化的部分；两个网格只更新受影响的卡片
+                await syncTools();
+                renderFavoriteTools();
+                renderAllTools();
+
+                showNotification(response.message, 'info');
+            }
+        } catch (error) {
+            showNotification('操作失败', 'error');
+        }
+    }
+}
+
+// 打开网站
+async function openSite(url) {
+    try {
+        const response = await window.pywebview.api.open_site(url);
+        if (!response.success) {
+            showNotification('打开失败', 'error');
+        }
+    } catch (error) {
+        showNotification('打开失败', 'error');
+    }
+}
+
+// 刷新工具
+async function refreshTools() {
+    showNotification('正在刷新工具列表...', 'info');
+
+    try {
+        const response = await window.pywebview.api.rescan_tools(toolsVersion);
+        if (response.success) {
+            applyToolsPatch(response);
+
+            const activePage = document.querySelector('.page.active').id;
+            if (activePage === 'tools') {
+                renderAllTools();
+            } else if (activePage === 'dashboard') {
+                renderFavoriteTools();
+            }
+
+            showNotification('工具列表已刷新', 'success');
+        }
+    } catch (error) {
+        showNotification('刷新失败', 'error');
+    }
+}
+
+// 检查更新
+async function checkForUpdates() {
+    showNotification('正在检查更新...', 'info');
+    // 这里可以调用API检查更新
+    setTimeout(() => {
+        showNotification('当前已是最新版本 (v1.0.0)', 'info');
+    }, 1000);
+}
+
+// 显示通知
+function showNotification(message, type = 'info') {
+    // 移除现有的通知
+    const existing = document.querySelector('.notification');
+    if (existing) {
+        existing.style.animation = 'slideOut 0.3s ease';
+        setTimeout(() => existing.remove(), 300);
+    }
+
+    // 创建新通知
+    const notification = document.createElement('div');
+    notification.className = `notification`;
+    notification.style.backgroundColor = type === 'error' ? '#ef4444' : type === 'success' ? '#10b981' : '#002FA7';
+
+    notification.innerHTML = `
+        <i class="${type === 'error' ? 'fas fa-exclamation-circle' : type === 'success' ? 'fas fa-check-circle' : 'fas fa-info-circle'}"></i>
+        <span>${message}</span>
+    `;
+
+    document.body.appendChild(notification);
+
+    // 3秒后自动移除
+    setTimeout(() => {
+        if (notification.parentNode) {
+            notification.style.animation = 'slideOut 0.3s ease';
+            setTimeout(() => notification.remove(), 300);
+        }
+    }, 3000);
+}
+
+// 加载设置
+async function loadSettings() {
+    try {
+        const response = await window.pywebview.api.get_settings();
+        if (response.success) {
+            document.getElementById('check-updates').checked = response.settings.check_updates;
+            document.getElementById('show-sites').checked = response.settings.show_favorites;
+            document.getElementById('show-tools').checked = response.settings.show_tools;
+
+            // 加载搜索引擎选项
+            const engines = await window.pywebview.api.get_search_engines();
+            const select = document.getElementById('default-engine');
+            select.innerHTML = '';
+
+            for (const [name, engine] of Object.entries(engines.engines)) {
+                const option = document.createElement('option');
+                option.value = name;
+                option.textContent = name;
+                if (name === response.settings.default_search) {
+                    option.selected = true;
+                }
+                select.appendChild(option);
+            }
+        }
+    } catch (error) {
+        console.error('加载设置失败:', error);
+    }
+}
+
+// 保存设置
+async function saveSettings() {
+    const settings = {
+        default_search: document.getElementById('default-engine').value,
+        check_updates: document.getElementById('check-updates').checked,
+        show_favorites: document.getElementById('show-sites').checked,
+        show_tools: document.getElementById('show-tools').checked
+    };
+
+    try {
+        const response = await window.pywebview.api.save_settings(settings);
+        showNotification(response.message, response.success ? 'success' : 'error');
+
+        // 更新当前搜索引擎
+        if (settings.default_search !== currentSearchEngine) {
+            await loadSearchEngines();
+        }
+    } catch (error) {
+        showNotification('保存失败', 'error');
+    }
+}
+
+// 窗口控制函数
+function minimizeWindow() {
+    window.pywebview.api.minimize();
+}
+
+function maximizeWindow() {
+    window.pywebview.api.maximize();
+}
+
+function closeWindow() {
+    window.pywebview.api.close();
+}
+
+// 页面加载完成后初始化
+// 等待 pywebview 注入接口：以 pywebviewready 事件为准，
+// 事件可能早于监听注册而错过，因此保留轮询作为兜底
+const apiReady = new Promise(resolve => {
+    const ready = () => window.pywebview && window.pywebview.api;
+    if (ready()) {
+        resolve();
+        return;
+    }
+    const fallback = setInterval(() => {
+        if (ready()) {
+            clearInterval(fallback);
+            resolve();
+        }
+    }, 100);
+    window.addEventListener('pywebviewready', () => {
+        clearInterval(fallback);
+        resolve();
+    }, { once: true });
+});
+
+document.addEventListener('DOMContentLoaded', async () => {
+    markStartup('js.DOMContentLoaded');
+    apiReady.then(async () => {
+        markStartup('js.api_ready');
+        // 推送的首屏数据还没到时才自行请求
+        if (!initialState) {
+            await loadHomePage();
+        }
+        markStartup('js.home_loaded');
+        reportStartup();
+    });
+
+    // 搜索框回车事件
+    document.getElementById('main-search-input').addEventListener('keypress', (e) => {
+        if (e.key === 'Enter') performMainSearch();
+    });
+});
@@ -0,0 +1,259 @@
+// tool_grid.js - 工具网格：只渲染视口附近的卡片，按工具 id 复用卡片节点，只修改变化的字段
+//
+// 网格仍由 CSS grid 排列（列数随窗口宽度变化），所有行等高；
+// 视口之外的行不生成节点，由容器的上下内边距占位，保持滚动条长度不变。
+
+const CATEGORY_LABELS = { system: '系统', security: '安全', network: '网络' };
+
+// 首次测量前用于估算可见行的卡片高度（像素）
+const ESTIMATED_CARD_HEIGHT = 180;
+
+// 卡片模板只解析一次，之后每张卡片都是它的克隆
+const toolCardTemplate = document.createElement('template');
+toolCardTemplate.innerHTML = `
+    <div class="tool-card">
+        <div class="tool-header">
+            <div class="tool-icon"><i></i></div>
+            <div>
+                <div class="tool-title"></div>
+                <div class="tool-status">
+                    <i class="fas fa-circle"></i>
+                    <span></span>
+                </div>
+            </div>
+        </div>
+        <div class="tool-desc"></div>
+        <div class="tool-footer">
+            <div class="tool-status">
+                <i class="fas fa-heart tool-favorite" data-action="favorite"></i>
+                <span class="tool-category"></span>
+            </div>
+            <button class="btn" data-action="launch">
+                <i class="fas fa-play"></i>
+                <span></span>
+            </button>
+        </div>
+    </div>`.trim();
+
+// 创建工具卡片
+function createToolCard(tool) {
+    const card = toolCardTemplate.content.firstElementChild.cloneNode(true);
+    const [statusDot, statusText] = card.querySelector('.tool-header .tool-status').children;
+    const button = card.querySelector('.btn');
+    card._fields = {
+        iconBox: card.querySelector('.tool-icon'),
+        icon: card.querySelector('.tool-icon i'),
+        title: card.querySelector('.tool-title'),
+        statusDot: statusDot,
+        statusText: statusText,
+        desc: card.querySelector('.tool-desc'),
+        favorite: card.querySelector('.tool-favorite'),
+        category: card.querySelector('.tool-category'),
+        button: button,
+        buttonText: button.querySelector('span')
+    };
+    card._tool = {};
+    if (tool) updateToolCard(card, tool);
+    return card;
+}
+
+// 把卡片更新为 tool 的内容，只写入与上次不同的字段；返回是否有变化
+function updateToolCard(card, tool) {
+    const prev = card._tool;
+    const fields = card._fields;
+    const next = {
+        id: tool.id,
+        name: tool.name,
+        icon: tool.icon || 'fas fa-tools',
+        category: tool.category,
+        status: tool.status,
+        description: tool.description || '暂无描述',
+        favorite: !!tool.favorite
+    };
+    let changed = false;
+
+    if (prev.id !== next.id) {
+        card.dataset.id = next.id;
+        changed = true;
+    }
+    if (prev.name !== next.name) {
+        fields.title.textContent = next.name;
+        changed = true;
+    }
+    if (prev.icon !== next.icon) {
+        fields.icon.className = next.icon;
+        changed = true;
+    }
+    if (prev.category !== next.category) {
+        fields.iconBox.className = `tool-icon icon-${next.category}`;
+        fields.category.textContent = CATEGORY_LABELS[next.category] || '实用';
+        changed = true;
+    }
+    if (prev.status !== next.status) {
+        const on = next.status === 'on';
+        fields.statusDot.className = `fas fa-circle status-${next.status}`;
+        fields.statusText.textContent = on ? '可用' : '维护中';
+        fields.button.className = `btn ${on ? 'btn-primary' : 'btn-secondary'}`;
+        fields.button.disabled = next.status === 'off';
+        fields.buttonText.textContent = on ? '启动' : '暂不可用';
+        changed = true;
+    }
+    if (prev.description !== next.description) {
+        fields.desc.textContent = next.description;
+        changed = true;
+    }
+    if (prev.favorite !== next.favorite) {
+        fields.favorite.classList.toggle('active', next.favorite);
+        fields.favorite.title = next.favorite ? '取消收藏' : '收藏';
+        changed = true;
+    }
+    card._tool = next;
+    return changed;
+}
+
+class ToolGrid {
+    // options: onAction(action, toolId) 处理卡片上的按钮；emptyText 列表为空时的提示；
+    //          overscan 视口上下额外渲染的行数
+    constructor(container, options = {}) {
+        this.container = container;
+        this.scrollParent = options.scrollParent || container.closest('.content-area') || document.scrollingElement;
+        this.onAction = options.onAction || null;
+        this.emptyText = options.emptyText || '';
+        this.overscan = options.overscan === undefined ? 2 : options.overscan;
+        this.tools = [];
+        this.mounted = new Map();   // 工具 id -> 卡片节点（当前在网格中）
+        this.pool = [];             // 离开视口、等待复用的卡片节点
+        this.cardHeight = 0;        // 行高：已渲染卡片内容高度的最大值
+        this.width = 0;
+        this.frame = 0;
+        this.empty = null;
+
+        container.textContent = '';
+        container.addEventListener('click', (event) => this.handleClick(event));
+        this.scrollParent.addEventListener('scroll', () => this.schedule(), { passive: true });
+        if (window.ResizeObserver) {
+            // 只关心宽度（列数）变化；高度由本类设置的内边距决定
+            new ResizeObserver((entries) => {
+                const width = entries[entries.length - 1].contentRect.width;
+                if (width !== this.width) {
+                    this.width = width;
+                    this.schedule();
+                }
+            }).observe(container);
+        } else {
+            window.addEventListener('resize', () => this.schedule());
+        }
+    }
+
+    // 设置要显示的工具（已排序、已过滤）；不变的卡片保持原节点
+    setTools(tools) {
+        this.tools = tools;
+        this.render();
+    }
+
+    // 滚动或尺寸变化时，下一帧再渲染，同一帧内只渲染一次
+    schedule() {
+        if (this.frame) return;
+        this.frame = requestAnimationFrame(() => {
+            this.frame = 0;
+            this.render();
+        });
+    }
+
+    handleClick(event) {
+        const target = event.target.closest('[data-action]');
+        if (!target || !this.onAction || !this.container.contains(target)) return;
+        const card = target.closest('.tool-card');
+        if (card) this.onAction(target.dataset.action, card.dataset.id);
+    }
+
+    release(id, card) {
+        card.remove();
+        this.mounted.delete(id);
+        this.pool.push(card);
+    }
+
+    showEmpty() {
+        this.mounted.forEach((card, id) => this.release(id, card));
+        this.container.style.paddingTop = '';
+        this.container.style.paddingBottom = '';
+        if (!this.emptyText || this.empty) return;
+        this.empty = document.createElement('p');
+        this.empty.className = 'tools-empty';
+        this.empty.textContent = this.emptyText;
+        this.container.appendChild(this.empty);
+    }
+
+    render() {
+        if (this.frame) {
+            cancelAnimationFrame(this.frame);
+            this.frame = 0;
+        }
+        const container = this.container;
+        if (this.tools.length === 0) {
+            this.showEmpty();
+            return;
+        }
+        if (this.empty) {
+            this.empty.remove();
+            this.empty = null;
+        }
+        // 所在页面未显示时无法计算列数，显示后由 ResizeObserver 触发渲染
+        if (container.clientWidth === 0) return;
+
+        const style = getComputedStyle(container);
+        const columns = Math.max(1, style.gridTemplateColumns.split(' ').filter(Boolean).length);
+        const gap = parseFloat(style.rowGap) || 0;
+        const rows = Math.ceil(this.tools.length / columns);
+        const stride = (this.cardHeight || ESTIMATED_CARD_HEIGHT) + gap;
+
+        // 视口顶部相对网格顶部的距离（网格在视口下方时为负）；
+        // 列表变短时滚动位置稍后才会被浏览器收回，先按新的总高度截断
+        const viewport = this.scrollParent.getBoundingClientRect();
+        const offset = Math.min(viewport.top - container.getBoundingClientRect().top,
+                                Math.max(0, rows * stride - viewport.height));
+        const first = Math.min(rows, Math.max(0, Math.floor(offset / stride) - this.overscan));
+        const last = Math.max(first, Math.min(rows, Math.ceil((offset + viewport.height) / stride) + this.overscan));
+        const visible = this.tools.slice(first * columns, Math.min(this.tools.length, last * columns));
+
+        // 离开视口（或已不在列表中）的卡片放回复用池
+        const keep = new Set(visible.map(tool => tool.id));
+        this.mounted.forEach((card, id) => {
+            if (!keep.has(id)) this.release(id, card);
+        });
+
+        // 按顺序放置卡片，已在正确位置的节点不移动
+        const changed = [];
+        let cursor = container.firstChild;
+        visible.forEach(tool => {
+            let card = this.mounted.get(tool.id);
+            if (!card) {
+                card = this.pool.pop() || createToolCard();
+                this.mounted.set(tool.id, card);
+            }
+            if (updateToolCard(card, tool)) changed.push(card);
+            if (card === cursor) {
+                cursor = cursor.nextSibling;
+            } else {
+                container.insertBefore(card, cursor);
+            }
+        });
+
+        container.style.paddingTop = `${first * stride}px`;
+        container.style.paddingBottom = `${(rows - last) * stride}px`;
+
+        // 内容有变化的卡片比当前行高更高时，加大行高并重新计算可见范围
+        if (changed.length) {
+            let height = this.cardHeight;
+            changed.forEach(card => {
+                // scrollHeight 不含边框；内容未溢出时等于当前行高
+                height = Math.max(height, card.scrollHeight + card.offsetHeight - card.clientHeight);
+            });
+            if (height !== this.cardHeight) {
+                this.cardHeight = height;
+                container.style.gridAutoRows = `${height}px`;
+                this.schedule();
+            }
+        }
+    }
+}
@@ -0,0 +1,213 @@
+# ui_server.py - 主界面静态资源：内容哈希文件名与缓存头，由 pywebview 内置 HTTP 服务器运行
+#
+# 界面放在 ui/（index.html、app.css、app.js），图标子集在 assets/fontawesome/
+# （运行时重新生成的子集在用户缓存目录，见 icon_subset.current_dir）。
+# 启动时为每个文件计算内容哈希，index.html 与 CSS 中的引用改写为带哈希的文件名，
+# 带哈希的资源可永久缓存（immutable），index.html 每次向服务器确认（no-cache + ETag）。
+import base64
+import hashlib
+import posixpath
+import re
+import socket
+import threading
+
+from config import config
+from icon_subset import current_dir as icons_dir
+
+UI_DIR = config.base_dir / "ui"
+INDEX = "index.html"
+
+# URL 前缀 -> 目录（或返回目录的函数，每次 reload 时重新取得）
+MOUNTS = {
+    "": UI_DIR,
+    "fontawesome/": icons_dir,
+}
+
+IMMUTABLE = "public, max-age=31536000, immutable"
+REVALIDATE = "no-cache"
+
+CONTENT_TYPES = {
+    '.html': 'text/html; charset=utf-8',
+    '.css': 'text/css; charset=utf-8',
+    '.js': 'application/javascript; charset=utf-8',
+    '.json': 'application/json; charset=utf-8',
+    '.woff2': 'font/woff2',
+    '.png': 'image/png',
+    '.svg': 'image/svg+xml',
+    '.ico': 'image/x-icon',
+}
+
+# 需要改写引用的文本资源：(前缀)(相对路径)(后缀)
+_REFERENCE_PATTERNS = {
+    '.html': re.compile(r'(\b(?:href|src)=")([^"#?:]+)(")'),
+    '.css': re.compile(r'(url\(")([^"#?:]+)("\))'),
+}
+_LINK_PATTERN = re.compile(r'<link\b([^>]*)>')
+_SCRIPT_PATTERN = re.compile(r'<script\b([^>]*)\bsrc="([^"]+)"([^>]*)></script>')
+_ATTR_PATTERN = re.compile(r'([\w-]+)="([^"]*)"')
+
+
+class _Asset:
+    __slots__ = ('path', 'body', 'etag', 'content_type', 'immutable')
+
+    def __init__(self, path, body, etag, content_type, immutable):
+        self.path = path
+        self.body = body              # 改写过引用的内容；None 表示请求时从磁盘读取
+        self.etag = etag
+        self.content_type = content_type
+        self.immutable = immutable
+
+
+class UiAssets:
+    """界面资源表，本身是一个 WSGI 应用，可直接作为 create_window(url=...) 的参数
+
+    pywebview 遇到可调用的 url 时会用内置的 HTTP 服务器运行它；
+    内置的静态文件路由固定返回 no-store，无法缓存，因此由这里负责缓存头。
+    """
+
+    def __init__(self, mounts=None, index=INDEX):
+        self.mounts = dict(mounts or MOUNTS)
+        self.index = index
+        self._routes = {}    # URL 路径（不含开头的 /） -> _Asset
+        self._hashed = {}    # 逻辑路径 -> 带哈希的路径
+        self._lock = threading.Lock()
+        self.reload()
+
+    def _files(self):
+        files = {}
+        for prefix, directory in self.mounts.items():
+            if callable(directory):
+                directory = directory()
+            if not directory.is_dir():
+                continue
+            for path in directory.iterdir():
+                if path.is_file() and not path.name.endswith('.tmp'):
+                    files[prefix + path.name] = path
+        return files
+
+    def reload(self):
+        """重新扫描资源并计算哈希（资源文件变化后调用，例如图标子集重新生成）"""
+        files = self._files()
+        hashed = {}
+        routes = {}
+
+        def resolve(name, parents=()):
+            if name in hashed:
+                return hashed[name]
+            path = files[name]
+            suffix = path.suffix.lower()
+            data = path.read_bytes()
+            body = None
+            pattern = _REFERENCE_PATTERNS.get(suffix)
+            if pattern is not None:
+                base = posixpath.dirname(name)
+
+                def rewrite(match):
+                    ref = posixpath.normpath(posixpath.join(base, match.group(2))).lstrip('/')
+                    if ref not in files or ref in parents:
+                        return match.group(0)
+                    return f"{match.group(1)}/{resolve(ref, parents + (name,))}{match.group(3)}"
+
+                rewritten = pattern.sub(rewrite, data.decode('utf-8')).encode('utf-8')
+                if rewritten != data:
+                    # 只有改写过引用的文件留在内存中，其余请求时从磁盘读取
+                    body = data = rewritten
+            digest = hashlib.sha256(data).hexdigest()[:12]
+            stem, dot, extension = name.rpartition('.')
+            hashed[name] = f"{stem}.{digest}.{extension}" if dot else f"{name}.{digest}"
+            content_type = CONTENT_TYPES.get(suffix, 'application/octet-stream')
+            etag = f'"{digest}"'
+            routes[name] = _Asset(path, body, etag, content_type, False)
+            if name != self.index:
+                routes[hashed[name]] = _Asset(path, body, etag, content_type, True)
+            return hashed[name]
+
+        for name in files:
+            try:
+                resolve(name)
+            except (OSError, UnicodeDecodeError) as e:
+                print(f"⚠️  读取界面资源失败 {name}: {e}")
+        with self._lock:
+            self._routes = routes
+            self._hashed = hashed
+
+    def url_for(self, name):
+        """逻辑路径对应的带哈希 URL 路径"""
+        with self._lock:
+            return '/' + self._hashed.get(name, name)
+
+    def __call__(self, environ, start_response):
+        path = environ.get('PATH_INFO', '/').lstrip('/') or self.index
+        method = environ.get('REQUEST_METHOD', 'GET')
+        if method not in ('GET', 'HEAD'):
+            start_response('405 Method Not Allowed', [('Allow', 'GET, HEAD')])
+            return []
+        with self._lock:
+            asset = self._routes.get(path)
+        if asset is None:
+            start_response('404 Not Found', [('Content-Type', 'text/plain; charset=utf-8')])
+            return [b'Not Found']
+
+        headers = [('Cache-Control', IMMUTABLE if asset.immutable else REVALIDATE), ('ETag', asset.etag)]
+        if environ.get('HTTP_IF_NONE_MATCH') == asset.etag:
+            start_response('304 Not Modified', headers)
+            return []
+        try:
+            body = asset.body if asset.body is not None else asset.path.read_bytes()
+        except OSError:
+            start_response('404 Not Found', [('Content-Type', 'text/plain; charset=utf-8')])
+            return [b'Not Found']
+        headers += [('Content-Type', asset.content_type), ('Content-Length', str(len(body)))]
+        start_response('200 OK', headers)
+        return [] if method == 'HEAD' else [body]
+
+    def render_inline(self):
+        """把样式、脚本与字体全部内嵌进 index.html，返回完整页面（create_window(html=...) 使用）"""
+        files = self._files()
+        index = files[self.index].read_text(encoding='utf-8')
+
+        def read_text(ref):
+            path = files.get(posixpath.normpath(ref).lstrip('/'))
+            return path.read_text(encoding='utf-8') if path is not None else None
+
+        def embed_urls(css, base):
+            def embed(match):
+                ref = posixpath.normpath(posixpath.join(base, match.group(2))).lstrip('/')
+                path = files.get(ref)
+                if path is None:
+                    return match.group(0)
+                content_type = CONTENT_TYPES.get(path.suffix.lower(), 'application/octet-stream')
+                data = base64.b64encode(path.read_bytes()).decode('ascii')
+                return f'{match.group(1)}data:{content_type};base64,{data}{match.group(3)}'
+            return _REFERENCE_PATTERNS['.css'].sub(embed, css)
+
+        def inline_link(match):
+            attrs = dict(_ATTR_PATTERN.findall(match.group(1)))
+            href = attrs.get('href', '')
+            css = read_text(href) if attrs.get('rel') == 'stylesheet' else None
+            if css is None:
+                return match.group(0)
+            element_id = f' id="{attrs["id"]}"' if 'id' in attrs else ''
+            return f'<style{element_id}>{embed_urls(css, posixpath.dirname(href))}</style>'
+
+        def inline_script(match):
+            js = read_text(match.group(2))
+            if js is None:
+                return match.group(0)
+            return f'<script{match.group(1).rstrip()}{match.group(3)}>{js}</script>'
+
+        index = _LINK_PATTERN.sub(inline_link, index)
+        return _SCRIPT_PATTERN.sub(inline_script, index)
+
+
+def pick_port(preferred):
+    """优先使用固定端口（页面来源不变，webview 缓存才能跨启动复用），被占用时改用随机端口"""
+    if not preferred:
+        return None
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        try:
+            sock.bind(('127.0.0.1', int(preferred)))
+        except OSError:
+            print(f"⚠️  界面端口 {preferred} 已被占用，改用随机端口（本次启动无法使用缓存）")
+            return None
+    return int(preferred)
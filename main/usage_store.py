@@ -0,0 +1,202 @@
+# usage_store.py - 工具使用记录：按时间衰减的使用频率（frecency）与最近使用
+import heapq
+import json
+import math
+import os
+import threading
+import time
+from pathlib import Path
+
+
+class _Usage:
+    __slots__ = ('rank', 'last', 'count', 'stamp')
+
+    def __init__(self, rank, last, count, stamp):
+        self.rank = rank      # log2(Σ 2^(启动时间/半衰期))，与当前时间无关
+        self.last = last      # 最近一次启动的时间戳
+        self.count = count
+        self.stamp = stamp    # 对应堆中有效条目的序号
+
+
+class UsageTracker:
+    """记录工具启动，按 frecency 排序
+
+    每次启动的贡献为 1，之后每经过一个半衰期减半。所有工具的得分以相同速度衰减，
+    因此只需为每个工具保存与时间无关的 rank = log2(Σ 2^(t/半衰期))，
+    启动时更新 rank 并压入堆（O(log n)），排序不随时间变化，不必定期重算。
+
+    持久化方式与收藏记录相同：每次启动向日志追加一行，日志增长后在后台压缩，
+    压缩时只保留得分最高的 max_tools 个工具。
+    """
+
+    def __init__(self, journal_path, half_life_days=7.0, max_tools=500, compact_threshold=256):
+        self.journal_path = Path(journal_path)
+        self.half_life = max(1.0, float(half_life_days) * 86400)
+        self.max_tools = max(1, int(max_tools))
+        self.compact_threshold = max(1, int(compact_threshold))
+        self._usage = {}       # 工具 id -> _Usage
+        self._heap = []        # (-rank, 序号, 工具 id)，过期条目在弹出时丢弃
+        self._stamp = 0
+        self._version = 0      # 每次变化递增，用于缓存 boosts
+        self._boosts = (None, {})
+        self._journal_lines = 0
+        self._compacting = False
+        self._lock = threading.Lock()
+        self.load()
+
+    def load(self):
+        """重放日志，恢复使用记录"""
+        records = []
+        try:
+            with open(self.journal_path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        records.append(json.loads(line))
+                    except ValueError:
+                        # 写入中途断电留下的半行，忽略即可
+                        continue
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            print(f"⚠️  加载使用记录失败: {e}")
+        with self._lock:
+            self._usage = {}
+            self._heap = []
+            for record in records:
+                try:
+                    if 'score' in record:
+                        # 压缩后的记录：t 时刻的得分
+                        rank = math.log2(record['score']) + record['t'] / self.half_life
+                        self._merge(record['id'], rank, record['last'], record['count'])
+                    else:
+                        self._merge(record['id'], record['t'] / self.half_life, record['t'], 1)
+                except (KeyError, TypeError, ValueError):
+                    continue
+            self._journal_lines = len(records)
+            self._version += 1
+
+    def _merge(self, tool_id, rank, last, count):
+        """把一次（或一批）启动合并进工具的 rank，并压入新的堆条目"""
+        usage = self._usage.get(tool_id)
+        if usage is not None:
+            # log2(2^a + 2^b)，避免 2^(t/半衰期) 溢出
+            high, low = max(usage.rank, rank), min(usage.rank, rank)
+            rank = high + math.log2(1.0 + 2.0 ** (low - high))
+            last = max(usage.last, last)
+            count += usage.count
+        self._stamp += 1
+        self._usage[tool_id] = _Usage(rank, last, count, self._stamp)
+        heapq.heappush(self._heap, (-rank, self._stamp, tool_id))
+        # 过期条目过多时重建堆（均摊 O(1)）
+        if len(self._heap) > 2 * len(self._usage) + 64:
+            self._heap = [(-u.rank, u.stamp, tid) for tid, u in self._usage.items()]
+            heapq.heapify(self._heap)
+
+    def record(self, tool_id, when=None):
+        """记录一次启动：追加一行日志，O(log n) 更新排序"""
+        when = time.time() if when is None else float(when)
+        line = json.dumps({'id': tool_id, 't': round(when, 3)}, ensure_ascii=False)
+        with self._lock:
+            try:
+                with open(self.journal_path, 'a', encoding='utf-8') as f:
+                    f.write(line + '\n')
+            except Exception as e:
+                print(f"⚠️  保存使用记录失败: {e}")
+            self._merge(tool_id, when / self.half_life, when, 1)
+            self._version += 1
+            self._journal_lines += 1
+            needs_compaction = (not self._compacting and
+                                (self._journal_lines > len(self._usage) + self.compact_threshold
+                                 or len(self._usage) > self.max_tools + self.compact_threshold))
+            if needs_compaction:
+                self._compacting = True
+        if needs_compaction:
+            threading.Thread(target=self.compact, name="usage-compact", daemon=True).start()
+
+    def score(self, tool_id, now=None):
+        """工具当前的 frecency 得分（没有记录时为 0）"""
+        now = time.time() if now is None else now
+        with self._lock:
+            usage = self._usage.get(tool_id)
+            return 2.0 ** (usage.rank - now / self.half_life) if usage is not None else 0.0
+
+    def top(self, limit, accept=None):
+        """frecency 最高的工具：[(工具 id, 得分), ...]；accept(工具 id) 为假的工具跳过
+
+        从堆顶弹出有效条目再放回，O(k log n)；弹出的过期条目直接丢弃。
+        """
+        now_rank = time.time() / self.half_life
+        result = []
+        with self._lock:
+            taken = []
+            while self._heap and len(result) < limit:
+                entry = heapq.heappop(self._heap)
+                usage = self._usage.get(entry[2])
+                if usage is None or usage.stamp != entry[1]:
+                    continue
+                taken.append(entry)
+                if accept is None or accept(entry[2]):
+                    result.append((entry[2], 2.0 ** (-entry[0] - now_rank)))
+            for entry in taken:
+                heapq.heappush(self._heap, entry)
+        return result
+
+    def recent(self, limit):
+        """最近使用的工具：[(工具 id, 最后启动时间戳), ...]"""
+        with self._lock:
+            latest = heapq.nlargest(limit, self._usage.items(), key=lambda item: item[1].last)
+            return [(tool_id, usage.last) for tool_id, usage in latest]
+
+    def boosts(self):
+        """{工具 id: 0~1}，以最高得分归一化，用于调整搜索结果的排序"""
+        with self._lock:
+            version, boosts = self._boosts
+            if version == self._version:
+                return boosts
+            if self._usage:
+                best = max(usage.rank for usage in self._usage.values())
+                boosts = {tool_id: 2.0 ** (usage.rank - best) for tool_id, usage in self._usage.items()}
+            else:
+                boosts = {}
+            self._boosts = (self._version, boosts)
+            return boosts
+
+    def stats(self, tool_id):
+        """单个工具的使用统计（没有记录时为 None）"""
+        with self._lock:
+            usage = self._usage.get(tool_id)
+            if usage is None:
+                return None
+            return {'count': usage.count, 'last_used': usage.last}
+
+    def compact(self):
+        """把日志重写为每个工具一行，只保留得分最高的 max_tools 个（原子替换）"""
+        try:
+            with self._lock:
+                now = time.time()
+                kept = heapq.nlargest(self.max_tools, self._usage.items(), key=lambda item: item[1].rank)
+                lines = [json.dumps({'id': tool_id,
+                                     'score': 2.0 ** (usage.rank - now / self.half_life),
+                                     't': round(now, 3),
+                                     'last': usage.last,
+                                     'count': usage.count}, ensure_ascii=False)
+                         for tool_id, usage in kept]
+                tmp_path = self.journal_path.with_name(self.journal_path.name + '.tmp')
+                # 在锁内完成写入与替换，期间的启动记录会等待，不会丢失
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    f.write(''.join(line + '\n' for line in lines))
+                os.replace(tmp_path, self.journal_path)
+                if len(kept) < len(self._usage):
+                    self._usage = dict(kept)
+                    self._heap = [(-u.rank, u.stamp, tid) for tid, u in self._usage.items()]
+                    heapq.heapify(self._heap)
+                    self._version += 1
+                self._journal_lines = len(lines)
+        except Exception as e:
+            print(f"⚠️  压缩使用记录失败: {e}")
+        finally:
+            with self._lock:
+                self._compacting = False
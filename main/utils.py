@@ -1,171 +1,25 @@
 # utils.py - 工具函数
-import psutil
-import platform
-import socket
+# psutil、webbrowser 等较重的模块在首次使用时才导入，不拖慢窗口显示
 import json
-import subprocess
-import os
-import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-import webbrowser
 
 def get_system_info():
     """获取详细的系统信息"""
-    info = {}
-    
     try:
-        # 操作系统信息
-        system_info = platform.uname()
-        info['system'] = {
-            '系统': platform.system(),
-            '版本': platform.version(),
-            '发行版': platform.platform(),
-            '架构': platform.architecture()[0],
-            '处理器': platform.processor(),
-            '机器': platform.machine(),
-            '节点': system_info.node,
-        }
-        
-        try:
-            hostname = socket.gethostname()
-            info['system']['主机名'] = hostname
-            
-            try:
-                ip = socket.gethostbyname(hostname)
-                info['system']['IP地址'] = ip
-            except:
-                info['system']['IP地址'] = '未知'
-        except:
-            pass
-        
-        # CPU信息
-        cpu_info = {
-            '物理核心数': psutil.cpu_count(logical=False),
-            '逻辑核心数': psutil.cpu_count(logical=True),
-            '使用率': f"{psutil.cpu_percent(interval=1)}%",
-        }
-        
-        try:
-            freq = psutil.cpu_freq()
-            if freq:
-                cpu_info['频率'] = f"{freq.current:.2f} MHz"
-        except:
-            pass
-        
-        # 尝试获取CPU型号
-        try:
-            if platform.system() == "Windows":
-                import wmi
-                c = wmi.WMI()
-                cpu_name = c.Win32_Processor()[0].Name
-                cpu_info['型号'] = cpu_name
-        except:
-            cpu_info['型号'] = platform.processor()
-        
-        info['cpu'] = cpu_info
-        
-        # 内存信息
-        mem = psutil.virtual_memory()
-        swap = psutil.swap_memory()
-        info['memory'] = {
-            '总内存': f"{mem.total / (1024**3):.2f} GB",
-            '可用内存': f"{mem.available / (1024**3):.2f} GB",
-            '已用内存': f"{mem.used / (1024**3):.2f} GB",
-            '使用率': f"{mem.percent}%",
-        }
-        
-        try:
-            info['memory']['交换内存'] = f"{swap.total / (1024**3):.2f} GB"
-            info['memory']['交换使用率'] = f"{swap.percent}%"
-        except:
-            pass
-        
-        # 磁盘信息
-        disks = []
-        for partition in psutil.disk_partitions():
-            try:
-                usage = psutil.disk_usage(partition.mountpoint)
-                disk_info = {
-                    '设备': partition.device,
-                    '挂载点': partition.mountpoint,
-                    '文件系统': partition.fstype,
-                    '总空间': f"{usage.total / (1024**3):.2f} GB",
-                    '已用空间': f"{usage.used / (1024**3):.2f} GB",
-                    '可用空间': f"{usage.free / (1024**3):.2f} GB",
-                    '使用率': f"{usage.percent}%"
-                }
-                disks.append(disk_info)
-            except:
-                continue
-        
-        # 只显示主要磁盘
-        info['disks'] = disks[:3]  # 只显示前3个磁盘
-        
-        # 网络信息
-        net_info = []
-        try:
-            for name, addrs in psutil.net_if_addrs().items():
-                if name.lower() in ['lo', 'loopback']:
-                    continue
-                    
-                addr_info = {'接口': name, '地址': []}
-                for addr in addrs:
-                    if addr.family == socket.AF_INET:
-                        addr_info['地址'].append(f"IPv4: {addr.address}")
-                    elif addr.family == socket.AF_INET6:
-                        addr_info['地址'].append(f"IPv6: {addr.address}")
-                    elif addr.family == psutil.AF_LINK:
-                        addr_info['地址'].append(f"MAC: {addr.address}")
-                
-                if addr_info['地址']:
-                    net_info.append(addr_info)
-            
-            # 限制显示数量
-            info['network'] = net_info[:3]
-        except:
-            info['network'] = []
-        
-        # 启动时间
-        try:
-            boot_time = psutil.boot_time()
-            from datetime import datetime
-            info['boot_time'] = datetime.fromtimestamp(boot_time).strftime("%Y-%m-%d %H:%M:%S")
-        except:
-            info['boot_time'] = "未知"
-        
-        # 进程数
-        try:
-            info['process_count'] = len(psutil.pids())
-        except:
-            info['process_count'] = "未知"
-        
-        # Python信息
-        info['python'] = {
-            '版本': platform.python_version(),
-            '编译器': platform.python_compiler(),
-            '实现': platform.python_implementation(),
-        }
-        
-        # 系统运行时间
-        try:
-            uptime = datetime.now() - datetime.fromtimestamp(boot_time)
-            days = uptime.days
-            hours, remainder = divmod(uptime.seconds, 3600)
-            minutes, seconds = divmod(remainder, 60)
-            info['uptime'] = f"{days}天 {hours}小时 {minutes}分钟 {seconds}秒"
-        except:
-            info['uptime'] = "未知"
-        
+        from system_info import get_system_info_collector
+        return get_system_info_collector().collect()
     except Exception as e:
+        import platform
         print(f"⚠️  获取系统信息时出错: {e}")
-        info['error'] = f"获取系统信息时出错: {str(e)}"
-        info['basic'] = {
-            '系统': platform.system(),
-            '版本': platform.version(),
-            'Python版本': platform.python_version()
+        return {
+            'error': f"获取系统信息时出错: {str(e)}",
+            'basic': {
+                '系统': platform.system(),
+                '版本': platform.version(),
+                'Python版本': platform.python_version()
+            }
         }
-    
-    return info
 
 def format_system_info_for_display(info):
     """格式化系统信息用于显示"""
@@ -179,6 +33,10 @@ def format_system_info_for_display(info):
     if 'cpu' in info:
         formatted.append(("CPU信息", info['cpu']))
     
+    # 硬件信息
+    if info.get('hardware'):
+        formatted.append(("硬件信息", info['hardware']))
+    
     # 内存信息
     if 'memory' in info:
         formatted.append(("内存信息", info['memory']))
@@ -219,11 +77,8 @@ def format_system_info_for_display(info):
     
     return formatted
 
-def scan_tools(tools_dir):
-    """扫描工具文件夹"""
-    tools = []
-    
-    # 如果工具目录不存在，创建它
+def ensure_tools_dir(tools_dir):
+    """确保工具目录及分类目录存在"""
     if not tools_dir.exists():
         print(f"⚠️  工具目录不存在: {tools_dir}")
         print("💡 正在创建工具目录结构...")
@@ -233,99 +88,134 @@ def scan_tools(tools_dir):
         for category in ["system", "security", "network", "utilities"]:
             category_dir = tools_dir / category
             category_dir.mkdir(exist_ok=True)
+
+def load_tool_manifest(tool_file, category):
+    """读取单个工具清单并补全必要字段"""
+    with open(tool_file, 'rb') as f:
+        tool_data = json.loads(f.read().decode('utf-8'))
+    # 确保必要字段存在
+    if 'id' not in tool_data:
+        tool_data['id'] = Path(tool_file).stem
+    if 'category' not in tool_data:
+        tool_data['category'] = category
+    if 'icon' not in tool_data:
+        tool_data['icon'] = 'fas fa-tools'
+    if 'status' not in tool_data:
+        tool_data['status'] = 'on'
+    if 'favorite' not in tool_data:
+        tool_data['favorite'] = False
+    return tool_data
+
+def _load_manifest_safely(item):
+    tool_file, category = item
+    try:
+        return load_tool_manifest(tool_file, category), None
+    except Exception as e:
+        return None, {'path': str(tool_file), 'category': category, 'error': f"{type(e).__name__}: {e}"}
+
+def _load_manifest_batch(batch):
+    return [_load_manifest_safely(item) for item in batch]
+
+def load_tool_manifests(items, max_workers=8):
+    """并行读取多个工具清单
+    
+    items 为 (文件路径, 分类) 列表，返回 (结果列表, 错误列表)：
+    结果与 items 一一对应，失败的位置为 None；错误为 {'path', 'category', 'error'} 字典。
+    """
+    items = list(items)
+    if max_workers <= 1 or len(items) < 32:
+        # 文件很少时线程池的开销得不偿失
+        outcomes = [_load_manifest_safely(item) for item in items]
+    else:
+        # 按批提交，减少每个文件一个 Future 的调度开销
+        batch_size = max(16, len(items) // (max_workers * 4))
+        batches = [items[i:i + batch_size] for i in range(0, len(items), batch_size)]
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="manifest-loader") as executor:
+            # map 保证结果顺序与输入一致
+            outcomes = [outcome
+                        for batch in executor.map(_load_manifest_batch, batches)
+                        for outcome in batch]
+    results = [tool for tool, _ in outcomes]
+    errors = [error for _, error in outcomes if error is not None]
+    return results, errors
+
+def scan_tools(tools_dir, errors=None, max_workers=8):
+    """扫描工具文件夹，按（分类, 文件名）排序；加载失败的文件追加到 errors 列表"""
+    tools = []
+    
+    # 如果工具目录不存在，创建它
+    ensure_tools_dir(tools_dir)
     
     # 扫描真实工具
+    items = []
     try:
-        for category_dir in tools_dir.iterdir():
+        for category_dir in sorted(tools_dir.iterdir()):
             if category_dir.is_dir():
                 category = category_dir.name
-                for tool_file in category_dir.glob("*.json"):
-                    try:
-                        with open(tool_file, 'r', encoding='utf-8') as f:
-                            tool_data = json.load(f)
-                            # 确保必要字段存在
-                            if 'id' not in tool_data:
-                                tool_data['id'] = tool_file.stem
-                            if 'category' not in tool_data:
-                                tool_data['category'] = category
-                            if 'icon' not in tool_data:
-                                tool_data['icon'] = 'fas fa-tools'
-                            if 'status' not in tool_data:
-                                tool_data['status'] = 'on'
-                            if 'favorite' not in tool_data:
-                                tool_data['favorite'] = False
-                            
-                            tools.append(tool_data)
-                    except Exception as e:
-                        print(f"⚠️  加载工具文件失败 {tool_file}: {e}")
-                        continue
+                for tool_file in sorted(category_dir.glob("*.json")):
+                    items.append((tool_file, category))
     except Exception as e:
         print(f"⚠️  扫描工具失败: {e}")
     
+    results, load_errors = load_tool_manifests(items, max_workers=max_workers)
+    tools = [tool for tool in results if tool is not None]
+    if errors is not None:
+        errors.extend(load_errors)
+    
     # 如果没有找到工具，返回示例数据
     if not tools:
         print("⚠️  未找到工具文件，使用示例数据")
-        tools = [
-            {
-                "id": "system_cleaner",
-                "name": "系统清理工具",
-                "description": "清理系统垃圾文件和临时文件",
-                "category": "system",
-                "icon": "fas fa-broom",
-                "status": "on",
-                "favorite": True
-            },
-            {
-                "id": "network_speed",
-                "name": "网络速度测试",
-                "description": "测试网络上传和下载速度",
-                "category": "network",
-                "icon": "fas fa-tachometer-alt",
-                "status": "on",
-                "favorite": True
-            },
-            {
-                "id": "file_encrypt",
-                "name": "文件加密",
-                "description": "使用AES加密保护文件安全",
-                "category": "security",
-                "icon": "fas fa-lock",
-                "status": "on",
-                "favorite": False
-            },
-            {
-                "id": "image_converter",
-                "name": "图片格式转换",
-                "description": "批量转换图片格式",
-                "category": "utilities",
-                "icon": "fas fa-file-image",
-                "status": "on",
-                "favorite": True
-            }
-        ]
+        tools = get_sample_tools()
     
     return tools
 
+def get_sample_tools():
+    """没有任何工具清单时使用的示例数据"""
+    return [
+        {
+            "id": "system_cleaner",
+            "name": "系统清理工具",
+            "description": "清理系统垃圾文件和临时文件",
+            "category": "system",
+            "icon": "fas fa-broom",
+            "status": "on",
+            "favorite": True
+        },
+        {
+            "id": "network_speed",
+            "name": "网络速度测试",
+            "description": "测试网络上传和下载速度",
+            "category": "network",
+            "icon": "fas fa-tachometer-alt",
+            "status": "on",
+            "favorite": True
+        },
+        {
+            "id": "file_encrypt",
+            "name": "文件加密",
+            "description": "使用AES加密保护文件安全",
+            "category": "security",
+            "icon": "fas fa-lock",
+            "status": "on",
+            "favorite": False
+        },
+        {
+            "id": "image_converter",
+            "name": "图片格式转换",
+            "description": "批量转换图片格式",
+            "category": "utilities",
+            "icon": "fas fa-file-image",
+            "status": "on",
+            "favorite": True
+        }
+    ]
+
 def open_url_in_browser(url):
     """在浏览器中打开URL"""
     try:
+        import webbrowser
         webbrowser.open(url)
         return True
     except Exception as e:
         print(f"⚠️  打开浏览器失败: {e}")
         return False
-
-def launch_tool(tool_id):
-    """启动工具"""
-    # 这里可以实现具体的工具启动逻辑
-    print(f"🔧 启动工具: {tool_id}")
-    
-    # 模拟工具启动
-    try:
-        # 在实际应用中，这里会根据工具配置启动相应的程序
-        # 例如: subprocess.run([tool_executable, ...])
-        
-        return True
-    except Exception as e:
-        print(f"❌ 启动工具失败 {tool_id}: {e}")
-        return False